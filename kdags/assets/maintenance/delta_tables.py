@@ -0,0 +1,21 @@
+import dagster as dg
+
+from kdags.config import DATA_CATALOG
+from kdags.resources.tidyr import DataLake
+
+
+@dg.asset(compute_kind="vacuum")
+def vacuum_delta_tables(context: dg.AssetExecutionContext):
+    """Vacuum every delta analytics table in the catalog, deleting files no retained commit references."""
+    dl = DataLake(context)
+    summary = {}
+    for name, entry in DATA_CATALOG.items():
+        if "delta" not in entry:
+            continue
+        results = dl.vacuum_analytics(entry)
+        for error in results["errors"]:
+            context.log.warning(f"Failed to delete {error['az_path']}: {error['error']}")
+        summary[name] = f"{results['successful']} deleted, {results['failed']} failed"
+
+    context.add_output_metadata(summary)
+    return summary
@@ -0,0 +1,30 @@
+import dagster as dg
+
+from kdags.config import DATA_CATALOG
+from kdags.resources.tidyr import DataLake
+
+# Raw Excel sources and the read_excel arguments their assets use, sidecars are keyed by both
+EXCEL_SOURCES = [
+    {"az_path": DATA_CATALOG["oil_analysis"]["raw_path"], "read_kwargs": {"infer_schema_length": 0}},
+    {"az_path": "az://bhp-raw-data/RESO/SERVICE_ORDER_REPORT", "read_kwargs": {"infer_schema_length": 0}},
+    {"az_path": "az://bhp-raw-data/REFERENCE", "read_kwargs": {}},
+]
+
+
+class BackfillExcelSidecarsConfig(dg.Config):
+    max_workers: int = 10
+
+
+@dg.asset(compute_kind="backfill")
+def backfill_excel_sidecars(context: dg.AssetExecutionContext, config: BackfillExcelSidecarsConfig):
+    """Convert existing raw Excel files to parquet sidecars so later read_tibble calls skip Excel parsing."""
+    dl = DataLake(context)
+    summary = {}
+    for source in EXCEL_SOURCES:
+        results = dl.backfill_excel_sidecars(source["az_path"], max_workers=config.max_workers, **source["read_kwargs"])
+        for error in results["errors"]:
+            context.log.warning(f"Failed to convert {error['az_path']}: {error['error']}")
+        summary[source["az_path"]] = f"{results['converted']} converted, {results['failed']} failed"
+
+    context.add_output_metadata(summary)
+    return summary
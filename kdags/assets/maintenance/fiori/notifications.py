@@ -41,8 +41,8 @@ def notifications_manifest(context: dg.AssetExecutionContext):
     dl = DataLake(context=context)
     # Prepare manifest with all files and their status
     df = dl.prepare_manifest(
+        dl._manifest(DATA_CATALOG["notifications"]["manifest_path"]),
         DATA_CATALOG["notifications"]["raw_path"],
-        DATA_CATALOG["notifications"]["manifest_path"],
     )
 
     return df
@@ -61,20 +61,6 @@ def mutate_notifications(
     # Define paths
 
     manifest_path = DATA_CATALOG["notifications"]["manifest_path"]
-    analytics_path = DATA_CATALOG["notifications"]["analytics_path"]
-
-    # Define deduplication strategy
-    dedup_keys = ["Notification"]  # Adjust based on your actual column names
-
-    # Upsert with deduplication
-    deduplicated_df, updated_manifest = dl.upsert_tibble(
-        manifest_df=notifications_manifest,
-        analytics_df=notifications,
-        dedup_keys=dedup_keys,
-        date_column="partition_date",
-        add_partition_date=True,
-        cleaning_fn=clean_notifications,
-    )
 
     COLUMNS_MAP = {
         "Notification": "notification",
@@ -91,10 +77,31 @@ def mutate_notifications(
         "Order Status": "order_status",
         "Plant of Main Work Center": "site_name",
     }
-    deduplicated_df = deduplicated_df.rename(
+
+    # Define deduplication strategy
+    dedup_keys = ["Notification"]  # Adjust based on your actual column names
+
+    # Read only the newest unprocessed snapshot, deduplicated in its raw column form
+    snapshot_df, updated_manifest = dl.upsert_tibble(
+        manifest_df=notifications_manifest,
+        analytics_df=None,
+        dedup_keys=dedup_keys,
+        date_column="partition_date",
+        add_partition_date=True,
+        cleaning_fn=clean_notifications,
+        # Each FIORI export holds the full history, so only the newest unprocessed snapshot is read
+        mode="latest_snapshot",
+    )
+
+    if snapshot_df.is_empty():
+        # Unreadable or empty snapshots are left unprocessed in the manifest and retried on the next run
+        context.log.info("No new notifications snapshot with rows, keeping the existing analytics table")
+        return notifications, updated_manifest
+
+    snapshot_df = snapshot_df.rename(
         COLUMNS_MAP,
     ).select(list(COLUMNS_MAP.values()))
-    deduplicated_df = deduplicated_df.with_columns(
+    snapshot_df = snapshot_df.with_columns(
         site_name=pl.when(pl.col("site_name").str.to_lowercase().str.contains("escondida mine"))
         .then(pl.lit("MEL"))
         .when(pl.col("site_name").str.to_lowercase().str.contains("spence"))
@@ -104,10 +111,17 @@ def mutate_notifications(
         notification_status=pl.col("notification_status").str.replace(r"\s*\(\d+\)$", ""),
     )
 
+    # Merge on the analytics columns: the snapshot wins, notifications missing from it are kept
+    if notifications.is_empty():
+        deduplicated_df = snapshot_df
+    else:
+        preserved = notifications.join(snapshot_df.select("notification"), on="notification", how="anti")
+        deduplicated_df = pl.concat([preserved.select(snapshot_df.columns), snapshot_df], how="vertical_relaxed")
+
     # Apply work_order specific cleaning AFTER upsert
     if deduplicated_df.height > 0:
         # Save results
-        dl.upload_tibble(deduplicated_df, analytics_path)
+        dl.write_analytics(deduplicated_df, DATA_CATALOG["notifications"])
         dl.upload_tibble(updated_manifest, manifest_path)
 
         context.log.info(f"Saved {deduplicated_df.height} deduplicated work orders")
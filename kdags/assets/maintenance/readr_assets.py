@@ -10,7 +10,7 @@ from kdags.config import DATA_CATALOG
 @dg.asset(compute_kind="readr")
 def notifications(context: dg.AssetExecutionContext):
     dl = DataLake(context)
-    df = dl.read_tibble(DATA_CATALOG["notifications"]["analytics_path"], raise_if_missing=False)
+    df = dl.read_analytics(DATA_CATALOG["notifications"])
     return df
 
 
@@ -20,5 +20,5 @@ def notifications(context: dg.AssetExecutionContext):
 )
 def oil_analysis(context: dg.AssetExecutionContext) -> pl.DataFrame:
     dl = DataLake(context)
-    df = dl.read_tibble(az_path=DATA_CATALOG["oil_analysis"]["analytics_path"])
+    df = dl.read_analytics(DATA_CATALOG["oil_analysis"])
     return df
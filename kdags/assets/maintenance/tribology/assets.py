@@ -3,7 +3,6 @@ import os
 import dagster as dg
 import polars as pl
 
-from kdags.resources.dplyr import upsert_tibbles
 from kdags.resources.tidyr import DataLake, MSGraph
 from kdags.config import DATA_CATALOG
 
@@ -25,7 +24,7 @@ def raw_oil_analysis(
     dl = DataLake()
     az_path = "az://bhp-raw-data/LUBE_ANALYST/SCAAE"
     # List all files in the specified path
-    files_df = dl.list_partitioned_paths(
+    files_df = dl.list_indexed_paths(
         "az://bhp-raw-data/LUBE_ANALYST/SCAAE",
         only_recent=config.only_recent,
         days_lookback=config.days_lookback,
@@ -146,32 +145,17 @@ def process_oil_analysis(raw_oil_analysis):
 @dg.asset()
 def mutate_oil_analysis(context: dg.AssetExecutionContext, raw_oil_analysis: pl.DataFrame):
     process_df = process_oil_analysis(raw_oil_analysis)
-    oil_analysis_analytics_path = DATA_CATALOG["oil_analysis"]["analytics_path"]
     new_df = process_df.clone()
     context.log.info(f"Received {new_df.height} new/updated records for upsert.")
 
-    existing_df = DataLake().read_tibble(oil_analysis_analytics_path)
+    dl = DataLake(context)
     key_columns = ["sample_id"]
 
-    context.log.info(f"Performing upsert operation with {new_df.height} incoming records")
-    context.log.info(f"Consolidated dataset has {existing_df.height} existing records")
-
-    if existing_df.height != 0:
-        df = upsert_tibbles(
-            new_df=new_df,
-            existing_df=existing_df,
-            key_columns=key_columns,
-        )
-    else:
-        context.log.info("Consolidated dataset is empty. Skipping upsert operation.")
-        df = process_df.clone()
-    # Perform upsert operation
-    df = df.sort("sample_date")
-
-    context.log.info(f"Writing {df.height} records to {oil_analysis_analytics_path}")
-    DataLake().upload_tibble(tibble=df, az_path=oil_analysis_analytics_path)
+    # Only the incoming records are written, existing ones are resolved by sample_id on read
+    az_path = dl.upsert_analytics(new_df, DATA_CATALOG["oil_analysis"], key_columns=key_columns)
+    df = dl.read_analytics(DATA_CATALOG["oil_analysis"]).sort("sample_date")
     context.log.info("Write successful.")
     context.add_output_metadata(
-        {"az_path": oil_analysis_analytics_path, "rows_written": df.height, "status": "completed"}
+        {"az_path": az_path, "rows_written": new_df.height, "rows_total": df.height, "status": "completed"}
     )
     return df
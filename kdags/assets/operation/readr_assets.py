@@ -1,4 +1,6 @@
 from io import BytesIO
+from datetime import date
+from typing import Optional
 
 import dagster as dg
 import pandas as pd
@@ -7,10 +9,22 @@ from kdags.resources.tidyr import DataLake, MSGraph
 from kdags.config import DATA_CATALOG
 
 
+class ReadSMRConfig(dg.Config):
+    # Leave empty to read every column, otherwise only these columns are downloaded
+    columns: list[str] = []
+    # ISO date (YYYY-MM-DD), rows before it are skipped at the parquet reader
+    start_date: Optional[str] = None
+
+
 @dg.asset(compute_kind="readr")
-def smr(context: dg.AssetExecutionContext):
+def smr(context: dg.AssetExecutionContext, config: ReadSMRConfig):
     dl = DataLake(context)
-    df = dl.read_tibble(DATA_CATALOG["smr"]["analytics_path"])
+    lf = dl.scan_tibble(DATA_CATALOG["smr"]["analytics_path"])
+    if config.columns:
+        lf = lf.select(config.columns)
+    if config.start_date:
+        lf = lf.filter(pl.col("smr_date") >= date.fromisoformat(config.start_date))
+    df = lf.collect()
     return df
 
 
@@ -42,7 +56,5 @@ def read_fault_codes(context: dg.AssetExecutionContext):
 def read_haul():
     dl = DataLake()
     uri = "az://bhp-analytics-data/OPERATION/PLM3/haul.parquet"
-    if dl.az_path_exists(uri):
-        return dl.read_tibble(az_path=uri)
-    else:
-        return pl.DataFrame()
+    # read_tibble returns an empty DataFrame when the file is missing
+    return dl.read_tibble(az_path=uri)
@@ -87,7 +87,7 @@ def raw_so_report(context: dg.AssetExecutionContext) -> pl.DataFrame:
     datalake = DataLake(context=context)  # Direct instantiation
     base_raw_path = "az://bhp-raw-data/RESO/SERVICE_ORDER_REPORT"
 
-    files_df = datalake.list_paths(base_raw_path)
+    files_df = datalake.list_indexed_paths(base_raw_path)
 
     parsed_data = []
     for path in files_df["az_path"].to_list():
@@ -8,6 +8,7 @@ from kdags.assets import maintenance, reparation, operation, components, reliabi
 from kdags.schedules import schedules
 from kdags.sensors import sensors
 from kdags.jobs import jobs
+from kdags.resources.tidyr import SQLDatabaseResource
 import warnings
 
 warnings.filterwarnings("ignore", category=Warning, module="dagster._core.definitions.metadata.source_code")
@@ -61,4 +62,5 @@ kdefs = dg.Definitions(
     jobs=jobs,
     schedules=schedules,
     sensors=sensors,
+    resources={"sql_database": SQLDatabaseResource()},
 )
@@ -1,11 +1,14 @@
 import dagster as dg
 
+from kdags.resources.tidyr import IO_METRICS_HOOKS
+
 __all__ = ["jobs"]
 
 
 # === DOCS ===
 publish_data_job = dg.define_asset_job(
     name="publish_data_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets(
         "publish_data_catalog",
         "publish_notifications",
@@ -24,6 +27,7 @@ publish_data_job = dg.define_asset_job(
 
 component_history_job = dg.define_asset_job(
     name="component_history_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets("mutate_component_changeouts").upstream()
     | dg.AssetSelection.assets("mutate_so_report").upstream()
     | dg.AssetSelection.assets("mutate_component_reparations").upstream()
@@ -33,12 +37,14 @@ component_history_job = dg.define_asset_job(
 
 tabulate_quotations_job = dg.define_asset_job(
     name="tabulate_quotations_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets("mutate_quotations").upstream(),
     description="Cambios de componente",
 )
 
 component_fleet_job = dg.define_asset_job(
     name="component_fleet_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets(
         "publish_component_fleet", "fleet_risk_analysis", "publish_parts_fleet"
     ).upstream(),
@@ -47,6 +53,7 @@ component_fleet_job = dg.define_asset_job(
 
 component_reparations_job = dg.define_asset_job(
     name="component_reparations_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets("mutate_component_reparations").upstream(),
     description="Reparación de componentes",
 )
@@ -54,16 +61,19 @@ component_reparations_job = dg.define_asset_job(
 # === REPARATION ===
 harvest_so_report_job = dg.define_asset_job(
     name="harvest_so_report_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets("harvest_so_report").upstream(),
     description="Component Status RESO",
 )
 so_report_job = dg.define_asset_job(
     name="so_report_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets("mutate_so_report", "mutate_component_reparations").upstream(),
     description="Component Status RESO",
 )
 harvest_so_documents_job = dg.define_asset_job(
     name="harvest_so_documents_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets(
         "harvest_so_documents",
     ).upstream(),
@@ -71,6 +81,7 @@ harvest_so_documents_job = dg.define_asset_job(
 )
 harvest_so_details_job = dg.define_asset_job(
     name="harvest_so_details_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets(
         "harvest_so_details",
     ).upstream(),
@@ -78,11 +89,13 @@ harvest_so_details_job = dg.define_asset_job(
 )
 quotations_job = dg.define_asset_job(
     name="quotations_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets("mutate_so_quotations").upstream(),
 )
 
 reso_documents_job = dg.define_asset_job(
     name="reso_documents_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets("process_all_mt_reports").upstream(),
 )
 
@@ -90,6 +103,7 @@ reso_documents_job = dg.define_asset_job(
 # === DOCS ===
 docs_job = dg.define_asset_job(
     name="docs_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets(
         "publish_sp_io_catalog", "publish_sp_masterdata_catalog", "publish_sp_schema_catalog"
     ).upstream(),
@@ -102,6 +116,7 @@ docs_job = dg.define_asset_job(
 
 ep_job = dg.define_asset_job(
     name="ep_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets("mutate_ep").upstream(),
     description="...",
 )
@@ -109,12 +124,14 @@ ep_job = dg.define_asset_job(
 
 warranties_job = dg.define_asset_job(
     name="warranties_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets("mutate_warranties").upstream(),
     description="...",
 )
 
 icc_job = dg.define_asset_job(
     name="icc_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets("mutate_icc").upstream()
     | dg.AssetSelection.assets("spawn_icc_reports").upstream(),
     tags={"source": "icc"},
@@ -123,6 +140,7 @@ icc_job = dg.define_asset_job(
 
 pool_inventory_job = dg.define_asset_job(
     name="pool_inventory_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets(
         "component_serials", "mutate_component_lifeline", "mutate_component_states", "mutate_component_snapshots"
     ).upstream(),
@@ -133,12 +151,28 @@ pool_inventory_job = dg.define_asset_job(
 
 pm_history_job = dg.define_asset_job(
     name="pm_history_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets("spawn_pm_history").upstream(),
     description="Archivo con listado historial de PMs",
 )
 
+excel_sidecars_job = dg.define_asset_job(
+    name="excel_sidecars_job",
+    hooks=IO_METRICS_HOOKS,
+    selection=dg.AssetSelection.assets("backfill_excel_sidecars"),
+    description="Convertir Excel crudos a parquet",
+)
+
+vacuum_delta_tables_job = dg.define_asset_job(
+    name="vacuum_delta_tables_job",
+    hooks=IO_METRICS_HOOKS,
+    selection=dg.AssetSelection.assets("vacuum_delta_tables"),
+    description="Limpiar archivos sin referencia de tablas delta",
+)
+
 fiori_job = dg.define_asset_job(
     name="fiori_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets("mutate_notifications").upstream(),
     description="Archivo con todas las OT's Fiori",
 )
@@ -158,6 +192,7 @@ manifest_ = dg.define_asset_job(
 
 plm_job = dg.define_asset_job(
     name="plm_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets("spawn_plm3_haul").upstream()
     | dg.AssetSelection.assets("spawn_plm3_alarms").upstream(),
     description="PLM Haulcycle y alarmas",
@@ -165,12 +200,14 @@ plm_job = dg.define_asset_job(
 
 oil_analysis_job = dg.define_asset_job(
     name="oil_analysis_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets("mutate_oil_analysis").upstream(),
     description="Muestras aceite SCAAE",
 )
 
 ge_job = dg.define_asset_job(
     name="ge_job",
+    hooks=IO_METRICS_HOOKS,
     selection=dg.AssetSelection.assets("mutate_events").upstream(),
     description="GE Eventos",
 )
@@ -198,6 +235,8 @@ jobs = [
     # === MAINTENANCE ===
     fiori_job,
     pm_history_job,
+    excel_sidecars_job,
+    vacuum_delta_tables_job,
     # === OPERATION ===
     # op_file_idx_job,
     plm_job,
@@ -38,16 +38,9 @@ def upsert_tibbles(
     # Ensure incoming dataframe has no duplicates, keeping the last occurrence
     unique_incoming_df = new_df.unique(subset=key_columns, keep="last")
 
-    # 1. Identify records to update (matching records between both dataframes)
-    updates = unique_incoming_df.join(existing_df.select(key_columns), on=key_columns, how="inner")
-
-    # 2. Identify new records to insert (records in incoming_df not in consolidated_df)
-    inserts = unique_incoming_df.join(existing_df.select(key_columns), on=key_columns, how="anti")
-
-    # 3. Remove outdated records from consolidated_df
+    # Existing records not superseded by an incoming one, a single anti-join covers updates and inserts
     preserved = existing_df.join(unique_incoming_df.select(key_columns), on=key_columns, how="anti")
 
-    # 4. Combine preserved records with updates and inserts
-    result_df = pl.concat([preserved, updates, inserts])
+    result_df = pl.concat([preserved, unique_incoming_df])
 
     return result_df
@@ -1,9 +1,23 @@
 from .datalake import DataLake
+from .azure_storage import AzureStorageResource
+from .delta_table import DeltaTable
+from .instrumentation import IO_METRICS_HOOKS
 from .msgraph import MSGraph
-from .sql import SQLDatabase
+from .sql import SQLDatabase, SQLDatabaseResource
 from .firebase import init_firebase
 from .utils import transfer_dl_sp
 from .masterdata import MasterData
 
 
-__all__ = ["DataLake", "MSGraph", "transfer_dl_sp", "init_firebase", "MasterData", "SQLDatabase"]
+__all__ = [
+    "DataLake",
+    "AzureStorageResource",
+    "DeltaTable",
+    "IO_METRICS_HOOKS",
+    "MSGraph",
+    "transfer_dl_sp",
+    "init_firebase",
+    "MasterData",
+    "SQLDatabase",
+    "SQLDatabaseResource",
+]
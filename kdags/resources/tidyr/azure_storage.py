@@ -0,0 +1,146 @@
+import os
+import threading
+from typing import Optional
+
+import dagster as dg
+import fsspec
+import requests
+from azure.core.pipeline.transport import RequestsTransport
+from azure.storage.blob import BlobServiceClient
+from azure.storage.filedatalake import DataLakeServiceClient
+
+from .storage_backend import FsspecBlobServiceClient, FsspecDataLakeServiceClient, Throttle
+
+# Enough keep-alive connections for the default 10-worker fan-outs plus concurrent uploads
+DEFAULT_POOL_SIZE = 32
+
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _build_session(pool_size: int) -> requests.Session:
+    """HTTP session whose connection pool is sized for the thread pools that share it"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_storage_clients(conn_str: str, pool_size: int = DEFAULT_POOL_SIZE) -> dict:
+    """
+    Return the process-wide Data Lake and Blob service clients for a connection string.
+
+    Clients are built once per connection string and share a single keep-alive connection pool,
+    so repeated DataLake instantiations and worker threads reuse warm TLS connections. Azure SDK
+    clients are thread-safe, so the same instances are handed to every caller.
+
+    Args:
+        conn_str: Azure Storage connection string
+        pool_size: Maximum number of pooled HTTP connections, used only when the clients are first built
+
+    Returns:
+        dict: {"datalake": DataLakeServiceClient, "blob": BlobServiceClient, "session": requests.Session}
+    """
+    with _CLIENTS_LOCK:
+        if conn_str not in _CLIENTS:
+            session = _build_session(pool_size)
+            _CLIENTS[conn_str] = {
+                "datalake": DataLakeServiceClient.from_connection_string(
+                    conn_str, transport=RequestsTransport(session=session, session_owner=False)
+                ),
+                "blob": BlobServiceClient.from_connection_string(
+                    conn_str, transport=RequestsTransport(session=session, session_owner=False)
+                ),
+                "session": session,
+            }
+        return _CLIENTS[conn_str]
+
+
+def get_fsspec_clients(backend: str, root: str, latency: float = 0.0, bandwidth: float = None) -> dict:
+    """
+    Return Data Lake and Blob client stand-ins backed by a local directory or process memory.
+
+    Clients are cached per configuration like get_storage_clients, so every DataLake sharing a
+    configuration sees the same files (the in-memory filesystem is process-wide in fsspec).
+
+    Args:
+        backend: "local" or "memory"
+        root: Directory containing one subdirectory per container, on disk or in the in-memory filesystem
+        latency: Seconds added to every request
+        bandwidth: Bytes per second available to each request, None for unlimited
+
+    Returns:
+        dict: {"datalake": FsspecDataLakeServiceClient, "blob": FsspecBlobServiceClient}
+    """
+    key = (backend, root, latency, bandwidth)
+    with _CLIENTS_LOCK:
+        if key not in _CLIENTS:
+            if backend == "local":
+                fs, root = fsspec.filesystem("file"), os.path.abspath(os.path.expanduser(root))
+            elif backend == "memory":
+                fs = fsspec.filesystem("memory")
+            else:
+                raise ValueError(f"Unsupported storage backend: {backend}")
+            service = FsspecDataLakeServiceClient(fs, root=root, throttle=Throttle(latency, bandwidth))
+            _CLIENTS[key] = {"datalake": service, "blob": FsspecBlobServiceClient(service)}
+        return _CLIENTS[key]
+
+
+class AzureStorageResource(dg.ConfigurableResource):
+    """
+    Dagster resource exposing the shared, connection-pooled Azure Storage clients.
+
+    backend selects where az:// paths live: "adls" (default), "local" (a directory with one
+    subdirectory per container) or "memory". The non-ADLS backends can add a fixed latency and a
+    bandwidth cap to every request so I/O-bound assets can be benchmarked offline. Defaults come
+    from KDAGS_STORAGE_BACKEND, KDAGS_STORAGE_ROOT, KDAGS_STORAGE_LATENCY_MS and
+    KDAGS_STORAGE_BANDWIDTH_MBPS.
+    """
+
+    connection_string: Optional[str] = None
+    pool_size: int = DEFAULT_POOL_SIZE
+    backend: Optional[str] = None
+    local_root: Optional[str] = None
+    latency_ms: Optional[float] = None
+    bandwidth_mbps: Optional[float] = None
+
+    @property
+    def conn_str(self) -> str:
+        return self.connection_string or os.environ["AZURE_STORAGE_CONNECTION_STRING"]
+
+    @property
+    def storage_backend(self) -> str:
+        return self.backend or os.environ.get("KDAGS_STORAGE_BACKEND", "adls")
+
+    @property
+    def storage_options(self) -> Optional[dict]:
+        """Credentials for polars/adlfs reads and writes of az:// paths, None when not on ADLS"""
+        if self.storage_backend != "adls":
+            return None
+        # Parse the connection string into a dictionary
+        conn_dict = {k: v for k, v in (item.split("=", 1) for item in self.conn_str.strip(";").split(";"))}
+        # Raises KeyError if keys are missing
+        return {
+            "AZURE_STORAGE_ACCOUNT_NAME": conn_dict["AccountName"],
+            "AZURE_STORAGE_ACCOUNT_KEY": conn_dict["AccountKey"],
+        }
+
+    def _clients(self) -> dict:
+        if self.storage_backend == "adls":
+            return get_storage_clients(self.conn_str, self.pool_size)
+
+        latency_ms = self.latency_ms if self.latency_ms is not None else os.environ.get("KDAGS_STORAGE_LATENCY_MS", 0)
+        bandwidth_mbps = self.bandwidth_mbps or os.environ.get("KDAGS_STORAGE_BANDWIDTH_MBPS")
+        return get_fsspec_clients(
+            self.storage_backend,
+            root=self.local_root or os.environ.get("KDAGS_STORAGE_ROOT", "~/kdags_lake"),
+            latency=float(latency_ms) / 1000,
+            bandwidth=float(bandwidth_mbps) * 1024**2 if bandwidth_mbps else None,
+        )
+
+    def get_datalake_service_client(self) -> DataLakeServiceClient:
+        return self._clients()["datalake"]
+
+    def get_blob_service_client(self) -> BlobServiceClient:
+        return self._clients()["blob"]
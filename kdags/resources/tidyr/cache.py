@@ -0,0 +1,119 @@
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+_DEFAULT_CACHE_DIR = Path.home() / ".cache" / "kdags"
+_DEFAULT_MAX_BYTES = 5 * 1024**3  # 5 GB
+
+_CACHES = {}
+_CACHES_LOCK = threading.Lock()
+
+
+class LocalCache:
+    """
+    On-disk, content-addressed cache with a size cap and LRU eviction.
+
+    Entries are keyed by a hash of the remote path plus its version tag (ETag / last_modified),
+    so a changed remote file simply produces a new key and stale entries age out through eviction.
+    Recency is tracked through the file modification time, which is bumped on every hit.
+    """
+
+    def __init__(self, namespace: str = "default", cache_dir: str = None, max_bytes: int = None):
+        base_dir = Path(cache_dir or os.environ.get("KDAGS_CACHE_DIR", _DEFAULT_CACHE_DIR))
+        self.cache_dir = base_dir / namespace
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes or os.environ.get("KDAGS_CACHE_MAX_BYTES", _DEFAULT_MAX_BYTES))
+
+        self._lock = threading.Lock()
+        self._total_bytes = sum(entry.stat().st_size for entry in os.scandir(self.cache_dir) if entry.is_file())
+        self.stats = {"hits": 0, "misses": 0, "bytes_saved": 0}
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Build a cache key from the remote path and its version tags."""
+        return hashlib.sha256("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def get(self, key: str):
+        """Return cached bytes for key, or None on a miss."""
+        entry_path = self._entry_path(key)
+        try:
+            data = entry_path.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+
+        # Mark as recently used
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+        with self._lock:
+            self.stats["hits"] += 1
+            self.stats["bytes_saved"] += len(data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store bytes under key, evicting least recently used entries when over the size cap."""
+        if len(data) > self.max_bytes:
+            return
+
+        entry_path = self._entry_path(key)
+        # Write to a temp file first so concurrent readers never see partial content
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            existed = entry_path.exists()
+            os.replace(tmp_path, entry_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            if not existed:
+                self._total_bytes += len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits in max_bytes. Caller holds the lock."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and not entry.name.startswith(".tmp-"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+        self._total_bytes = total
+
+    def clear(self) -> None:
+        """Remove every entry in this cache namespace."""
+        with self._lock:
+            for entry in os.scandir(self.cache_dir):
+                if entry.is_file():
+                    os.remove(entry.path)
+            self._total_bytes = 0
+
+
+def get_local_cache(namespace: str = "default") -> LocalCache:
+    """Return the process-wide LocalCache for a namespace, creating it on first use."""
+    with _CACHES_LOCK:
+        if namespace not in _CACHES:
+            _CACHES[namespace] = LocalCache(namespace=namespace)
+        return _CACHES[namespace]
@@ -1,15 +1,24 @@
-from azure.storage.filedatalake import DataLakeServiceClient
 import polars as pl
 import os
 import pandas as pd
 from io import BytesIO
-from urllib.parse import urlparse
-from datetime import datetime, timedelta
+from urllib.parse import quote, urlparse
+from datetime import datetime, timedelta, timezone
+import hashlib
 import re
+import time
 import dagster as dg
-from azure.storage.blob import BlobClient
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceNotFoundError
 import requests
 
+from kdags.resources.dplyr import upsert_tibbles
+
+from .azure_storage import AzureStorageResource
+from .cache import get_local_cache
+from .delta_table import DeltaTable
+from .instrumentation import instrument, propagate_io, record_io
+
 
 def extract_partition_date(az_path: str) -> datetime:
     """Extract date from partition path"""
@@ -20,34 +29,75 @@ def extract_partition_date(az_path: str) -> datetime:
     return None
 
 
+def extract_partition_start(az_path: str) -> datetime:
+    """Extract the start date of a daily (y=/m=/d=) or monthly (y=/m=) partition path"""
+    partition_date = extract_partition_date(az_path)
+    if partition_date:
+        return partition_date
+    match = re.search(r"y=(\d{4})/m=(\d{2})", az_path)
+    if match:
+        year, month = map(int, match.groups())
+        # Use the first day of the month
+        return datetime(year, month, 1)
+    return None
+
+
+# Directory name hive writers use for null partition values
+HIVE_DEFAULT_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# Parsed raw Excel files are kept here as parquet, one sidecar per source ETag and parse options
+EXCEL_SIDECAR_ROOT = "az://bhp-process-data/STATE/EXCEL_SIDECAR"
+# Only raw-zone workbooks get sidecars, processed outputs are written once and rarely re-read
+EXCEL_SIDECAR_PREFIXES = ("az://bhp-raw-data/",)
+
+
 class DataLake:
-    def __init__(self, context: dg.AssetExecutionContext = None):
+    def __init__(
+        self,
+        context: dg.AssetExecutionContext = None,
+        use_cache: bool = True,
+        storage: AzureStorageResource = None,
+        use_sidecar: bool = True,
+    ):
         self.context_check = isinstance(context, dg.AssetExecutionContext)
         self.context = context
-        self._conn_str = os.environ["AZURE_STORAGE_CONNECTION_STRING"]
-        # Parse the connection string into a dictionary
-        conn_dict = {
-            k: v
-            for k, v in (
-                item.split("=", 1) for item in os.environ["AZURE_STORAGE_CONNECTION_STRING"].strip(";").split(";")
+        # Clients and their HTTP connection pool are shared process-wide through the storage resource
+        self.storage = storage or AzureStorageResource()
+        # None on the local / in-memory backends, whose reads and writes go through the clients below
+        self._storage_options = self.storage.storage_options
+
+        self.client = self.storage.get_datalake_service_client()
+        self.blob_client = self.storage.get_blob_service_client()
+
+        # Local read cache shared by every DataLake in the process
+        self.cache = get_local_cache("datalake") if use_cache else None
+        self.use_sidecar = use_sidecar
+
+    @property
+    def cache_stats(self) -> dict:
+        """Hit / miss counters of the local cache, shared by every instance using the same cache"""
+        if self.cache is None:
+            return {"hits": 0, "misses": 0, "bytes_saved": 0}
+        return dict(self.cache.stats)
+
+    def _log_cache_event(self, event: str, az_path: str, size: int) -> None:
+        """Report a cache lookup and the cache counters to the Dagster log"""
+        if self.context_check:
+            stats = self.cache_stats
+            label = "Cache hit" if event == "hits" else "Cache miss"
+            self.context.log.info(
+                f"{label} for {az_path} ({size} bytes) | hits={stats['hits']}, "
+                f"misses={stats['misses']}, "
+                f"bytes_saved={stats['bytes_saved'] / 1024**2:.1f} MB"
             )
-        }
-
-        # Construct the desired dictionary, raising KeyError if keys are missing
-        self._storage_options = {
-            "AZURE_STORAGE_ACCOUNT_NAME": conn_dict["AccountName"],
-            "AZURE_STORAGE_ACCOUNT_KEY": conn_dict["AccountKey"],
-        }
-
-        self.client = DataLakeServiceClient.from_connection_string(self._conn_str)
 
     def _manifest(self, manifest_path: str) -> pl.DataFrame:
         """Get manifest of all files with processing status"""
-        if self.az_path_exists(manifest_path):
-            return self.read_tibble(manifest_path)
-        else:
+        manifest = self.read_tibble(manifest_path, raise_if_missing=False)
+        if manifest.is_empty():
             # Return empty DataFrame with expected schema
             return pl.DataFrame({"az_path": [], "file_size": [], "last_modified": [], "processed_at": []})
+        return manifest
 
     def upsert_tibble(
         self,
@@ -57,6 +107,7 @@ class DataLake:
         date_column: str = "partition_date",
         add_partition_date: bool = True,
         cleaning_fn=None,
+        mode: str = "full",
     ) -> (pl.DataFrame, pl.DataFrame):
         """
         Upsert (update/insert) data with deduplication
@@ -67,10 +118,18 @@ class DataLake:
             dedup_keys: Columns to use as unique keys for deduplication
             date_column: Column name for determining latest record
             add_partition_date: Whether to extract date from partition path
+            mode: How much of the raw zone to read
+                - "full": re-read every file in the manifest and deduplicate the whole history
+                - "incremental": read only unprocessed files and merge them into analytics_df
+                - "latest_snapshot": read only the newest unprocessed file (each snapshot contains
+                  full history) and merge it into analytics_df; a snapshot that fails to read or has
+                  no rows after cleaning is left unprocessed and the next newest one is used instead
 
         Returns:
             Tuple of (deduplicated_analytics_df, updated_manifest_df)
         """
+        if mode not in ["full", "incremental", "latest_snapshot"]:
+            raise ValueError(f"Unsupported upsert mode: {mode}. Expected 'full', 'incremental' or 'latest_snapshot'")
 
         # Find unprocessed files
         unprocessed_files = manifest_df.filter(pl.col("processed_at").is_null())
@@ -82,13 +141,25 @@ class DataLake:
             return analytics_df if analytics_df is not None else pl.DataFrame(), manifest_df
 
         if self.context:
-            self.context.log.info(f"Processing {unprocessed_files.height} new files")
+            self.context.log.info(f"Processing {unprocessed_files.height} new files ({mode} mode)")
+
+        if mode == "full":
+            # Read ALL files (since each contains full history)
+            rows_to_read = manifest_df.to_dicts()
+        elif mode == "incremental":
+            rows_to_read = unprocessed_files.to_dicts()
+        else:
+            # Newest first, the first snapshot with rows supersedes every older unprocessed one
+            rows_to_read = sorted(
+                unprocessed_files.to_dicts(),
+                key=lambda row: (extract_partition_date(row["az_path"]) or datetime.min, row["az_path"]),
+                reverse=True,
+            )
 
-        # Read ALL files (since each contains full history)
         all_tibbles = []
         processed_paths = []
 
-        for row in manifest_df.to_dicts():
+        for position, row in enumerate(rows_to_read):
             try:
 
                 tibble = self.read_tibble(row["az_path"])
@@ -99,16 +170,24 @@ class DataLake:
 
                 # Add partition date if requested
                 if add_partition_date:
-                    match = re.search(r"y=(\d{4})/m=(\d{2})/d=(\d{2})", row["az_path"])
-                    if match:
-                        y, m, d = map(int, match.groups())
-                        tibble = tibble.with_columns(pl.lit(datetime(y, m, d)).alias(date_column))
+                    partition_date = extract_partition_date(row["az_path"])
+                    if partition_date:
+                        tibble = tibble.with_columns(pl.lit(partition_date).alias(date_column))
+
+                if mode == "latest_snapshot" and tibble.is_empty():
+                    if self.context:
+                        self.context.log.warning(f"No rows in snapshot {row['az_path']}, trying the previous one")
+                    continue
 
                 all_tibbles.append(tibble)
 
                 # Track successfully processed files
                 if row["processed_at"] is None:
                     processed_paths.append(row["az_path"])
+                if mode == "latest_snapshot":
+                    # This snapshot also covers every older unprocessed one
+                    processed_paths = [older["az_path"] for older in rows_to_read[position:]]
+                    break
 
             except Exception as e:
                 if self.context:
@@ -116,7 +195,7 @@ class DataLake:
                 continue
 
         # Combine all data
-        if all_tibbles:
+        if all_tibbles and mode == "full":
             combined_data = pl.concat(all_tibbles)
 
             # If we have existing analytics data, include it
@@ -124,10 +203,32 @@ class DataLake:
                 combined_data = pl.concat([analytics_df, combined_data], how="diagonal")
 
             # Deduplicate: keep record with latest date_column value
-            deduplicated_df = combined_data.sort(date_column, descending=True).unique(subset=dedup_keys, keep="first")
+            deduplicated_df = combined_data.sort(date_column, descending=True, nulls_last=True).unique(
+                subset=dedup_keys, keep="first"
+            )
 
             if self.context:
                 self.context.log.info(f"Deduplicated from {combined_data.height} to {deduplicated_df.height} rows")
+        elif all_tibbles:
+            # Only the new data is sorted, existing rows are merged by key with an anti-join
+            new_data = (
+                pl.concat(all_tibbles, how="diagonal")
+                .sort(date_column, descending=True, nulls_last=True)
+                .unique(subset=dedup_keys, keep="first")
+            )
+
+            if analytics_df is not None and analytics_df.height > 0:
+                preserved = analytics_df.join(new_data.select(dedup_keys), on=dedup_keys, how="anti")
+                deduplicated_df = pl.concat([preserved, new_data], how="diagonal")
+            else:
+                preserved = pl.DataFrame()
+                deduplicated_df = new_data
+
+            if self.context:
+                self.context.log.info(
+                    f"Merged {new_data.height} new rows into {preserved.height} preserved rows "
+                    f"({deduplicated_df.height} total)"
+                )
         else:
             deduplicated_df = analytics_df if analytics_df is not None else pl.DataFrame()
 
@@ -139,7 +240,8 @@ class DataLake:
             .otherwise(pl.col("processed_at"))
             .alias("processed_at")
         )
-        deduplicated_df = deduplicated_df.with_columns(date_column=pl.col(date_column).cast(pl.Date))
+        if date_column in deduplicated_df.columns:
+            deduplicated_df = deduplicated_df.with_columns(pl.col(date_column).cast(pl.Date))
         return deduplicated_df, updated_manifest
 
     def prepare_manifest(self, manifest: pl.DataFrame, raw_path: str) -> pl.DataFrame:
@@ -185,12 +287,9 @@ class DataLake:
 
     def get_blob_client(self, az_path: str):
         container, file_path = self._parse_az_path(az_path)
-        return BlobClient.from_connection_string(
-            conn_str=self._conn_str,
-            container_name=container,
-            blob_name=file_path,
-        )
+        return self.blob_client.get_blob_client(container=container, blob=file_path)
 
+    @instrument("list_paths")
     def list_paths(self, az_path: str, recursive: bool = True) -> pl.DataFrame:
 
         container, path = self._parse_az_path(az_path)
@@ -219,40 +318,66 @@ class DataLake:
             ]
         return pl.DataFrame(files)
 
+    @instrument("read_bytes")
     def read_bytes(self, az_path: str) -> bytes:
 
         container, file_path = self._parse_az_path(az_path)
         file_system_client = self.get_file_system_client(f"az://{container}")
         file_client = file_system_client.get_file_client(file_path)
 
-        downloaded_data = file_client.download_file()
-        return downloaded_data.readall()
-
+        if self.cache is None:
+            data = file_client.download_file().readall()
+            record_io(nbytes=len(data))
+            return data
+
+        # Revalidate with a cheap properties call, unchanged files are served from local disk
+        properties = file_client.get_file_properties()
+        cache_key = self.cache.make_key(az_path, properties.etag, properties.last_modified)
+        data = self.cache.get(cache_key)
+        if data is not None:
+            self._log_cache_event("hits", az_path, len(data))
+            record_io(cache_hit=True)
+            return data
+
+        # Pin the download to the revalidated version so the cache never stores a newer body under an older ETag
+        downloaded_data = file_client.download_file(etag=properties.etag, match_condition=MatchConditions.IfNotModified)
+        data = downloaded_data.readall()
+        self.cache.put(cache_key, data)
+        self._log_cache_event("misses", az_path, len(data))
+        record_io(nbytes=len(data))
+        return data
+
+    @instrument("read_tibble")
     def read_tibble(
         self, az_path: str, raise_if_missing: bool = False, include_az_path: bool = False, **kwargs
     ) -> pl.DataFrame:
 
-        # Check if file exists first when raise_if_missing is False
-        if not raise_if_missing and not self.az_path_exists(az_path):
-            if self.context_check:
-                self.context.log.warning(f"File does not exist: {az_path}. Returning empty DataFrame.")
-            return pl.DataFrame()
-
         if self.context_check:
             self.context.log.info(f"Reading data from Azure path: {az_path}")
 
         ext = az_path.split(".")[-1].lower()
-
-        if ext == "parquet":
-            df = pl.read_parquet(az_path, storage_options=self._storage_options, **kwargs)
-        elif ext == "csv":
-            df = pl.read_csv(az_path, storage_options=self._storage_options, **kwargs)
-        elif ext in ["xlsx", "xls"]:
-            file_content = self.read_bytes(az_path)
-            buffer = BytesIO(file_content)
-            df = pl.read_excel(buffer, **kwargs)
-        else:
+        if ext not in ["parquet", "csv", "xlsx", "xls"]:
             raise ValueError(f"Unsupported file type: {ext}")
+
+        # Optimistic read: attempt the download directly instead of checking existence first
+        try:
+            if ext in ["xlsx", "xls"] and self.use_sidecar and az_path.startswith(EXCEL_SIDECAR_PREFIXES):
+                df, _ = self._read_excel_sidecar(az_path, kwargs)
+            else:
+                # All formats go through read_bytes so they share the local read cache
+                buffer = BytesIO(self.read_bytes(az_path))
+                if ext == "parquet":
+                    df = pl.read_parquet(buffer, **kwargs)
+                elif ext == "csv":
+                    df = pl.read_csv(buffer, **kwargs)
+                else:
+                    df = pl.read_excel(buffer, **kwargs)
+        except ResourceNotFoundError:
+            if raise_if_missing:
+                raise
+            if self.context_check:
+                self.context.log.warning(f"File does not exist: {az_path}. Returning empty DataFrame.")
+            return pl.DataFrame()
         if include_az_path and not df.is_empty():
             df = df.with_columns(pl.lit(az_path).alias("az_path"))
 
@@ -275,6 +400,345 @@ class DataLake:
 
         return df
 
+    def _sidecar_path(self, az_path: str, etag: str, read_kwargs: dict) -> str:
+        """Parquet sidecar location for one version of a raw Excel file and its parse options"""
+        container, file_path = self._parse_az_path(az_path)
+        options_key = hashlib.sha256(repr(sorted(read_kwargs.items())).encode("utf-8")).hexdigest()[:16]
+        etag_key = hashlib.sha256(etag.encode("utf-8")).hexdigest()[:16]
+        return f"{EXCEL_SIDECAR_ROOT}/{container}/{file_path}/{options_key}-{etag_key}.parquet"
+
+    def _prune_sidecars(self, sidecar_path: str) -> None:
+        """Delete the sidecars of older versions of a workbook parsed with the same options"""
+        directory, name = sidecar_path.rsplit("/", 1)
+        options_key = name.split("-")[0]
+        stale = [
+            path
+            for path in self.list_paths(directory, recursive=False)["az_path"].to_list()
+            if path != sidecar_path
+            # Sidecars named without an options prefix predate the options-etag layout
+            and (path.split("/")[-1].startswith(f"{options_key}-") or "-" not in path.split("/")[-1])
+        ]
+        if stale:
+            self.delete_files(stale)
+
+    def _read_sidecar_bytes(self, sidecar_path: str) -> bytes:
+        """Download a sidecar without revalidating it, its name carries the source ETag so it never changes"""
+        cache_key = self.cache.make_key(sidecar_path) if self.cache is not None else None
+        data = self.cache.get(cache_key) if cache_key else None
+        if data is not None:
+            self._log_cache_event("hits", sidecar_path, len(data))
+            record_io(cache_hit=True)
+            return data
+
+        container, file_path = self._parse_az_path(sidecar_path)
+        data = self.get_file_system_client(f"az://{container}").get_file_client(file_path).download_file().readall()
+        if cache_key:
+            self.cache.put(cache_key, data)
+            self._log_cache_event("misses", sidecar_path, len(data))
+        record_io(nbytes=len(data))
+        return data
+
+    def _read_excel_sidecar(self, az_path: str, read_kwargs: dict, load: bool = True) -> tuple:
+        """
+        Parse a raw Excel file through its parquet sidecar
+
+        The sidecar is keyed by the source ETag and the read_excel arguments, so an edited workbook or
+        different parse options never reuse a stale conversion. Writing a new sidecar deletes those
+        of older ETags with the same options.
+
+        Args:
+            az_path: Path to the .xlsx / .xls file
+            read_kwargs: Arguments passed to pl.read_excel
+            load: Return the DataFrame; when False an existing sidecar is only checked, not downloaded
+
+        Returns:
+            tuple: (DataFrame or None, whether the workbook was converted)
+        """
+        container, file_path = self._parse_az_path(az_path)
+        file_client = self.get_file_system_client(f"az://{container}").get_file_client(file_path)
+        sidecar_path = self._sidecar_path(az_path, file_client.get_file_properties().etag, read_kwargs)
+
+        if load:
+            try:
+                df = pl.read_parquet(BytesIO(self._read_sidecar_bytes(sidecar_path)))
+                if self.context_check:
+                    self.context.log.info(f"Read {az_path} from parquet sidecar {sidecar_path}")
+                return df, False
+            except ResourceNotFoundError:
+                pass
+        elif self.az_path_exists(sidecar_path):
+            return None, False
+
+        df = pl.read_excel(BytesIO(self.read_bytes(az_path)), **read_kwargs)
+        # Multi-sheet reads return a dict of frames, those are not cached
+        if isinstance(df, pl.DataFrame):
+            try:
+                self.upload_tibble(df, sidecar_path)
+                self._prune_sidecars(sidecar_path)
+            except Exception as e:
+                # The sidecar is only an accelerator, a failed write must not fail the read
+                if self.context_check:
+                    self.context.log.warning(f"Could not write parquet sidecar for {az_path}: {e}")
+        return df, True
+
+    def backfill_excel_sidecars(self, az_path: str, max_workers: int = 10, **kwargs) -> dict:
+        """
+        Convert every raw Excel file under a directory to its parquet sidecar concurrently
+
+        Args:
+            az_path: Directory to search recursively for .xlsx / .xls files
+            max_workers: Number of workbooks converted concurrently
+            **kwargs: read_excel arguments, must match those the consuming assets pass to read_tibble
+
+        Returns:
+            dict: Results with counts, converted files and errors
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        files_df = self.list_paths(az_path)
+        az_paths = [] if files_df.is_empty() else files_df["az_path"].to_list()
+        az_paths = [path for path in az_paths if path.lower().endswith((".xlsx", ".xls"))]
+
+        results = {"total": len(az_paths), "successful": 0, "failed": 0, "converted": 0, "errors": []}
+        if not az_paths:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(az_paths))) as executor:
+            futures = {
+                executor.submit(propagate_io(self._read_excel_sidecar), path, kwargs, load=False): path
+                for path in az_paths
+            }
+            for future in as_completed(futures):
+                try:
+                    _, converted = future.result()
+                    results["successful"] += 1
+                    results["converted"] += int(converted)
+                except Exception as e:
+                    results["failed"] += 1
+                    results["errors"].append({"az_path": futures[future], "error": str(e)})
+
+        if self.context_check:
+            self.context.log.info(
+                f"Backfilled sidecars under {az_path}: {results['converted']} converted, "
+                f"{results['successful'] - results['converted']} already present, {results['failed']} failed"
+            )
+
+        return results
+
+    def _list_partition_dirs(
+        self,
+        az_path: str,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        max_workers: int = 10,
+        details: bool = False,
+    ) -> list:
+        """
+        Walk y=/m=/d= partition levels breadth-first and return the deepest partition directories,
+        pruning every subtree that falls outside [start_date, end_date] before descending into it.
+        Directories of the same level are listed concurrently. A __HIVE_DEFAULT_PARTITION__ directory
+        (rows without a date) is returned as a leaf only when no date bound is given.
+
+        Args:
+            az_path: Root of the hive-partitioned dataset (e.g. "az://container/DATASET")
+            start_date: Earliest partition date to keep (inclusive), None for no lower bound
+            end_date: Latest partition date to keep (inclusive), None for no upper bound
+            max_workers: Maximum number of concurrent listing requests
+            details: Return (dir_path, partition_key, last_modified) tuples instead of bare paths
+
+        Returns:
+            list: Directory paths relative to the container, one per surviving leaf partition
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        container, base_path = self._parse_az_path(az_path)
+        file_system_client = self.get_file_system_client(f"az://{container}")
+
+        levels = ["y", "m", "d"]
+        lower = (start_date.year, start_date.month, start_date.day) if start_date else None
+        upper = (end_date.year, end_date.month, end_date.day) if end_date else None
+
+        def in_window(key: tuple) -> bool:
+            # Compare only as many date parts as the partition level carries
+            if lower and key < lower[: len(key)]:
+                return False
+            if upper and key > upper[: len(key)]:
+                return False
+            return True
+
+        def list_children(node: tuple) -> list:
+            dir_path, key, _ = node
+            level = levels[len(key)]
+            children = []
+            for item in file_system_client.get_paths(path=dir_path, recursive=False):
+                name = item.name.split("/")[-1]
+                if item.is_directory and name == f"{level}={HIVE_DEFAULT_PARTITION}":
+                    # Rows without a date, they belong to no date window
+                    if not lower and not upper:
+                        default_leaves.append((item.name, key, item.last_modified))
+                elif item.is_directory and name.startswith(f"{level}="):
+                    try:
+                        children.append((item.name, key + (int(name.split("=")[1]),), item.last_modified))
+                    except ValueError:
+                        continue
+            return children
+
+        leaves = []
+        default_leaves = []
+        frontier = [(base_path.rstrip("/"), (), None)]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while frontier:
+                # Nodes at the deepest level are leaves without another listing
+                leaves.extend(node for node in frontier if len(node[1]) == len(levels))
+                to_expand = [node for node in frontier if len(node[1]) < len(levels)]
+
+                next_frontier = []
+                for node, children in zip(to_expand, executor.map(list_children, to_expand)):
+                    if not children:
+                        # No deeper partition level, this directory is a leaf
+                        leaves.append(node)
+                        continue
+                    next_frontier.extend(child for child in children if in_window(child[1]))
+                frontier = next_frontier
+
+        leaves.extend(default_leaves)
+        return leaves if details else [dir_path for dir_path, _, _ in leaves]
+
+    def _list_files_in_dirs(
+        self, container: str, dir_paths: list, max_workers: int = 10, include_partition: bool = False
+    ) -> list:
+        """
+        Recursively list the files under several directories concurrently.
+
+        Args:
+            container: Container (file system) name
+            dir_paths: Directory paths relative to the container
+            max_workers: Maximum number of concurrent listings
+            include_partition: Add the listed directory to each record under "partition"
+
+        Returns:
+            list: File records with az_path, file_size and last_modified
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        file_system_client = self.get_file_system_client(f"az://{container}")
+
+        def list_dir(dir_path: str) -> list:
+            return [
+                {
+                    "az_path": f"az://{container}/{item.name}",
+                    "file_size": item.content_length,
+                    "last_modified": item.last_modified,
+                    **({"partition": dir_path} if include_partition else {}),
+                }
+                for item in file_system_client.get_paths(path=dir_path, recursive=True)
+                if not item.is_directory
+            ]
+
+        files = []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(dir_paths)))) as executor:
+            futures = {executor.submit(list_dir, dir_path): dir_path for dir_path in dir_paths}
+            for future in as_completed(futures):
+                try:
+                    files.extend(future.result())
+                except Exception as e:
+                    if self.context_check:
+                        self.context.log.warning(f"Error listing {futures[future]}: {str(e)}")
+        return files
+
+    @instrument("scan_dataset")
+    def scan_dataset(
+        self,
+        az_path: str,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        hive_partitioning: bool = True,
+        **kwargs,
+    ) -> pl.LazyFrame:
+        """
+        Lazily scan a y=/m=/d= hive-partitioned parquet dataset.
+
+        Partitions outside the date range are never listed or downloaded, and projections/filters
+        applied to the returned LazyFrame are pushed down to the parquet reader.
+
+        Args:
+            az_path: Root of the dataset (e.g. "az://bhp-process-data/RESO/DOCUMENTS")
+            start_date: Earliest partition date to include (inclusive)
+            end_date: Latest partition date to include (inclusive)
+            hive_partitioning: Expose y/m/d partition values as columns
+            **kwargs: Additional arguments passed to pl.scan_parquet
+
+        Returns:
+            pl.LazyFrame: Lazy view over the selected partitions
+        """
+        container, _ = self._parse_az_path(az_path)
+
+        partition_dirs = self._list_partition_dirs(az_path, start_date=start_date, end_date=end_date)
+        files = sorted(
+            record["az_path"]
+            for record in self._list_files_in_dirs(container, partition_dirs)
+            # Files prefixed with "_" hold dataset metadata, not data
+            if record["az_path"].lower().endswith(".parquet") and not record["az_path"].split("/")[-1].startswith("_")
+        )
+
+        if self.context_check:
+            self.context.log.info(f"Scanning {len(files)} files in {len(partition_dirs)} partitions of {az_path}")
+
+        if not files:
+            return pl.LazyFrame()
+
+        if self._storage_options is None:
+            return self._read_parquet_files(files, hive_partitioning=hive_partitioning, **kwargs).lazy()
+
+        return pl.scan_parquet(
+            files, storage_options=self._storage_options, hive_partitioning=hive_partitioning, **kwargs
+        )
+
+    def _read_parquet_files(self, az_paths: list, hive_partitioning: bool = False, **kwargs) -> pl.DataFrame:
+        """Eagerly read parquet files through the storage clients, for backends polars cannot reach"""
+        frames = []
+        for az_path in az_paths:
+            df = pl.read_parquet(BytesIO(self.read_bytes(az_path)), **kwargs)
+            if hive_partitioning:
+                df = df.with_columns(
+                    pl.lit(int(value) if value.isdigit() else value).alias(key)
+                    for key, value in re.findall(r"/([^/=]+)=([^/]+)(?=/)", az_path)
+                )
+            frames.append(df)
+        return pl.concat(frames, how="diagonal_relaxed")
+
+    def scan_tibble(self, az_path: str, **kwargs) -> pl.LazyFrame:
+        """
+        Lazily scan a file (or a hive-partitioned directory) from Azure Data Lake.
+
+        Unlike read_tibble nothing is downloaded until the LazyFrame is collected, so
+        .select/.filter calls only fetch the needed columns and row groups.
+
+        Args:
+            az_path: File path (e.g. "az://container/path/file.parquet") or dataset directory
+            **kwargs: Additional arguments passed to pl.scan_parquet / pl.scan_csv / scan_dataset
+
+        Returns:
+            pl.LazyFrame: Lazy view over the data
+        """
+        ext = az_path.split("/")[-1].split(".")[-1].lower() if "." in az_path.split("/")[-1] else ""
+
+        if self.context_check:
+            self.context.log.info(f"Scanning data from Azure path: {az_path}")
+
+        if ext in ["xlsx", "xls"] or (ext in ["parquet", "csv"] and self._storage_options is None):
+            # Excel has no lazy reader and non-ADLS backends are only reachable through read_bytes
+            return self.read_tibble(az_path, raise_if_missing=True, **kwargs).lazy()
+        elif ext == "parquet":
+            return pl.scan_parquet(az_path, storage_options=self._storage_options, **kwargs)
+        elif ext == "csv":
+            return pl.scan_csv(az_path, storage_options=self._storage_options, **kwargs)
+        elif ext == "":
+            return self.scan_dataset(az_path, **kwargs)
+        else:
+            raise ValueError(f"Unsupported file type: {ext}")
+
+    @instrument("upload_tibble")
     def upload_tibble(self, tibble, az_path: str, **kwargs) -> str:
         self.context_check = isinstance(self.context, dg.AssetExecutionContext)
         if self.context_check:
@@ -282,6 +746,22 @@ class DataLake:
 
         format = az_path.split(".")[-1].lower()
 
+        if self._storage_options is None:
+            # Local / in-memory backends: serialize here and upload through the storage clients
+            buffer = BytesIO()
+            if format == "parquet" and hasattr(tibble, "to_parquet"):
+                tibble.to_parquet(buffer, **kwargs)
+            elif format == "parquet":
+                tibble.write_parquet(buffer, **kwargs)
+            elif format == "csv" and hasattr(tibble, "to_csv"):
+                tibble.to_csv(buffer, **kwargs)
+            elif format == "csv":
+                tibble.write_csv(buffer, **kwargs)
+            else:
+                raise ValueError(f"Unsupported format: {format}")
+            self.upload_bytes(buffer.getvalue(), az_path)
+            return az_path
+
         # Convert DataFrame to bytes based on format
         if format.lower() == "parquet":
             if hasattr(tibble, "to_parquet"):
@@ -310,19 +790,28 @@ class DataLake:
 
         return az_path
 
-    def upload_bytes(self, data: bytes, az_path: str) -> str:
+    @instrument("upload_stream")
+    def upload_stream(
+        self, stream, az_path: str, chunk_size: int = 8 * 1024**2, max_concurrency: int = 4, overwrite: bool = True
+    ) -> str:
         """
-        Upload bytes directly to Azure Data Lake Storage
+        Upload from any file-like object in fixed-size blocks appended concurrently
+
+        Blocks are read sequentially from the stream and appended at their computed offsets by a
+        bounded worker pool, then the file is flushed once. Memory stays bounded by
+        chunk_size * (max_concurrency + 1) regardless of the payload size.
 
         Args:
-            data: Bytes to upload
+            stream: File-like object with a read(size) method (e.g. an HTTP response body)
             az_path: Destination path in format "az://container/path/to/file.ext"
+            chunk_size: Size of each appended block in bytes
+            max_concurrency: Maximum number of blocks in flight
+            overwrite: Replace an existing file, otherwise raise ResourceExistsError if it exists
 
         Returns:
             str: The destination az_path if successful
         """
-        if self.context_check:
-            self.context.log.info(f"Uploading {len(data)} bytes to {az_path}")
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
         # Parse the destination az_path
         container, file_path = self._parse_az_path(az_path)
@@ -336,56 +825,370 @@ class DataLake:
             directory_client = file_system_client.get_directory_client(directory_path)
             directory_client.create_directory()
 
-        # Get file client
+        # Get file client and create or overwrite the file
         file_client = file_system_client.get_file_client(file_path)
-
-        # Create or overwrite the file
-        file_client.create_file()
-
-        # Upload the data
-        file_client.append_data(data, 0, len(data))
+        if overwrite:
+            file_client.create_file()
+        else:
+            # Atomic create-if-missing, used to claim a path exactly once
+            file_client.create_file(match_condition=MatchConditions.IfMissing)
+
+        started = time.monotonic()
+        offset = 0
+        in_flight = set()
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            while True:
+                block = stream.read(chunk_size)
+                if not block:
+                    break
+
+                # Wait for a free slot before reading further, which bounds memory use
+                if len(in_flight) >= max_concurrency:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+
+                in_flight.add(executor.submit(file_client.append_data, block, offset, len(block)))
+                offset += len(block)
+
+            for future in in_flight:
+                future.result()
 
         # Flush to finalize the file
-        file_client.flush_data(len(data))
+        file_client.flush_data(offset)
+        record_io(nbytes=offset)
 
         if self.context_check:
-            self.context.log.info(f"Successfully uploaded to {az_path}")
+            elapsed = max(time.monotonic() - started, 1e-6)
+            self.context.log.info(
+                f"Uploaded {offset / 1024**2:.1f} MB to {az_path} in {elapsed:.1f}s "
+                f"({offset / 1024**2 / elapsed:.1f} MB/s)"
+            )
 
         return az_path
 
-    def upload_file(self, source_url: str, destination_az_path: str) -> str:
+    @instrument("write_dataset")
+    def write_dataset(
+        self,
+        tibble: pl.DataFrame,
+        az_path: str,
+        partition_by: list = None,
+        date_column: str = None,
+        date_granularity: str = "month",
+        sort_by: list = None,
+        row_group_size: int = 128 * 1024,
+        compression: str = "zstd",
+        only_changed: bool = True,
+        max_workers: int = 10,
+    ) -> dict:
+        """
+        Write a table as a hive-partitioned parquet dataset, rewriting only partitions that changed.
 
-        # Download from HTTP URL
-        response = requests.get(source_url)
-        response.raise_for_status()
-        file_content = response.content
+        Partitions are derived from date_column (y=/m=/d= down to date_granularity) followed by the
+        partition_by columns (e.g. site_name=MEL/), with values percent-encoded and nulls written to
+        __HIVE_DEFAULT_PARTITION__. Each partition is written as one zstd-compressed
+        parquet file with column statistics and bounded row groups. A _partitions.parquet manifest
+        keeps a content hash per partition so unchanged partitions are skipped and partitions that
+        no longer have rows are deleted. Partition columns are kept inside the files, so readers get
+        the original columns back without hive partitioning.
 
-        # Parse the destination az_path
-        dest_container, dest_path = self._parse_az_path(destination_az_path)
+        Args:
+            tibble: Polars DataFrame to write
+            az_path: Dataset root directory (e.g. "az://bhp-analytics-data/MAINTENANCE/NOTIFICATIONS/notifications")
+            partition_by: Extra columns to partition by after the date levels
+            date_column: Date/datetime column used to derive y=/m=/d= partitions
+            date_granularity: "year", "month" or "day"
+            sort_by: Columns to sort each partition by, which tightens min/max statistics
+            row_group_size: Maximum rows per parquet row group
+            compression: Parquet compression codec
+            only_changed: Skip partitions whose content hash matches the manifest
+            max_workers: Number of partitions uploaded concurrently
 
-        # Get a file system client for the destination container
-        file_system_client = self.client.get_file_system_client(dest_container)
+        Returns:
+            dict: Counts of partitions written, unchanged and deleted
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if date_granularity not in ["year", "month", "day"]:
+            raise ValueError(f"Unsupported date_granularity: {date_granularity}. Expected 'year', 'month' or 'day'")
+
+        az_path = az_path.rstrip("/")
+        manifest_path = f"{az_path}/_partitions.parquet"
+
+        # Partition keys are computed next to the data and never written into the files
+        key_exprs = []
+        if date_column:
+            key_exprs.append(pl.col(date_column).dt.year().alias("__y"))
+            if date_granularity in ["month", "day"]:
+                key_exprs.append(pl.col(date_column).dt.month().alias("__m"))
+            if date_granularity == "day":
+                key_exprs.append(pl.col(date_column).dt.day().alias("__d"))
+        key_exprs.extend(pl.col(column).alias(f"__{column}") for column in partition_by or [])
+        key_columns = [expr.meta.output_name() for expr in key_exprs]
+
+        if sort_by:
+            tibble = tibble.sort(sort_by)
+
+        def partition_dir(key_values: tuple) -> str:
+            parts = []
+            for column, value in zip(key_columns, key_values):
+                name = column[2:]
+                if value is None:
+                    parts.append(f"{name}={HIVE_DEFAULT_PARTITION}")
+                elif name in ["m", "d"]:
+                    parts.append(f"{name}={value:02d}")
+                else:
+                    # Escape "/" and other reserved characters so a value stays one directory level
+                    parts.append(f"{name}={quote(str(value), safe='')}")
+            return "/".join(parts)
+
+        if key_columns:
+            groups = tibble.with_columns(key_exprs).partition_by(key_columns, as_dict=True, maintain_order=True)
+            partitions = {partition_dir(key): group.drop(key_columns) for key, group in groups.items()}
+        else:
+            partitions = {"": tibble}
+
+        # Serialize every partition and fingerprint its content
+        serialized = {}
+        for partition, group in partitions.items():
+            buffer = BytesIO()
+            group.write_parquet(buffer, compression=compression, statistics=True, row_group_size=row_group_size)
+            data = buffer.getvalue()
+            serialized[partition] = (data, hashlib.sha256(data).hexdigest(), group.height)
+
+        previous = self.read_tibble(manifest_path, raise_if_missing=False)
+        previous_hashes = dict(previous.select(["partition", "content_hash"]).iter_rows()) if previous.height else {}
+
+        to_write = [
+            partition
+            for partition, (_, content_hash, _) in serialized.items()
+            if not only_changed or previous_hashes.get(partition) != content_hash
+        ]
+        to_delete = [partition for partition in previous_hashes if partition not in serialized]
+
+        def file_path(partition: str) -> str:
+            return f"{az_path}/{partition}/part-0.parquet" if partition else f"{az_path}/part-0.parquet"
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(to_write)))) as executor:
+            list(
+                executor.map(
+                    propagate_io(lambda partition: self.upload_bytes(serialized[partition][0], file_path(partition))),
+                    to_write,
+                )
+            )
 
-        # Ensure directory exists
-        directory_path = "/".join(dest_path.split("/")[:-1])
-        if directory_path:
-            directory_client = file_system_client.get_directory_client(directory_path)
-            directory_client.create_directory()
+        if to_delete:
+            self.delete_files([file_path(partition) for partition in to_delete])
 
-        # Get a file client for the destination path
-        file_client = file_system_client.get_file_client(dest_path)
+        manifest = pl.DataFrame(
+            {
+                "partition": list(serialized),
+                "content_hash": [content_hash for _, content_hash, _ in serialized.values()],
+                "row_count": [row_count for _, _, row_count in serialized.values()],
+            },
+            schema={"partition": pl.Utf8, "content_hash": pl.Utf8, "row_count": pl.Int64},
+        )
+        buffer = BytesIO()
+        manifest.write_parquet(buffer)
+        self.upload_bytes(buffer.getvalue(), manifest_path)
+
+        results = {
+            "partitions": len(serialized),
+            "written": len(to_write),
+            "unchanged": len(serialized) - len(to_write),
+            "deleted": len(to_delete),
+        }
+        if self.context_check:
+            self.context.log.info(
+                f"Dataset {az_path}: {results['written']} partitions written, {results['unchanged']} unchanged, "
+                f"{results['deleted']} deleted"
+            )
+        return results
 
-        # Create or overwrite the file
-        file_client.create_file()
+    def write_analytics(self, tibble: pl.DataFrame, catalog_entry: dict) -> str:
+        """
+        Write an analytics table in the layout selected by its DATA_CATALOG entry.
 
-        # Upload the data
-        file_client.append_data(file_content, 0, len(file_content))
+        Entries with a "dataset" section are written with write_dataset (its keys are passed through,
+        "path" being the dataset root); other entries keep the single parquet file at analytics_path.
 
-        # Flush to finalize the file
-        file_client.flush_data(len(file_content))
+        Args:
+            tibble: Polars DataFrame to write
+            catalog_entry: DATA_CATALOG entry (e.g. DATA_CATALOG["notifications"])
 
-        return destination_az_path
+        Returns:
+            str: The path written to
+        """
+        dataset = catalog_entry.get("dataset")
+        if not dataset:
+            return self.upload_tibble(tibble, catalog_entry["analytics_path"])
+
+        options = {key: value for key, value in dataset.items() if key != "path"}
+        self.write_dataset(tibble, dataset["path"], **options)
+        return dataset["path"]
 
+    def _delta_table(self, delta: dict) -> DeltaTable:
+        return DeltaTable(
+            self, delta["path"], key_columns=delta["key_columns"], compact_after=delta.get("compact_after", 30)
+        )
+
+    def upsert_analytics_batches(self, batches, catalog_entry: dict, key_columns: list) -> str:
+        """
+        Upsert rows arriving as a stream of DataFrames into an analytics table by key.
+
+        Entries with a "delta" section write each batch to the DeltaTable as it arrives and commit them
+        together, seeding the table from the legacy analytics_path file on the first write (files dropped
+        by compactions are removed later by vacuum_analytics). Other entries are rewritten in full, so
+        their batches are concatenated and passed to upsert_analytics.
+
+        Args:
+            batches: Iterable of DataFrames with new or updated rows
+            catalog_entry: DATA_CATALOG entry (e.g. DATA_CATALOG["fluid_hours"])
+            key_columns: Columns forming the unique key, used when the entry has no delta section
+
+        Returns:
+            str: The path written to, or None if every batch was empty
+        """
+        delta = catalog_entry.get("delta")
+        if not delta:
+            frames = [batch for batch in batches if not batch.is_empty()]
+            if not frames:
+                return None
+            return self.upsert_analytics(pl.concat(frames, how="vertical_relaxed"), catalog_entry, key_columns)
+
+        table = self._delta_table(delta)
+        if table.latest_commit() is None:
+            legacy_df = self.read_tibble(catalog_entry["analytics_path"], raise_if_missing=False)
+            if not legacy_df.is_empty():
+                if self.context_check:
+                    self.context.log.info(f"Seeding {delta['path']} with {legacy_df.height} legacy rows")
+                table.upsert(legacy_df)
+        if table.upsert_batches(batches) is None:
+            return None
+        return delta["path"]
+
+    def vacuum_analytics(self, catalog_entry: dict) -> dict:
+        """
+        Remove the files of a delta analytics table that no retained commit references.
+
+        Compaction runs inside every upsert; vacuum is left to a scheduled job so it never races the
+        writers. retain_versions and retention_hours are read from the entry's "delta" section.
+
+        Args:
+            catalog_entry: DATA_CATALOG entry with a "delta" section (e.g. DATA_CATALOG["oil_analysis"])
+
+        Returns:
+            dict: Results of the delete, as returned by DataLake.delete_files
+        """
+        delta = catalog_entry["delta"]
+        return self._delta_table(delta).vacuum(
+            retain_versions=delta.get("retain_versions", 10), retention_hours=delta.get("retention_hours", 24)
+        )
+
+    def upsert_analytics(self, tibble: pl.DataFrame, catalog_entry: dict, key_columns: list) -> str:
+        """
+        Upsert rows into an analytics table by key.
+
+        Entries with a "delta" section append only the incoming rows to a DeltaTable through
+        upsert_analytics_batches. Other entries read the full table, upsert in memory and rewrite it
+        with write_analytics.
+
+        Args:
+            tibble: New or updated rows
+            catalog_entry: DATA_CATALOG entry (e.g. DATA_CATALOG["oil_analysis"])
+            key_columns: Columns forming the unique key, used when the entry has no delta section
+
+        Returns:
+            str: The path written to, or None if tibble is empty
+        """
+        delta = catalog_entry.get("delta")
+        if delta:
+            return self.upsert_analytics_batches([tibble], catalog_entry, key_columns)
+
+        existing_df = self.read_analytics(catalog_entry)
+        if existing_df.is_empty():
+            df = tibble.unique(subset=key_columns, keep="last")
+        else:
+            df = upsert_tibbles(new_df=tibble, existing_df=existing_df, key_columns=key_columns)
+        return self.write_analytics(df, catalog_entry)
+
+    def read_analytics(
+        self, catalog_entry: dict, start_date: datetime = None, end_date: datetime = None, **kwargs
+    ) -> pl.DataFrame:
+        """
+        Read an analytics table in the layout selected by its DATA_CATALOG entry.
+
+        Dataset entries are scanned lazily, so only partitions inside [start_date, end_date] are
+        downloaded; until the first dataset write they fall back to the legacy analytics_path file.
+        Single-file entries are read with read_tibble.
+
+        Args:
+            catalog_entry: DATA_CATALOG entry (e.g. DATA_CATALOG["notifications"])
+            start_date: Earliest partition date to read (dataset entries only)
+            end_date: Latest partition date to read (dataset entries only)
+            **kwargs: Additional arguments passed to read_tibble / scan_dataset
+
+        Returns:
+            pl.DataFrame: The analytics table
+        """
+        delta = catalog_entry.get("delta")
+        if delta:
+            table = self._delta_table(delta)
+            if table.latest_commit() is not None:
+                return table.read()
+            # Not migrated yet, the legacy single file is still the source of truth
+            return self.read_tibble(catalog_entry["analytics_path"], **kwargs)
+
+        dataset = catalog_entry.get("dataset")
+        if not dataset:
+            return self.read_tibble(catalog_entry["analytics_path"], **kwargs)
+
+        if self.read_tibble(f"{dataset['path']}/_partitions.parquet", raise_if_missing=False).is_empty():
+            # Not migrated yet, the legacy single file is still the source of truth
+            return self.read_tibble(catalog_entry["analytics_path"], raise_if_missing=False)
+
+        # Partition columns live inside the files, hive columns would only duplicate them
+        return self.scan_dataset(
+            dataset["path"], start_date=start_date, end_date=end_date, hive_partitioning=False, **kwargs
+        ).collect()
+
+    @instrument("upload_bytes")
+    def upload_bytes(self, data: bytes, az_path: str, overwrite: bool = True) -> str:
+        """
+        Upload bytes directly to Azure Data Lake Storage
+
+        Args:
+            data: Bytes to upload
+            az_path: Destination path in format "az://container/path/to/file.ext"
+            overwrite: Replace an existing file, otherwise raise ResourceExistsError if it exists
+
+        Returns:
+            str: The destination az_path if successful
+        """
+        if self.context_check:
+            self.context.log.info(f"Uploading {len(data)} bytes to {az_path}")
+
+        return self.upload_stream(BytesIO(data), az_path, overwrite=overwrite)
+
+    @instrument("upload_file")
+    def upload_file(self, source_url: str, destination_az_path: str) -> str:
+        """
+        Stream a file from an HTTP URL into Azure Data Lake Storage without holding it in memory
+
+        Args:
+            source_url: HTTP(S) URL to download from
+            destination_az_path: Destination path in format "az://container/path/to/file.ext"
+
+        Returns:
+            str: The destination az_path if successful
+        """
+        with requests.get(source_url, stream=True) as response:
+            response.raise_for_status()
+            # Let urllib3 undo any transfer encoding so the stored bytes match the original file
+            response.raw.decode_content = True
+            return self.upload_stream(response.raw, destination_az_path)
+
+    @instrument("az_path_exists")
     def az_path_exists(self, az_path: str) -> bool:
 
         try:
@@ -408,6 +1211,47 @@ class DataLake:
             # Any exception (typically ResourceNotFoundError) means the az_path doesn't exist
             return False
 
+    @instrument("exists_many")
+    def exists_many(self, az_paths: list, max_workers: int = 10) -> dict:
+        """
+        Check existence of many paths with one non-recursive listing per parent directory
+        instead of one properties request per path.
+
+        Args:
+            az_paths: List of Azure paths (files or directories)
+            max_workers: Number of parent directories listed concurrently
+
+        Returns:
+            dict: Mapping of each az_path to True/False
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Group paths by the directory listing that can answer them
+        groups = {}
+        for az_path in az_paths:
+            container, path = self._parse_az_path(az_path)
+            path = path.rstrip("/")
+            parent = path.rsplit("/", 1)[0] if "/" in path else ""
+            groups.setdefault((container, parent), []).append((az_path, path))
+
+        def list_names(group: tuple) -> set:
+            container, parent = group
+            file_system_client = self.get_file_system_client(f"az://{container}")
+            try:
+                return {item.name for item in file_system_client.get_paths(path=parent or None, recursive=False)}
+            except ResourceNotFoundError:
+                # Missing parent directory means none of its children exist
+                return set()
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(groups)))) as executor:
+            for group, names in zip(groups, executor.map(list_names, groups)):
+                for az_path, path in groups[group]:
+                    results[az_path] = path in names
+
+        return results
+
+    @instrument("rename_file")
     def rename_file(self, source_az_path: str, destination_az_path: str) -> str:
         """
         Renames (moves) a file from a source Azure Data Lake path to a destination path
@@ -449,37 +1293,87 @@ class DataLake:
         # We return the requested destination path string for consistency.
         return destination_az_path
 
-    def copy_file(self, source_az_path: str, destination_az_path: str) -> str:
-
-        # Read the content from source
-        file_content = self.read_bytes(source_az_path)
+    @instrument("copy_file")
+    def copy_file(
+        self, source_az_path: str, destination_az_path: str, poll_interval: float = 1.0, timeout: float = 600
+    ) -> str:
+        """
+        Copy a file server-side using the blob endpoint's copy operation, so the content never
+        passes through this process. Parent directories of the destination are created implicitly.
 
-        # Parse the destination az_path
-        dest_container, dest_path = self._parse_az_path(destination_az_path)
+        Args:
+            source_az_path: Source path (e.g. "az://container/path/to/source.pdf")
+            destination_az_path: Destination path, overwritten if it exists
+            poll_interval: Seconds between copy status checks while the copy is pending
+            timeout: Seconds to wait for a pending copy before aborting it
 
-        # Get a file system client for the destination container
-        file_system_client = self.client.get_file_system_client(dest_container)
+        Returns:
+            str: The destination_az_path if successful
 
-        # Ensure directory exists
-        directory_path = "/".join(dest_path.split("/")[:-1])
-        if directory_path:
-            directory_client = file_system_client.get_directory_client(directory_path)
-            directory_client.create_directory(exist_ok=True)
+        Raises:
+            TimeoutError: If the copy is still pending after timeout seconds (the copy is aborted)
+            RuntimeError: If the service reports the copy as failed or aborted
+        """
+        source_blob_client = self.get_blob_client(source_az_path)
+        destination_blob_client = self.get_blob_client(destination_az_path)
 
-        # Get a file client for the destination path
-        file_client = file_system_client.get_file_client(dest_path)
+        copy = destination_blob_client.start_copy_from_url(source_blob_client.url)
+        status = copy["copy_status"]
 
-        # Create or overwrite the file
-        file_client.create_file()
+        # Copies within the same account usually complete synchronously, larger ones are polled
+        started = time.monotonic()
+        while status == "pending":
+            if time.monotonic() - started > timeout:
+                destination_blob_client.abort_copy(copy["copy_id"])
+                raise TimeoutError(f"Copy of '{source_az_path}' to '{destination_az_path}' timed out")
+            time.sleep(poll_interval)
+            status = destination_blob_client.get_blob_properties().copy.status
 
-        # Upload the data
-        file_client.append_data(file_content, 0, len(file_content))
+        if status != "success":
+            raise RuntimeError(f"Copy of '{source_az_path}' to '{destination_az_path}' ended with status {status}")
 
-        # Flush to finalize the file
-        file_client.flush_data(len(file_content))
+        if self.context_check:
+            self.context.log.info(f"Copied '{source_az_path}' to '{destination_az_path}'")
 
         return destination_az_path
 
+    @instrument("copy_files")
+    def copy_files(self, pairs: list, max_workers: int = 10) -> dict:
+        """
+        Copy many files server-side concurrently
+
+        Args:
+            pairs: List of (source_az_path, destination_az_path) tuples
+            max_workers: Number of copies issued concurrently
+
+        Returns:
+            dict: Results with counts and errors
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        results = {"total": len(pairs), "successful": 0, "failed": 0, "errors": []}
+        if not pairs:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as executor:
+            futures = {
+                executor.submit(propagate_io(self.copy_file), source, destination): source
+                for source, destination in pairs
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    results["successful"] += 1
+                except Exception as e:
+                    results["failed"] += 1
+                    results["errors"].append({"az_path": futures[future], "error": str(e)})
+
+        if self.context_check:
+            self.context.log.info(f"Copied {results['successful']}/{results['total']} files")
+
+        return results
+
+    @instrument("list_partitioned_paths")
     def list_partitioned_paths(
         self, az_path: str, only_recent: bool = False, days_lookback: int = 30, cutoff_date: datetime = None
     ) -> pl.DataFrame:
@@ -497,30 +1391,9 @@ class DataLake:
         # Calculate the cutoff date
         min_date = cutoff_date - timedelta(days=days_lookback)
 
-        # Define common patterns for both monthly and daily partitions
-        monthly_pattern = r"y=(\d{4})/m=(\d{2})"
-        daily_pattern = r"y=(\d{4})/m=(\d{2})/d=(\d{2})"
-
-        def extract_date_from_az_path(uri):
-            # Try daily pattern first
-            daily_match = re.search(daily_pattern, uri)
-            if daily_match:
-                year, month, day = map(int, daily_match.groups())
-                return datetime(year, month, day)
-
-            # Try monthly pattern next
-            monthly_match = re.search(monthly_pattern, uri)
-            if monthly_match:
-                year, month = map(int, monthly_match.groups())
-                # Use the first day of the month
-                return datetime(year, month, 1)
-
-            # If no pattern matches, return None
-            return None
-
         # Create a new column with extracted dates
-        dates = [extract_date_from_az_path(uri) for uri in all_files_df["az_path"].to_list()]
-        date_series = pl.Series("partition_date", dates)
+        dates = [extract_partition_start(uri) for uri in all_files_df["az_path"].to_list()]
+        date_series = pl.Series("partition_date", dates, dtype=pl.Datetime)
         all_files_df = all_files_df.with_columns([date_series])
 
         # Filter based on partition dates
@@ -535,120 +1408,272 @@ class DataLake:
 
         return filtered_df
 
-    def delete_files(self, az_paths: list) -> dict:
+    def _delete_blob_batches(self, container: str, items: list, results: dict, batch_size: int = 256) -> list:
+        """
+        Delete blobs of one container with blob batch requests (up to 256 deletes per request)
+
+        Args:
+            container: Container name
+            items: List of (az_path, file_path) tuples in that container
+            results: Results dict updated in place
+            batch_size: Deletes packed into each batch request (service maximum is 256)
+
+        Returns:
+            list: Items that were not attempted because the account rejected batch requests
+        """
+        container_client = self.blob_client.get_container_client(container)
+
+        for start in range(0, len(items), batch_size):
+            chunk = items[start : start + batch_size]
+            try:
+                responses = list(
+                    container_client.delete_blobs(*[file_path for _, file_path in chunk], raise_on_any_failure=False)
+                )
+            except Exception as e:
+                # Batch is not available on every account type, the caller falls back to single deletes
+                if self.context_check:
+                    self.context.log.warning(f"Blob batch delete unavailable for {container}: {str(e)}")
+                return items[start:]
+
+            for (az_path, _), response in zip(chunk, responses):
+                if response.status_code in [200, 202]:
+                    results["successful"] += 1
+                else:
+                    results["failed"] += 1
+                    results["errors"].append({"az_path": az_path, "error": f"{response.status_code} {response.reason}"})
+
+        return []
+
+    @instrument("delete_files")
+    def delete_files(self, az_paths: list, max_workers: int = 10, use_batch: bool = True) -> dict:
         """
-        Delete multiple files sequentially (no threading)
+        Delete multiple files, grouped by container, with blob batch requests or a bounded thread pool
 
         Args:
             az_paths: List of Azure paths to delete
+            max_workers: Number of concurrent single deletes when batching is unavailable or disabled
+            use_batch: Try blob batch delete (up to 256 paths per request) before single deletes
 
         Returns:
-            dict: Results with counts and errors
+            dict: Results with counts, errors and throughput (elapsed_seconds, files_per_second)
         """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        started = time.monotonic()
         results = {"total": len(az_paths), "successful": 0, "failed": 0, "errors": []}
 
+        # Group by container so each container's client is resolved only once
+        by_container = {}
         for az_path in az_paths:
             try:
                 container, file_path = self._parse_az_path(az_path)
-                file_system_client = self.get_file_system_client(f"az://{container}")
-                file_client = file_system_client.get_file_client(file_path)
-                file_client.delete_file()
-
-                results["successful"] += 1
-
-                if self.context_check:
-                    self.context.log.info(f"Deleted: {az_path}")
-
+                by_container.setdefault(container, []).append((az_path, file_path))
             except Exception as e:
                 results["failed"] += 1
                 results["errors"].append({"az_path": az_path, "error": str(e)})
 
+        for container, items in by_container.items():
+            remaining = self._delete_blob_batches(container, items, results) if use_batch else items
+            if not remaining:
+                continue
+
+            file_system_client = self.get_file_system_client(f"az://{container}")
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(remaining)))) as executor:
+                futures = {
+                    executor.submit(file_system_client.get_file_client(file_path).delete_file): az_path
+                    for az_path, file_path in remaining
+                }
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                        results["successful"] += 1
+                    except Exception as e:
+                        results["failed"] += 1
+                        results["errors"].append({"az_path": futures[future], "error": str(e)})
+
+        results["elapsed_seconds"] = time.monotonic() - started
+        results["files_per_second"] = results["successful"] / max(results["elapsed_seconds"], 1e-6)
+
+        if self.context_check:
+            self.context.log.info(
+                f"Deleted {results['successful']}/{results['total']} files in {results['elapsed_seconds']:.1f}s "
+                f"({results['files_per_second']:.0f} files/s, {results['failed']} failed)"
+            )
+
         return results
 
+    @instrument("list_parallel_paths")
     def list_parallel_paths(
-        self, az_path: str, only_recent: bool = False, days_lookback: int = 30, cutoff_date: datetime = None
+        self,
+        az_path: str,
+        only_recent: bool = False,
+        days_lookback: int = 30,
+        cutoff_date: datetime = None,
+        max_workers: int = 10,
     ) -> pl.DataFrame:
         """
-        Optimized listing that's ALWAYS faster by listing year partitions in parallel
-        """
-        from concurrent.futures import ThreadPoolExecutor, as_completed
+        Partition-aware listing that walks y=/m=/d= levels breadth-first and lists the surviving
+        leaf partitions in parallel.
 
-        container, base_path = self._parse_az_path(az_path)
-        file_system_client = self.get_file_system_client(f"az://{container}")
+        When only_recent is set, partitions outside [cutoff_date - days_lookback, cutoff_date] are
+        pruned before descending, so they are never enumerated, and the listed files are then kept
+        only if their last_modified falls in the same window. Paths without a y= layout are listed
+        in full and filtered on last_modified.
 
-        # Step 1: Discover year partitions (fast - only top level)
-        year_partitions = []
-        try:
-            for item in file_system_client.get_paths(path=base_path, recursive=False):
-                if item.is_directory and item.name.split("/")[-1].startswith("y="):
-                    try:
-                        year = int(item.name.split("/")[-1].split("=")[1])
-                        year_partitions.append((year, item.name))
-                    except ValueError:
-                        continue
-        except Exception as e:
-            # No partitions found, fall back to regular listing
-            return self.list_paths(az_path, recursive=True)
+        Args:
+            az_path: Root path to list (e.g. "az://bhp-raw-data/RESO/DOCUMENTS")
+            only_recent: Keep only partitions inside the lookback window
+            days_lookback: Size of the lookback window in days
+            cutoff_date: End of the lookback window, defaults to now
+            max_workers: Bound on concurrent listing requests
 
-        if not year_partitions:
-            return self.list_paths(az_path, recursive=True)
+        Returns:
+            pl.DataFrame: Files with az_path, file_size and last_modified
+        """
+        container, _ = self._parse_az_path(az_path)
 
-        # Step 2: Filter years if only_recent
+        start_date, end_date = None, None
         if only_recent:
             if cutoff_date is None:
                 cutoff_date = datetime.now()
-            min_year = (cutoff_date - timedelta(days=days_lookback)).year
-            year_partitions = [(y, p) for y, p in year_partitions if y >= min_year]
-
-        if self.context_check:
-            self.context.log.info(f"Listing {len(year_partitions)} year partitions in parallel")
-
-        # Step 3: List each year partition in PARALLEL (this is the optimization!)
-        def list_year_partition(year_info):
-            year, year_path = year_info
-            year_files = []
-            try:
-                # Create a new client for thread safety
-                thread_client = DataLakeServiceClient.from_connection_string(self._conn_str)
-                thread_fs_client = thread_client.get_file_system_client(container)
-
-                for item in thread_fs_client.get_paths(path=year_path, recursive=True):
-                    if not item.is_directory:
-                        year_files.append(
-                            {
-                                "az_path": f"az://{container}/{item.name}",
-                                "file_size": item.content_length,
-                                "last_modified": item.last_modified,
-                            }
-                        )
-            except Exception as e:
-                if self.context_check:
-                    self.context.log.warning(f"Error listing year {year}: {str(e)}")
+            start_date, end_date = cutoff_date - timedelta(days=days_lookback), cutoff_date
+
+        def in_lookback(df: pl.DataFrame) -> pl.DataFrame:
+            if not only_recent or df.is_empty():
+                return df
+            # last_modified is timezone-aware, naive bounds are read as local time
+            lower, upper = (
+                bound if bound.tzinfo else bound.astimezone(timezone.utc) for bound in (start_date, end_date)
+            )
+            return df.filter((pl.col("last_modified") >= lower) & (pl.col("last_modified") <= upper))
 
-            return year_files
+        # Step 1: Discover leaf partitions breadth-first, pruning by date before descending
+        try:
+            partition_dirs = self._list_partition_dirs(
+                az_path, start_date=start_date, end_date=end_date, max_workers=max_workers
+            )
+        except Exception:
+            # Listing the partition tree failed, fall back to regular listing
+            return in_lookback(self.list_paths(az_path, recursive=True))
 
-        # Process all years in parallel
-        all_files = []
-        with ThreadPoolExecutor(max_workers=min(10, len(year_partitions))) as executor:
-            futures = {executor.submit(list_year_partition, yp): yp[0] for yp in year_partitions}
+        if self.context_check:
+            self.context.log.info(f"Listing {len(partition_dirs)} partitions in parallel")
 
-            for future in as_completed(futures):
-                year_files = future.result()
-                all_files.extend(year_files)
+        # Step 2: List every surviving leaf partition over a bounded worker pool
+        all_files = self._list_files_in_dirs(container, partition_dirs, max_workers=max_workers)
 
         # Convert to DataFrame
         if not all_files:
             return pl.DataFrame({"az_path": [], "file_size": [], "last_modified": []})
 
-        df = pl.DataFrame(all_files)
+        # Step 3: Apply the last_modified window, also covering roots without a y= layout
+        return in_lookback(pl.DataFrame(all_files))
+
+    @instrument("list_indexed_paths")
+    def list_indexed_paths(
+        self,
+        az_path: str,
+        index_path: str = None,
+        only_recent: bool = False,
+        days_lookback: int = 30,
+        cutoff_date: datetime = None,
+        max_workers: int = 10,
+    ) -> pl.DataFrame:
+        """
+        List files through a persisted listing index that is refreshed incrementally.
+
+        The index (az_path, file_size, last_modified, partition, partition_last_modified) lives as
+        parquet under bhp-process-data/STATE/LISTING_INDEX. On refresh only the partition directories
+        are walked; leaf partitions are re-listed when they are new, at or above the index high-water
+        mark, or their directory last_modified changed. Everything else is served from the index.
+        Paths without a y= layout under the root have no partitions to skip; they are listed in full
+        with list_paths and no index is kept.
+
+        Args:
+            az_path: Root path to list (e.g. "az://bhp-raw-data/RESO/DOCUMENTS")
+            index_path: Where to persist the index, defaults to a path derived from az_path
+            only_recent: Return only files in partitions inside the lookback window
+            days_lookback: Size of the lookback window in days
+            cutoff_date: End of the lookback window, defaults to now
+            max_workers: Bound on concurrent listing requests
 
-        # Apply date filter if needed
+        Returns:
+            pl.DataFrame: Files with az_path, file_size and last_modified
+        """
+        container, base_path = self._parse_az_path(az_path)
+        if index_path is None:
+            index_root = "/".join(part for part in [container, base_path.strip("/")] if part)
+            index_path = f"az://bhp-process-data/STATE/LISTING_INDEX/{index_root}/index.parquet"
+
+        leaves = self._list_partition_dirs(az_path, max_workers=max_workers, details=True)
+        if all(not key for _, key, _ in leaves):
+            # No y= layout under the root, an index would be re-listed in full on every call
+            if self.context_check:
+                self.context.log.info(f"{az_path} is not partitioned, listing it without an index")
+            return self.list_paths(az_path, recursive=True)
+
+        index_df = self.read_tibble(index_path, raise_if_missing=False)
+        leaf_keys = {dir_path: key for dir_path, key, _ in leaves}
+
+        known = {}
+        if not index_df.is_empty():
+            known = dict(index_df.group_by("partition").agg(pl.col("partition_last_modified").first()).iter_rows())
+        # Partitions at or above the high-water mark may still be receiving files
+        known_keys = [leaf_keys[p] for p in known if p in leaf_keys and leaf_keys[p]]
+        high_water_mark = max(known_keys) if known_keys else None
+
+        to_refresh = {
+            dir_path: last_modified
+            for dir_path, key, last_modified in leaves
+            if dir_path not in known
+            or not key
+            or (high_water_mark and key >= high_water_mark)
+            or known[dir_path] != last_modified
+        }
+
+        if self.context_check:
+            self.context.log.info(
+                f"Listing index for {az_path}: refreshing {len(to_refresh)} of {len(leaves)} partitions"
+            )
+
+        fresh_files = self._list_files_in_dirs(
+            container, list(to_refresh), max_workers=max_workers, include_partition=True
+        )
+        schema = {
+            "az_path": pl.Utf8,
+            "file_size": pl.Int64,
+            "last_modified": pl.Datetime(time_zone="UTC"),
+            "partition": pl.Utf8,
+            "partition_last_modified": pl.Datetime(time_zone="UTC"),
+        }
+        fresh_df = pl.DataFrame(
+            [{**record, "partition_last_modified": to_refresh[record["partition"]]} for record in fresh_files],
+            schema=schema,
+        )
+
+        if not index_df.is_empty():
+            # Keep untouched partitions that still exist, replace the refreshed ones
+            kept_df = index_df.filter(
+                pl.col("partition").is_in(list(leaf_keys)) & ~pl.col("partition").is_in(list(to_refresh))
+            )
+            index_df = pl.concat([kept_df.cast(schema), fresh_df])
+        else:
+            index_df = fresh_df
+
+        self.upload_tibble(index_df, index_path)
+
+        files_df = index_df
         if only_recent:
+            if cutoff_date is None:
+                cutoff_date = datetime.now()
             min_date = cutoff_date - timedelta(days=days_lookback)
-            df = df.filter((pl.col("last_modified") >= min_date) & (pl.col("last_modified") <= cutoff_date))
+            files_df = files_df.with_columns(
+                partition_date=pl.col("az_path").map_elements(extract_partition_start, return_dtype=pl.Datetime)
+            ).filter(pl.col("partition_date").is_between(min_date, cutoff_date))
 
-        return df
+        return files_df.select(["az_path", "file_size", "last_modified"])
 
+    @instrument("read_tibbles")
     def read_tibbles(self, az_paths: list, max_workers: int = 10, how: str = "diagonal") -> pl.DataFrame:
         """
         Read multiple tibbles in parallel and concatenate them
@@ -686,7 +1711,7 @@ class DataLake:
 
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             # Submit all read tasks
-            future_to_path = {executor.submit(read_single_tibble, path): path for path in az_paths}
+            future_to_path = {executor.submit(propagate_io(read_single_tibble), path): path for path in az_paths}
 
             # Collect results as they complete
             for future in as_completed(future_to_path):
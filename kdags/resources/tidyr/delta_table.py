@@ -0,0 +1,315 @@
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import polars as pl
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+
+from .instrumentation import propagate_io, record_io
+
+# A log file still empty or partial after this long belongs to a writer that crashed mid-commit
+ABANDONED_COMMIT_SECONDS = 300
+
+
+class DeltaTable:
+    """
+    Append-only table on Azure Data Lake: a JSON commit log plus immutable parquet files.
+
+    Layout under az_path:
+        _log/00000000000000000042.json   one commit per version, holding the full list of active files
+        data/part-<uuid>.parquet         upserted rows, never rewritten
+        data/tombstone-<uuid>.parquet    keys deleted at that version
+
+    Upserts write only the incoming rows as a new file and commit it; readers open the latest commit
+    and keep, per key, the row from the highest version (dropping keys whose latest entry is a
+    tombstone). Commits are claimed with create-if-missing, so concurrent writers never overwrite each
+    other. compact() folds the active files into one, and vacuum() removes files no longer referenced
+    once they are older than a retention window.
+    """
+
+    def __init__(self, datalake, az_path: str, key_columns: list, compact_after: int = 30, max_workers: int = 10):
+        """
+        Args:
+            datalake: DataLake used for all I/O
+            az_path: Table root directory (e.g. "az://bhp-analytics-data/MAINTENANCE/OIL_ANALYSIS/oil_analysis")
+            key_columns: Columns forming the unique key of a row
+            compact_after: Compact automatically once the latest commit references this many files
+            max_workers: Number of files read concurrently
+        """
+        self.datalake = datalake
+        self.az_path = az_path.rstrip("/")
+        self.key_columns = key_columns
+        self.compact_after = compact_after
+        self.max_workers = max_workers
+
+    def _log(self, message: str) -> None:
+        if self.datalake.context_check:
+            self.datalake.context.log.info(message)
+
+    def _commit_path(self, version: int) -> str:
+        return f"{self.az_path}/_log/{version:020d}.json"
+
+    def _log_files(self) -> dict:
+        """Last modified time of every claimed version's log file"""
+        try:
+            log_files = self.datalake.list_paths(f"{self.az_path}/_log", recursive=False)
+        except ResourceNotFoundError:
+            return {}
+        if log_files.is_empty():
+            return {}
+        versions = {}
+        for path, last_modified in log_files.select(["az_path", "last_modified"]).iter_rows():
+            name = path.split("/")[-1]
+            if name.endswith(".json") and name[:-5].isdigit():
+                versions[int(name[:-5])] = last_modified
+        return versions
+
+    def _versions(self) -> list:
+        """All claimed versions, ascending"""
+        return sorted(self._log_files())
+
+    def _read_commit(self, version: int) -> dict:
+        """The commit of a version, or None when its log file is empty or partial"""
+        try:
+            return json.loads(self.datalake.read_bytes(self._commit_path(version)))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _is_abandoned(last_modified: datetime) -> bool:
+        return datetime.now(timezone.utc) - last_modified > timedelta(seconds=ABANDONED_COMMIT_SECONDS)
+
+    def latest_commit(self) -> dict:
+        """Return the latest commit, or None when the table has no commits yet"""
+        for version in reversed(self._versions()):
+            commit = self._read_commit(version)
+            if commit is not None:
+                return commit
+            # A commit claimed but not yet fully written (or abandoned), fall back to the previous one
+        return None
+
+    def _commit(self, operation: str, added: list, removed: list = None, max_attempts: int = 5) -> dict:
+        """
+        Write the next commit, retrying on a newer version when another writer claimed it first.
+
+        Args:
+            operation: Label stored in the commit ("upsert", "delete", "compact")
+            added: File entries ({"path", "type", "rows"} plus an optional fixed "version")
+            removed: Paths of files no longer active
+
+        Returns:
+            dict: The written commit
+        """
+        removed = set(removed or [])
+        for attempt in range(max_attempts):
+            log_files = self._log_files()
+            # Claim past every log file, readable or not, so an abandoned one never blocks the table
+            version = max(log_files) + 1 if log_files else 0
+
+            latest, in_flight = None, False
+            for claimed in sorted(log_files, reverse=True):
+                latest = self._read_commit(claimed)
+                if latest is not None:
+                    break
+                if not self._is_abandoned(log_files[claimed]):
+                    # Another writer is still writing it, building on an older commit would drop its files
+                    in_flight = True
+                    break
+            if in_flight:
+                record_io(retries=1)
+                time.sleep(2**attempt)
+                continue
+
+            files = [entry for entry in (latest["files"] if latest else []) if entry["path"] not in removed]
+            files.extend({"version": version, **entry} for entry in added)
+
+            commit = {
+                "version": version,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "operation": operation,
+                "added": [entry["path"] for entry in added],
+                "removed": sorted(removed),
+                "files": files,
+            }
+            try:
+                self.datalake.upload_bytes(
+                    json.dumps(commit).encode("utf-8"), self._commit_path(version), overwrite=False
+                )
+                self._log(f"Committed version {version} ({operation}) to {self.az_path}")
+                return commit
+            except ResourceExistsError:
+                record_io(retries=1)
+                continue
+
+        raise RuntimeError(f"Could not commit to {self.az_path} after {max_attempts} attempts")
+
+    def _write_file(self, tibble: pl.DataFrame, prefix: str) -> str:
+        relative_path = f"data/{prefix}-{uuid.uuid4().hex}.parquet"
+        self.datalake.upload_tibble(tibble, f"{self.az_path}/{relative_path}", compression="zstd")
+        return relative_path
+
+    def upsert(self, tibble: pl.DataFrame) -> dict:
+        """
+        Upsert rows by writing only them as a new data file
+
+        Args:
+            tibble: New or updated rows
+
+        Returns:
+            dict: The written commit, or None if tibble is empty
+        """
+        return self.upsert_batches([tibble])
+
+    def upsert_batches(self, batches) -> dict:
+        """
+        Upsert rows arriving in batches, writing each batch as a data file as it arrives and committing
+        them together, so only one batch is held in memory. On keys shared by batches the later one wins.
+
+        Args:
+            batches: Iterable of DataFrames with new or updated rows
+
+        Returns:
+            dict: The written commit, or None if every batch is empty
+        """
+        added = []
+        for batch in batches:
+            if batch.is_empty():
+                continue
+            rows = batch.unique(subset=self.key_columns, keep="last", maintain_order=True)
+            added.append({"path": self._write_file(rows, "part"), "type": "data", "rows": rows.height})
+        if not added:
+            return None
+
+        commit = self._commit("upsert", added)
+
+        if self.compact_after and len(commit["files"]) >= self.compact_after:
+            self.compact()
+        return commit
+
+    def delete(self, keys: pl.DataFrame) -> dict:
+        """
+        Delete rows by key with a tombstone file
+
+        Args:
+            keys: DataFrame holding the key columns of the rows to delete
+
+        Returns:
+            dict: The written commit, or None if keys is empty
+        """
+        if keys.is_empty():
+            return None
+
+        tombstones = keys.select(self.key_columns).unique()
+        path = self._write_file(tombstones, "tombstone")
+        return self._commit("delete", [{"path": path, "type": "tombstone", "rows": tombstones.height}])
+
+    def _resolve(self, files: list) -> pl.DataFrame:
+        """Read the given file entries and keep the latest live row per key"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        if not files:
+            return pl.DataFrame()
+
+        def read_entry(entry: dict) -> pl.DataFrame:
+            df = self.datalake.read_tibble(f"{self.az_path}/{entry['path']}", raise_if_missing=True)
+            return df.with_columns(
+                pl.lit(entry["version"], dtype=pl.Int64).alias("__version"),
+                pl.lit(entry["type"] == "tombstone").alias("__deleted"),
+            )
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(files)))) as executor:
+            frames = list(executor.map(propagate_io(read_entry), files))
+
+        if len(frames) == 1:
+            return frames[0].filter(~pl.col("__deleted")).drop(["__version", "__deleted"])
+
+        return (
+            pl.concat(frames, how="diagonal_relaxed")
+            .sort("__version", maintain_order=True)
+            .unique(subset=self.key_columns, keep="last", maintain_order=True)
+            .filter(~pl.col("__deleted"))
+            .drop(["__version", "__deleted"])
+        )
+
+    def read(self) -> pl.DataFrame:
+        """Resolve and return the latest snapshot, or an empty DataFrame when there are no commits"""
+        latest = self.latest_commit()
+        if latest is None:
+            return pl.DataFrame()
+        return self._resolve(latest["files"])
+
+    def compact(self) -> dict:
+        """
+        Fold every active file of the latest snapshot into a single data file
+
+        Returns:
+            dict: The written commit, or None if there was nothing to compact
+        """
+        latest = self.latest_commit()
+        if latest is None or len(latest["files"]) <= 1:
+            return None
+
+        snapshot = self._resolve(latest["files"])
+        path = self._write_file(snapshot, "part")
+        # Keep the snapshot's version so rows upserted concurrently after it still take precedence
+        compacted = {
+            "path": path,
+            "type": "data",
+            "rows": snapshot.height,
+            "version": max(entry["version"] for entry in latest["files"]),
+        }
+        self._log(f"Compacting {len(latest['files'])} files of {self.az_path} into one")
+        return self._commit("compact", [compacted], removed=[entry["path"] for entry in latest["files"]])
+
+    def vacuum(self, retain_versions: int = 10, retention_hours: float = 24) -> dict:
+        """
+        Delete commits older than the last retain_versions readable ones, abandoned commits, and data
+        files none of the retained commits reference
+
+        Unreferenced data files are only deleted once older than retention_hours, since a concurrent
+        writer uploads its files before it commits them.
+
+        Args:
+            retain_versions: Number of most recent readable commits kept
+            retention_hours: Minimum age of an unreferenced data file before it is deleted
+
+        Returns:
+            dict: Results of the delete, as returned by DataLake.delete_files
+        """
+        log_files = self._log_files()
+        retained, abandoned = [], []
+        referenced = set()
+        for version in sorted(log_files, reverse=True):
+            if len(retained) == retain_versions:
+                break
+            commit = self._read_commit(version)
+            if commit is None:
+                if self._is_abandoned(log_files[version]):
+                    abandoned.append(version)
+                # Otherwise still being written, left alone
+                continue
+            retained.append(version)
+            referenced.update(entry["path"] for entry in commit["files"])
+        oldest_retained = min(retained) if retained else None
+
+        try:
+            data_files = self.datalake.list_paths(f"{self.az_path}/data", recursive=False)
+        except ResourceNotFoundError:
+            data_files = pl.DataFrame()
+        data_files = [] if data_files.is_empty() else data_files.select(["az_path", "last_modified"]).rows()
+
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=retention_hours)
+        stale = [
+            path
+            for path, last_modified in data_files
+            if path[len(self.az_path) + 1 :] not in referenced and last_modified < cutoff
+        ]
+        stale.extend(self._commit_path(version) for version in abandoned)
+        if oldest_retained is not None:
+            stale.extend(self._commit_path(version) for version in log_files if version < oldest_retained)
+        if not stale:
+            return {"total": 0, "successful": 0, "failed": 0, "errors": []}
+
+        self._log(f"Vacuuming {len(stale)} files of {self.az_path}")
+        return self.datalake.delete_files(stale)
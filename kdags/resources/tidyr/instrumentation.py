@@ -0,0 +1,278 @@
+import contextvars
+import functools
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import dagster as dg
+import polars as pl
+
+# I/O summaries, one parquet file per step under y=/m=/d= of the day it finished (read with DataLake.scan_dataset)
+IO_METRICS_PATH = "az://bhp-process-data/STATE/IO_METRICS/io_metrics"
+
+_COUNTERS = ["bytes", "cache_hits", "retries"]
+_local = threading.local()
+# Guards counters that worker threads add to the instrumented call that submitted them
+_COUNTERS_LOCK = threading.Lock()
+
+
+def _stack() -> list:
+    """Counters of the instrumented calls in progress on this thread, innermost last"""
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def record_io(nbytes: int = 0, cache_hit: bool = False, retries: int = 0) -> None:
+    """
+    Attribute bytes, cache hits or retries to the instrumented call running on this thread.
+
+    Counts bubble up to enclosing instrumented calls when the inner one returns, so read_tibble
+    reports the bytes moved by the read_bytes call it makes. Outside an instrumented call it is a no-op.
+    """
+    stack = _stack()
+    if stack:
+        with _COUNTERS_LOCK:
+            stack[-1]["bytes"] += nbytes
+            stack[-1]["cache_hits"] += int(cache_hit)
+            stack[-1]["retries"] += retries
+
+
+def propagate_io(fn):
+    """
+    Wrap fn so that, run on a worker thread, it counts as part of the instrumented call submitting it.
+
+    Instrumented calls made by fn are recorded as nested and their counters are added to the submitting
+    call when fn returns. The caller's context variables (including the current Dagster step) are carried
+    over, so the calls are attributed to the same asset. Must be called on the submitting thread.
+    """
+    stack = _stack()
+    parent = stack[-1] if stack else None
+    paused = getattr(_local, "paused", False)
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        previous_stack, previous_paused = _stack(), getattr(_local, "paused", False)
+        counters = {name: 0 for name in _COUNTERS}
+        _local.stack = [counters] if parent is not None else []
+        _local.paused = paused
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.stack, _local.paused = previous_stack, previous_paused
+            if parent is not None:
+                with _COUNTERS_LOCK:
+                    for name in _COUNTERS:
+                        parent[name] += counters[name]
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        # A context can only be entered by one thread at a time, every call gets its own copy
+        return context.copy().run(run, *args, **kwargs)
+
+    return wrapper
+
+
+class IORecorder:
+    """
+    Process-wide store of instrumented I/O calls, grouped by (run_id, asset).
+
+    Calls are attributed to the asset of the AssetExecutionContext they were made with or, for resources
+    built without one, of the Dagster step currently executing. The running totals are pushed to the
+    asset's output metadata after every top-level call. Calls outside a step (scripts, directly invoked
+    assets) are not kept.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = defaultdict(list)
+        self._totals = defaultdict(dict)
+
+    @staticmethod
+    def _step(context) -> tuple:
+        """(context, (run_id, asset)) of the step a call belongs to, (None, None) outside a step"""
+        try:
+            if not isinstance(context, dg.AssetExecutionContext):
+                context = dg.AssetExecutionContext.get()
+            # Directly invoked assets have no op and raise here
+            return context, (context.run_id, context.op_execution_context.op.name)
+        except dg.DagsterError:
+            return None, None
+
+    def record(self, context, call: dict) -> None:
+        context, key = self._step(context)
+        if context is None:
+            return
+        with self._lock:
+            self._calls[key].append(call)
+            if call["nested"]:
+                return
+            totals = self._totals[key].setdefault(
+                call["operation"], {"calls": 0, "seconds": 0.0, "errors": 0, **{name: 0 for name in _COUNTERS}}
+            )
+            totals["calls"] += 1
+            totals["seconds"] += call["seconds"]
+            totals["errors"] += int(call["status"] == "error")
+            for name in _COUNTERS:
+                totals[name] += call[name]
+            snapshot = {operation: dict(values) for operation, values in self._totals[key].items()}
+
+        self._emit_metadata(context, snapshot)
+
+    @staticmethod
+    def _emit_metadata(context: dg.AssetExecutionContext, totals: dict) -> None:
+        """Overwrite the asset's io_* output metadata with the running totals"""
+        rows = "\n".join(
+            f"| {operation} | {values['calls']} | {values['bytes'] / 1024**2:.1f} | {values['seconds']:.2f} "
+            f"| {values['cache_hits']} | {values['retries']} | {values['errors']} |"
+            for operation, values in sorted(totals.items(), key=lambda item: -item[1]["seconds"])
+        )
+        metadata = {
+            "io_requests": sum(values["calls"] for values in totals.values()),
+            "io_bytes": sum(values["bytes"] for values in totals.values()),
+            "io_seconds": round(sum(values["seconds"] for values in totals.values()), 3),
+            "io_cache_hits": sum(values["cache_hits"] for values in totals.values()),
+            "io_retries": sum(values["retries"] for values in totals.values()),
+            "io_by_operation": dg.MetadataValue.md(
+                "| operation | calls | MB | seconds | cache hits | retries | errors |\n"
+                "|---|---|---|---|---|---|---|\n" + rows
+            ),
+        }
+        try:
+            context.add_output_metadata(metadata)
+        except dg.DagsterInvariantViolationError:
+            # Multi-output assets, or the output was already yielded
+            pass
+
+    def pop(self, run_id: str, asset: str) -> list:
+        """Remove and return the calls of an asset"""
+        with self._lock:
+            calls = self._calls.pop((run_id, asset), [])
+            self._totals.pop((run_id, asset), None)
+        return calls
+
+
+RECORDER = IORecorder()
+
+
+def instrument(operation: str):
+    """
+    Decorator recording operation, path, bytes, latency, retries and cache hits of a resource method.
+
+    The path is taken from an az_path / sp_path keyword or the first string positional argument. Calls made
+    inside another instrumented call, on the same thread or on a worker wrapped with propagate_io, are
+    recorded as nested and left out of the totals, their counters being included in the enclosing call instead.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if getattr(_local, "paused", False):
+                return method(self, *args, **kwargs)
+
+            path = kwargs.get("az_path") or kwargs.get("sp_path") or next((a for a in args if isinstance(a, str)), None)
+            stack = _stack()
+            counters = {name: 0 for name in _COUNTERS}
+            nested = bool(stack)
+            stack.append(counters)
+
+            status = "ok"
+            started_at = datetime.now(timezone.utc)
+            started = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            except Exception:
+                status = "error"
+                raise
+            finally:
+                seconds = time.perf_counter() - started
+                stack.pop()
+                if stack:
+                    with _COUNTERS_LOCK:
+                        for name in _COUNTERS:
+                            stack[-1][name] += counters[name]
+                RECORDER.record(
+                    getattr(self, "context", None),
+                    {
+                        "operation": f"{type(self).__name__}.{operation}",
+                        "path": path,
+                        "seconds": seconds,
+                        "status": status,
+                        "nested": nested,
+                        "started_at": started_at,
+                        **counters,
+                    },
+                )
+
+        return wrapper
+
+    return decorator
+
+
+def summarize_io_calls(calls: list) -> pl.DataFrame:
+    """Aggregate top-level calls per operation, with the slowest call's path"""
+    df = pl.DataFrame(calls).filter(~pl.col("nested"))
+    if df.is_empty():
+        return df
+    return (
+        df.sort("seconds", descending=True)
+        .group_by("operation", maintain_order=True)
+        .agg(
+            pl.len().alias("calls"),
+            pl.col("bytes").sum(),
+            pl.col("seconds").sum(),
+            pl.col("seconds").max().alias("max_seconds"),
+            pl.col("path").first().alias("slowest_path"),
+            pl.col("cache_hits").sum(),
+            pl.col("retries").sum(),
+            (pl.col("status") == "error").sum().alias("errors"),
+        )
+    )
+
+
+def _write_io_metrics(context: dg.HookContext, step_status: str) -> None:
+    """Write the step's I/O summary as its own file in the process zone, no shared log to contend for"""
+    from .datalake import DataLake
+
+    calls = RECORDER.pop(context.run_id, context.op.name)
+    if not calls:
+        return
+
+    summary = summarize_io_calls(calls)
+    if summary.is_empty():
+        return
+    recorded_at = datetime.now(timezone.utc)
+    summary = summary.with_columns(
+        pl.lit(context.run_id).alias("run_id"),
+        pl.lit(context.job_name).alias("job_name"),
+        pl.lit(context.op.name).alias("asset"),
+        pl.lit(step_status).alias("step_status"),
+        pl.lit(recorded_at).alias("recorded_at"),
+    )
+    metrics_path = (
+        f"{IO_METRICS_PATH}/y={recorded_at.year:04d}/m={recorded_at.month:02d}/d={recorded_at.day:02d}/"
+        f"{context.run_id}-{context.op.name}.parquet"
+    )
+
+    # The summary write itself is not part of the step's I/O
+    _local.paused = True
+    try:
+        DataLake().upload_tibble(summary, metrics_path)
+    except Exception as e:
+        context.log.warning(f"Could not write I/O metrics for {context.op.name}: {e}")
+    finally:
+        _local.paused = False
+
+
+@dg.success_hook
+def io_metrics_success_hook(context: dg.HookContext):
+    _write_io_metrics(context, "success")
+
+
+@dg.failure_hook
+def io_metrics_failure_hook(context: dg.HookContext):
+    _write_io_metrics(context, "failure")
+
+
+IO_METRICS_HOOKS = {io_metrics_success_hook, io_metrics_failure_hook}
@@ -1,5 +1,12 @@
+import base64
+import json
 import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from io import BytesIO
+from urllib.parse import quote
 
 import msal
 import pandas as pd
@@ -9,6 +16,48 @@ import polars as pl
 from office365.runtime.client_object import ClientObject
 import dagster as dg
 
+from .cache import get_local_cache
+from .instrumentation import instrument, propagate_io, record_io
+from .token_cache import get_token_provider
+
+_GRAPH_API = "https://graph.microsoft.com/v1.0"
+_SHAREPOINT_HOST = "globalkomatsu.sharepoint.com"
+
+# Graph accepts up to 4 MB in a single PUT, larger files need an upload session whose ranges are
+# multiples of 320 KiB
+_SIMPLE_UPLOAD_LIMIT = 4 * 1024**2
+_UPLOAD_CHUNK_UNIT = 320 * 1024
+_UPLOAD_CHUNK_SIZE = 32 * _UPLOAD_CHUNK_UNIT  # 10 MiB
+_UPLOAD_MAX_RETRIES = 5
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Listing index and delta link of MSGraph.list_paths, one directory per site and folder
+SHAREPOINT_DELTA_ROOT = "az://bhp-process-data/STATE/SHAREPOINT_DELTA"
+_LISTING_SELECT = "id,name,size,lastModifiedDateTime,webUrl,folder,file,parentReference"
+_LISTING_SCHEMA = {
+    "id": pl.Utf8,
+    "parent_id": pl.Utf8,
+    "name": pl.Utf8,
+    "path": pl.Utf8,
+    "size_bytes": pl.Int64,
+    "last_modified": pl.Utf8,
+    "web_url": pl.Utf8,
+    "is_folder": pl.Boolean,
+}
+
+# Graph ids of sites and their default drives, shared by every MSGraph in the process
+_SITE_IDS = {}
+_DRIVE_IDS = {}
+_IDS_LOCK = threading.Lock()
+
+# A $batch request holds at most 20 operations and 4 MB, small uploads travel base64 encoded inside it
+_BATCH_SIZE = 20
+_BATCH_MAX_BYTES = 3 * 1024**2
+_BATCH_UPLOAD_LIMIT = 1024**2
+
+# Shared so Graph and SharePoint connections are reused across calls
+_SESSION = requests.Session()
+
 # --- Define Constants for Consistent Formatting ---
 _BASE_TABLE_STYLE = "TableStyleMedium9"  # Base style for banded rows etc.
 _KOMATSU_GLORIA_BLUE = "#140a9a"
@@ -18,10 +67,30 @@ _DEFAULT_AUTO_WIDTH_PADDING = 2
 _MAX_COLUMN_WIDTH = 60  # Max width in characters before wrapping
 
 
+def _retry_after(headers, default: float) -> float:
+    """Seconds to wait from a Retry-After header, given either as delay seconds or as an HTTP-date."""
+    value = headers.get("Retry-After")
+    if value is None:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
 class MSGraph:
-    def __init__(self, context: dg.AssetExecutionContext = None):
+    def __init__(self, context: dg.AssetExecutionContext = None, use_cache: bool = True):
         self.context_check = isinstance(context, dg.AssetExecutionContext)
         self.context = context
+        # Local read cache shared by every MSGraph in the process
+        self.cache = get_local_cache("sharepoint") if use_cache else None
         self.client = GraphClient(self.acquire_token_func)
         self._client_id = "d50ca740-c83f-4d1b-b616-12c519384f0c"
 
@@ -57,6 +126,7 @@ class MSGraph:
         site_id, file_path = parts
         return site_id, file_path
 
+    @instrument("delete_file")
     def delete_file(self, sp_path: str) -> dict:
         """
         Deletes a file from SharePoint using sp_path, bypassing any shared locks.
@@ -68,46 +138,87 @@ class MSGraph:
             dict: Information about the deletion result (no try/except added per request)
         """
         site_id, file_path = self._parse_sp_path(sp_path)
-        site_url = f"{self._site_url_base}{site_id}"  # Construct full site url
-
-        def bypass_lock(request):
-            request.headers["Prefer"] = "bypass-shared-lock"
 
-        # Original logic without try/except
-        site = self.client.sites.get_by_url(site_url)
-        drive_item = site.drive.root.get_by_path(file_path).get().execute_query()
-        drive_item.before_execute(bypass_lock)
-
-        drive_item.delete_object().execute_query()
+        # Addressed by path with cached site and drive ids, a single request
+        response, _ = self._send_with_retry(
+            "DELETE",
+            f"{_GRAPH_API}{self._item_path(sp_path)}",
+            headers={**self._graph_headers(), "Prefer": "bypass-shared-lock"},
+        )
+        response.raise_for_status()
         # Simplified return without error handling wrapper
         return {"status": "success", "message": f"File '{file_path}' successfully deleted from site '{site_id}'"}
 
     def acquire_token_func(self):
-        scopes = ["Files.ReadWrite.All"]
-        app = msal.PublicClientApplication(
-            client_id=self._client_id,
-            authority="https://login.microsoftonline.com/common",
+        # Shared across instances and threads, the token is only renewed shortly before it expires
+        return get_token_provider(self._client_id).acquire_token()
+
+    @property
+    def cache_stats(self) -> dict:
+        """Hit / miss counters of the local cache, shared by every instance using the same cache"""
+        if self.cache is None:
+            return {"hits": 0, "misses": 0, "bytes_saved": 0}
+        return dict(self.cache.stats)
+
+    def _log_cache_event(self, event: str, sp_path: str, size: int) -> None:
+        """Report a cache lookup and the cache counters to the Dagster log"""
+        if self.context_check:
+            stats = self.cache_stats
+            label = "Cache hit" if event == "hits" else "Cache miss"
+            self.context.log.info(
+                f"{label} for {sp_path} ({size} bytes) | hits={stats['hits']}, "
+                f"misses={stats['misses']}, "
+                f"bytes_saved={stats['bytes_saved'] / 1024**2:.1f} MB"
+            )
+
+    def _item_metadata(self, sp_path: str) -> dict:
+        """DriveItem JSON of a file: id, eTag, cTag, size and a short-lived @microsoft.graph.downloadUrl."""
+        response, _ = self._send_with_retry(
+            "GET", f"{_GRAPH_API}{self._item_path(sp_path)}", headers=self._graph_headers()
         )
-        # Ensure MSGRAPH_TOKEN environment variable is set in your environment
-        refresh_token = os.environ["MSGRAPH_TOKEN"]
-        return app.acquire_token_by_refresh_token(refresh_token, scopes)
+        response.raise_for_status()
+        return response.json()
+
+    def _content_cache_key(self, sp_path: str, metadata: dict, *parts) -> str:
+        # cTag only changes with the content, eTag also with metadata such as a rename
+        return self.cache.make_key(sp_path, metadata.get("cTag") or metadata["eTag"], *parts)
+
+    def _download(self, sp_path: str, metadata: dict) -> bytes:
+        """Content of the file described by metadata, served from the local cache when unchanged."""
+        if self.cache is not None:
+            cache_key = self._content_cache_key(sp_path, metadata)
+            content = self.cache.get(cache_key)
+            if content is not None:
+                self._log_cache_event("hits", sp_path, len(content))
+                record_io(cache_hit=True)
+                return content
+
+        # The download URL is pre-authenticated
+        response, retries = self._send_with_retry("GET", metadata["@microsoft.graph.downloadUrl"])
+        response.raise_for_status()
+        content = response.content
+        record_io(nbytes=len(content), retries=retries)
+
+        if self.cache is not None:
+            self.cache.put(cache_key, content)
+            self._log_cache_event("misses", sp_path, len(content))
+        return content
 
+    @instrument("read_bytes")
     def read_bytes(self, sp_path: str) -> bytes:
         """
         Reads the content of a file from SharePoint as bytes using sp_path.
 
+        The file's metadata is fetched first and its content is kept in a local cache keyed by sp_path
+        and cTag, so reading an unchanged file costs a single metadata request.
+
         Args:
             sp_path (str): SharePoint resource path (e.g., "sp://KCHCLSP00022/Shared Documents/MyFile.xlsx")
 
         Returns:
             bytes: The content of the file.
         """
-        site_id, file_path = self._parse_sp_path(sp_path)
-        site_url = f"{self._site_url_base}{site_id}"  # Construct full site url
-        site = self.client.sites.get_by_url(site_url)
-        drive_item = site.drive.root.get_by_path(file_path).get().execute_query()
-        content = drive_item.get_content().execute_query().value
-        return content
+        return self._download(sp_path, self._item_metadata(sp_path))
 
     def _write_formatted_excel(self, df_pd: pd.DataFrame, sheet_name: str = "Sheet1") -> BytesIO:
         """
@@ -204,6 +315,7 @@ class MSGraph:
         with open(local_path, "wb") as f:
             f.write(excel_buffer.getvalue())
 
+    @instrument("upload_tibble")
     def upload_tibble(
         self,
         tibble,
@@ -236,153 +348,609 @@ class MSGraph:
 
         return upload_result
 
+    @instrument("read_tibble")
     def read_tibble(self, sp_path: str, **kwargs) -> pl.DataFrame:
         """
         Read tabular data from SharePoint using sp_path. Automatically detects file type.
 
+        Parsed frames are cached locally as parquet, keyed by sp_path, the file's cTag and the read
+        arguments, so an unchanged workbook is neither downloaded nor parsed again.
+
         Args:
             sp_path (str): SharePoint resource path (e.g., "sp://KCHCLSP00022/Shared Documents/MyData.csv")
-            use_polars (bool): If True, returns a Polars DataFrame, otherwise Pandas.
             **kwargs: Additional arguments passed to the appropriate read function
 
         Returns:
-            Union[pl.DataFrame, pd.DataFrame]: The contents of the file as a DataFrame
+            pl.DataFrame: The contents of the file as a DataFrame
 
         Raises:
             ValueError: If file type cannot be determined or is not supported
         """
         _, file_path = self._parse_sp_path(sp_path)  # Parse once to get file_path for extension check
 
-        # Get the file bytes using the existing read_bytes method
-        file_bytes = self.read_bytes(sp_path)  # Pass the sp_path directly
-
         # Determine file type from extension in the file_path part
         file_ext = os.path.splitext(file_path)[1].lower()
+        if file_ext not in [".parquet", ".csv", ".xlsx", ".xls"]:
+            raise ValueError(f"Unsupported file format: {file_ext}")
+
+        metadata = self._item_metadata(sp_path)
+        if self.cache is not None:
+            frame_key = self._content_cache_key(sp_path, metadata, "frame", repr(sorted(kwargs.items())))
+            cached = self.cache.get(frame_key)
+            if cached is not None:
+                self._log_cache_event("hits", sp_path, len(cached))
+                record_io(cache_hit=True)
+                return pl.read_parquet(BytesIO(cached))
 
         # Create BytesIO object
-        buffer = BytesIO(file_bytes)
+        buffer = BytesIO(self._download(sp_path, metadata))
 
         # Parse based on file type
         if file_ext == ".parquet":
-
-            return pl.read_parquet(buffer, **kwargs)
-
+            df = pl.read_parquet(buffer, **kwargs)
         elif file_ext == ".csv":
+            df = pl.read_csv(buffer, **kwargs)
+        else:
+            df = pl.read_excel(buffer, **kwargs)
+
+        # Multi-sheet reads return a dict of frames, those are not cached
+        if self.cache is not None and isinstance(df, pl.DataFrame):
+            try:
+                frame_buffer = BytesIO()
+                df.write_parquet(frame_buffer)
+                self.cache.put(frame_key, frame_buffer.getvalue())
+            except Exception as e:
+                # The frame cache is only an accelerator, a frame parquet cannot hold must not fail the read
+                if self.context_check:
+                    self.context.log.warning(f"Could not cache the parsed frame of {sp_path}: {e}")
+        return df
+
+    def _graph_get_all(self, url: str, params: dict = None) -> tuple[list, dict]:
+        """GET a Graph collection following @odata.nextLink, returning all values and the last page."""
+        values = []
+        while url:
+            response, _ = self._send_with_retry("GET", url, params=params, headers=self._graph_headers())
+            response.raise_for_status()
+            page = response.json()
+            values.extend(page.get("value", []))
+            # nextLink already carries the query string
+            url, params = page.get("@odata.nextLink"), None
+        return values, page
+
+    def _drive_graph_id(self, site_id: str) -> str:
+        """Graph id of a site's default document library, resolved once per process."""
+        if site_id not in _DRIVE_IDS:
+            response, _ = self._send_with_retry(
+                "GET", f"{_GRAPH_API}/sites/{self._site_graph_id(site_id)}/drive", headers=self._graph_headers()
+            )
+            response.raise_for_status()
+            with _IDS_LOCK:
+                _DRIVE_IDS[site_id] = response.json()["id"]
+        return _DRIVE_IDS[site_id]
 
-            return pl.read_csv(buffer, **kwargs)
+    def _item_path(self, sp_path: str) -> str:
+        """Graph path of a drive item relative to /v1.0, addressed by its path in the site's library."""
+        site_id, file_path = self._parse_sp_path(sp_path)
+        return f"/drives/{self._drive_graph_id(site_id)}/root:/{quote(file_path)}"
 
-        elif file_ext in [".xlsx", ".xls"]:
+    @staticmethod
+    def _item_record(item: dict, parent_path: str) -> dict:
+        return {
+            "id": item["id"],
+            "parent_id": item.get("parentReference", {}).get("id"),
+            "name": item["name"],
+            "path": f"{parent_path}/{item['name']}" if parent_path else item["name"],
+            "size_bytes": item.get("size"),
+            "last_modified": item.get("lastModifiedDateTime"),
+            "web_url": item.get("webUrl"),
+            "is_folder": "folder" in item,
+        }
 
-            return pl.read_excel(buffer, **kwargs)
+    def _list_children(self, drive_id: str, item_id: str, path: str) -> list:
+        children, _ = self._graph_get_all(
+            f"{_GRAPH_API}/drives/{drive_id}/items/{item_id}/children",
+            params={"$select": _LISTING_SELECT, "$top": 999},
+        )
+        return [self._item_record(child, path) for child in children]
+
+    def _crawl(self, drive_id: str, folder_id: str, folder_path: str, max_workers: int) -> list:
+        """List every item below a folder breadth-first, fetching each level's folders concurrently."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        records = []
+        frontier = [(folder_id, folder_path)]
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            while frontier:
+                levels = list(
+                    executor.map(propagate_io(lambda folder: self._list_children(drive_id, *folder)), frontier)
+                )
+                frontier = []
+                for children in levels:
+                    records.extend(children)
+                    frontier.extend((child["id"], child["path"]) for child in children if child["is_folder"])
+        return records
+
+    @staticmethod
+    def _remove_subtree(index: dict, item_id: str) -> set:
+        """Drop an item and everything below it from the index, returning the removed ids."""
+        prefix = index[item_id]["path"] + "/"
+        removed = {item_id} | {key for key, record in index.items() if record["path"].startswith(prefix)}
+        for key in removed:
+            del index[key]
+        return removed
+
+    def _apply_delta(self, index: dict, folder_id: str, folder_path: str, changes: list) -> tuple[set, list]:
+        """
+        Apply drive delta changes to the listing index of one folder.
 
-        else:
-            raise ValueError(f"Unsupported file format: {file_ext}")
+        Delta items carry no path, so paths are rebuilt from parent ids. Changes outside the folder
+        are ignored, items moved out of it are dropped and renamed folders carry their subtree along.
+
+        Returns:
+            tuple: (ids added or modified, folders new to the index whose contents must be crawled)
+        """
+        changed, new_folders, pending = set(), [], []
+        for item in changes:
+            if item["id"] == folder_id:
+                continue
+            if "deleted" in item:
+                if item["id"] in index:
+                    changed -= self._remove_subtree(index, item["id"])
+            else:
+                pending.append(item)
+
+        # Parents are not guaranteed to come before their children
+        progress = True
+        while pending and progress:
+            progress, unresolved = False, []
+            for item in pending:
+                parent_id = item.get("parentReference", {}).get("id")
+                if parent_id == folder_id:
+                    parent_path = folder_path
+                elif parent_id in index and index[parent_id]["is_folder"]:
+                    parent_path = index[parent_id]["path"]
+                else:
+                    unresolved.append(item)
+                    continue
+
+                record = self._item_record(item, parent_path)
+                previous = index.get(record["id"])
+                if previous and record["is_folder"] and previous["path"] != record["path"]:
+                    old_prefix = previous["path"] + "/"
+                    for descendant in index.values():
+                        if descendant["path"].startswith(old_prefix):
+                            descendant["path"] = record["path"] + "/" + descendant["path"][len(old_prefix) :]
+                elif previous is None and record["is_folder"]:
+                    new_folders.append(record)
+                index[record["id"]] = record
+                changed.add(record["id"])
+                progress = True
+            pending = unresolved
+
+        # Whatever is left now lives outside the folder
+        for item in pending:
+            if item["id"] in index:
+                changed -= self._remove_subtree(index, item["id"])
+        return changed, new_folders
+
+    @staticmethod
+    def _listing_frame(records: list) -> pl.DataFrame:
+        return (
+            pl.DataFrame(records, schema=_LISTING_SCHEMA)
+            .with_columns(pl.col("last_modified").str.to_datetime(time_zone="UTC"))
+            .select(["name", "path", "size_bytes", "last_modified", "web_url", "is_folder"])
+            .sort("path")
+        )
 
-    # list_paths remains unchanged as it uses site_url and folder_path differently
-    def list_paths(self, site_url: str, folder_path: str) -> pd.DataFrame:
+    @instrument("list_paths")
+    def list_paths(
+        self,
+        site_url: str,
+        folder_path: str,
+        use_delta: bool = True,
+        changed_only: bool = False,
+        max_workers: int = 8,
+        state_path: str = None,
+        datalake=None,
+    ) -> pl.DataFrame:
         """
-        Lists files and folders within a specific SharePoint folder.
+        Lists files and folders within a specific SharePoint folder, recursively.
+
+        The listing is kept as an index under bhp-process-data/STATE/SHAREPOINT_DELTA together with a
+        Graph drive delta link. Repeat listings only fetch the items changed since the previous one and
+        apply them to the index. The first listing, or one whose delta link expired, crawls the folder
+        breadth-first with each level's folders listed concurrently.
 
         Args:
-            site_url (str): The full URL of the SharePoint site (e.g., "[https://globalkomatsu.sharepoint.com/sites/KCHCLSP00022](https://globalkomatsu.sharepoint.com/sites/KCHCLSP00022)")
+            site_url (str): The full URL of the SharePoint site (e.g., "https://globalkomatsu.sharepoint.com/sites/KCHCLSP00022")
             folder_path (str): The path within the site's default document library (e.g., "Shared Documents/MyFolder")
+            use_delta (bool): Use and update the persisted index, False for a one-off crawl
+            changed_only (bool): Return only the items added or modified since the previous listing
+            max_workers (int): Bound on concurrent folder listings during a crawl
+            state_path (str): Where to persist the index, defaults to a path derived from the site and folder
+            datalake (DataLake): DataLake used for the state, created if not provided
 
         Returns:
-            pd.DataFrame: A DataFrame containing information about the items found.
-        """
-        site = self.client.sites.get_by_url(site_url)
-        items = []
-        target_folder_item = site.drive.root.get_by_path(folder_path)
-        self._list_items_recursive(
-            target_folder_item,
-            items,
-            base_path=folder_path,  # Pass the initial folder path as base
+            pl.DataFrame: name, path, size_bytes, last_modified, web_url and is_folder of each item.
+        """
+        site_id = site_url.rstrip("/").split("/")[-1]
+        folder_path = folder_path.strip("/")
+        drive_id = self._drive_graph_id(site_id)
+        response, _ = self._send_with_retry(
+            "GET", f"{_GRAPH_API}/drives/{drive_id}/root:/{quote(folder_path)}", headers=self._graph_headers()
         )
+        response.raise_for_status()
+        folder_id = response.json()["id"]
+
+        if not use_delta:
+            return self._listing_frame(self._crawl(drive_id, folder_id, folder_path, max_workers))
+
+        from azure.core.exceptions import ResourceNotFoundError
+
+        from .datalake import DataLake
 
-        if not items:
-            return pd.DataFrame(
-                columns=[
-                    "name",
-                    "path",
-                    "size_bytes",
-                    "last_modified",
-                    "web_url",
-                    "is_folder",  # Added column
-                ]
+        datalake = datalake or DataLake(self.context)
+        state_path = (state_path or f"{SHAREPOINT_DELTA_ROOT}/{site_id}/{folder_path}").rstrip("/")
+        try:
+            state = json.loads(datalake.read_bytes(f"{state_path}/delta.json"))
+        except ResourceNotFoundError:
+            state = {}
+        index_df = datalake.read_tibble(f"{state_path}/index.parquet", raise_if_missing=False)
+
+        delta_link = state.get("delta_link") if state.get("folder_id") == folder_id and index_df.height else None
+        if delta_link:
+            try:
+                changes, last_page = self._graph_get_all(delta_link)
+            except requests.HTTPError as e:
+                # 410 Gone: the delta link expired and the folder must be crawled again
+                if e.response is None or e.response.status_code not in (404, 410):
+                    raise
+                delta_link = None
+
+        if delta_link:
+            index = {record["id"]: record for record in index_df.iter_rows(named=True)}
+            changed, new_folders = self._apply_delta(index, folder_id, folder_path, changes)
+            for folder in new_folders:
+                # Folders moved in from elsewhere show up in the delta without their contents
+                for record in self._crawl(drive_id, folder["id"], folder["path"], max_workers):
+                    index[record["id"]] = record
+                    changed.add(record["id"])
+            mode = f"{len(changes)} delta changes"
+        else:
+            # Take the token before crawling so changes made during the crawl are replayed next time
+            _, last_page = self._graph_get_all(f"{_GRAPH_API}/drives/{drive_id}/root/delta", params={"token": "latest"})
+            index = {record["id"]: record for record in self._crawl(drive_id, folder_id, folder_path, max_workers)}
+            changed = set(index)
+            mode = "full crawl"
+
+        datalake.upload_tibble(
+            pl.DataFrame(list(index.values()), schema=_LISTING_SCHEMA), f"{state_path}/index.parquet"
+        )
+        datalake.upload_bytes(
+            json.dumps(
+                {
+                    "folder_id": folder_id,
+                    "delta_link": last_page["@odata.deltaLink"],
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                }
+            ).encode("utf-8"),
+            f"{state_path}/delta.json",
+        )
+
+        if self.context_check:
+            self.context.log.info(
+                f"Listed {len(index)} items in {folder_path} ({mode}, {len(changed)} added or modified)"
             )
-        # Convert list of dicts to DataFrame
-        df = pd.DataFrame(items)
-        # Ensure consistent column order and add is_folder if missing
-        cols = ["name", "path", "size_bytes", "last_modified", "web_url", "is_folder"]
-        for col in cols:
-            if col not in df.columns:
-                df[col] = None  # Add missing columns as None
-        return df[cols]
-
-    def _list_items_recursive(self, folder_item, items_list, base_path: str) -> None:
-        """Helper for recursively listing items"""
-        children = folder_item.children.get().execute_query()
-
-        for item in children:
-            current_path = f"{base_path}/{item.name}" if base_path else item.name
-            is_folder = item.is_folder
-
-            item_info = {
-                "name": item.name,
-                "path": current_path,  # Construct full path relative to drive root
-                "size_bytes": item.properties.get("size"),
-                "last_modified": (
-                    item.last_modified_datetime.strftime("%Y-%m-%d %H:%M:%S") if item.last_modified_datetime else None
-                ),
-                "web_url": item.web_url,
-                "is_folder": is_folder,
-            }
-            items_list.append(item_info)
+        records = [index[item_id] for item_id in changed] if changed_only else list(index.values())
+        return self._listing_frame(records)
+
+    def _graph_headers(self) -> dict:
+        token = self.acquire_token_func()
+        return {"Authorization": f"{token.get('token_type', 'Bearer')} {token['access_token']}"}
+
+    def _site_graph_id(self, site_id: str) -> str:
+        """Graph id of a SharePoint site (e.g. "KCHCLSP00022"), resolved once per process."""
+        if site_id not in _SITE_IDS:
+            response, _ = self._send_with_retry(
+                "GET", f"{_GRAPH_API}/sites/{_SHAREPOINT_HOST}:/sites/{site_id}", headers=self._graph_headers()
+            )
+            response.raise_for_status()
+            with _IDS_LOCK:
+                _SITE_IDS[site_id] = response.json()["id"]
+        return _SITE_IDS[site_id]
+
+    def _send_with_retry(self, method: str, url: str, max_retries: int = _UPLOAD_MAX_RETRIES, **kwargs):
+        """
+        Send a request, retrying throttling (429), server errors and connection failures.
+
+        Returns:
+            tuple: (response, retries), the response being the first non-retryable one
+        """
+        for attempt in range(max_retries + 1):
+            try:
+                response = _SESSION.request(method, url, timeout=120, **kwargs)
+                if response.status_code not in _RETRYABLE_STATUS or attempt == max_retries:
+                    return response, attempt
+                delay = _retry_after(response.headers, 2**attempt)
+            except requests.ConnectionError:
+                if attempt == max_retries:
+                    raise
+                delay = 2**attempt
+            time.sleep(delay)
+
+    def _upload_session(self, item_url: str, content: bytes, file_name: str, chunk_size: int) -> tuple[dict, int]:
+        """
+        Upload content through a Graph upload session in fixed-size ranges.
+
+        A failed range is retried on its own, resuming from the server's nextExpectedRanges so bytes it
+        already received are not sent again. The session is cancelled if a range keeps failing.
 
-            # If it's a folder, recurse into it using the constructed path
-            if is_folder:
-                self._list_items_recursive(item, items_list, base_path=current_path)
+        Returns:
+            tuple: (drive item JSON, total retries)
+        """
+        response, retries = self._send_with_retry(
+            "POST",
+            f"{item_url}/createUploadSession",
+            headers=self._graph_headers(),
+            json={"item": {"@microsoft.graph.conflictBehavior": "replace"}},
+        )
+        response.raise_for_status()
+        upload_url = response.json()["uploadUrl"]
+
+        total = len(content)
+        offset = 0
+        failures = 0
+        try:
+            while True:
+                end = min(offset + chunk_size, total)
+                # The upload URL is pre-authenticated, sending the Authorization header makes it fail
+                response, range_retries = self._send_with_retry(
+                    "PUT",
+                    upload_url,
+                    data=content[offset:end],
+                    headers={"Content-Length": str(end - offset), "Content-Range": f"bytes {offset}-{end - 1}/{total}"},
+                )
+                retries += range_retries
+
+                if response.status_code in (200, 201):
+                    self._log_upload_progress(file_name, total, total)
+                    return response.json(), retries
+
+                if response.status_code == 202:
+                    next_range = response.json()["nextExpectedRanges"][0]
+                    failures = 0
+                elif response.status_code == 416 or response.status_code in _RETRYABLE_STATUS:
+                    # Range rejected or still failing, resume from what the server actually received
+                    failures += 1
+                    if failures > _UPLOAD_MAX_RETRIES:
+                        raise RuntimeError(f"Upload of {file_name} kept failing at byte {offset}")
+                    status, status_retries = self._send_with_retry("GET", upload_url)
+                    retries += status_retries + 1
+                    status.raise_for_status()
+                    next_range = status.json()["nextExpectedRanges"][0]
+                else:
+                    response.raise_for_status()
+
+                offset = int(next_range.split("-")[0])
+                self._log_upload_progress(file_name, offset, total)
+        except Exception:
+            try:
+                _SESSION.delete(upload_url, timeout=30)
+            except requests.RequestException as e:
+                # The session expires on its own, the upload error is the one to report
+                if self.context_check:
+                    self.context.log.warning(f"Could not cancel the upload session of {file_name}: {e}")
+            raise
+
+    def _log_upload_progress(self, file_name: str, uploaded: int, total: int) -> None:
+        message = f"Uploading {file_name}: {uploaded / 1024**2:.1f}/{total / 1024**2:.1f} MB ({uploaded / total:.0%})"
+        if self.context_check:
+            self.context.log.info(message)
+        else:
+            print(message)
 
-    def upload_file(self, sp_path: str, content: bytes) -> dict:
+    @instrument("upload_file")
+    def upload_file(self, sp_path: str, content: bytes, chunk_size: int = _UPLOAD_CHUNK_SIZE) -> dict:
         """
         Uploads file content directly to SharePoint using sp_path.
         Overwrites the file if it exists.
 
+        Files up to 4 MB go up in a single request. Larger files go through a Graph upload session in
+        ranges of chunk_size bytes, each retried independently, so a transient error no longer fails
+        the whole upload. Existing files are replaced in place (conflictBehavior=replace), which keeps
+        their version history and sharing links.
+
         Args:
             sp_path (str): SharePoint resource path including filename.
             content (bytes): Raw content of the file as bytes.
+            chunk_size (int): Bytes per upload session range, a multiple of 320 KiB.
 
         Returns:
-            dict: Information about the upload result, including file URL if uploaded.
-                  Returns the raw DriveItem object on success.
+            dict: Information about the upload result, including file URL and the uploaded DriveItem JSON.
         """
-        try:
-            self.delete_file(sp_path)  # Use the same sp_path for deletion
-        except Exception as delete_error:
-            # If delete fails (e.g., file not found), ignore and proceed with upload
-            print(f"Note: Could not delete existing file '{sp_path}' before upload (may not exist): {delete_error}")
-            pass
+        if chunk_size % _UPLOAD_CHUNK_UNIT:
+            raise ValueError(f"chunk_size must be a multiple of {_UPLOAD_CHUNK_UNIT} bytes")
 
-        site_id, file_path = self._parse_sp_path(sp_path)
-        site_url = f"{self._site_url_base}{site_id}"
+        _, file_path = self._parse_sp_path(sp_path)
         folder_path = os.path.dirname(file_path)
         file_name = os.path.basename(file_path)
+        item_url = f"{_GRAPH_API}{self._item_path(sp_path)}:"
+
+        if len(content) <= _SIMPLE_UPLOAD_LIMIT:
+            response, retries = self._send_with_retry(
+                "PUT",
+                f"{item_url}/content",
+                params={"@microsoft.graph.conflictBehavior": "replace"},
+                headers=self._graph_headers(),
+                data=content,
+            )
+            response.raise_for_status()
+            drive_item = response.json()
+        else:
+            drive_item, retries = self._upload_session(item_url, content, file_name, chunk_size)
+        record_io(nbytes=len(content), retries=retries)
 
-        site = self.client.sites.get_by_url(site_url)
-        target_folder = site.drive.root.get_by_path(folder_path)
-
-        # The library's upload method handles overwrite by default
-        upload_result = target_folder.upload(file_name, content).execute_query()
-
-        # Return a dictionary similar to the original upload_file for consistency,
-        # or you could return the raw upload_result (DriveItem)
         return {
             "status": "uploaded",
             "message": f"File {file_name} uploaded successfully to {folder_path}",
-            "web_url": upload_result.web_url,
-            "drive_item": upload_result,  # Optionally include the full result object
+            "web_url": drive_item.get("webUrl"),
+            "drive_item": drive_item,
+        }
+
+    def _batch_groups(self, operations: list, indices: list):
+        """Split operation indices into $batch requests of at most 20 operations and _BATCH_MAX_BYTES of body."""
+        group, group_bytes = [], 0
+        for index in indices:
+            size = len(operations[index].get("body") or "")
+            if group and (len(group) == _BATCH_SIZE or group_bytes + size > _BATCH_MAX_BYTES):
+                yield group
+                group, group_bytes = [], 0
+            group.append(index)
+            group_bytes += size
+        if group:
+            yield group
+
+    def batch(self, operations: list, max_retries: int = _UPLOAD_MAX_RETRIES) -> list:
+        """
+        Send Graph requests through JSON $batch, packing up to 20 of them into a single round trip.
+
+        Operations answered with 429 or 5xx are resent in a later batch after the longest Retry-After
+        they returned; throttling of the $batch request itself is retried by _send_with_retry.
+
+        Args:
+            operations (list): Dicts with "method" and "url" relative to /v1.0 (e.g. "/drives/{id}/root:/a.pdf"),
+                plus optional "headers" and "body" (JSON, or a base64 string with a Content-Type header).
+            max_retries (int): Times a throttled operation is resent.
+
+        Returns:
+            list: One {"status", "headers", "body"} dict per operation, in the order given.
+        """
+        responses = [None] * len(operations)
+        pending = list(range(len(operations)))
+        for attempt in range(max_retries + 1):
+            throttled, delay = [], 0.0
+            for group in self._batch_groups(operations, pending):
+                response, _ = self._send_with_retry(
+                    "POST",
+                    f"{_GRAPH_API}/$batch",
+                    headers=self._graph_headers(),
+                    json={"requests": [{"id": str(index), **operations[index]} for index in group]},
+                )
+                response.raise_for_status()
+                for item in response.json()["responses"]:
+                    index = int(item["id"])
+                    headers = item.get("headers") or {}
+                    if item["status"] in _RETRYABLE_STATUS and attempt < max_retries:
+                        throttled.append(index)
+                        delay = max(delay, _retry_after(headers, 2**attempt))
+                    else:
+                        responses[index] = {"status": item["status"], "headers": headers, "body": item.get("body")}
+
+            if not throttled:
+                break
+            record_io(retries=len(throttled))
+            time.sleep(delay)
+            pending = sorted(throttled)
+        return responses
+
+    @instrument("get_items_metadata")
+    def get_items_metadata(self, sp_paths: list) -> dict:
+        """
+        Fetch the DriveItem metadata of many files in batches of 20.
+
+        Args:
+            sp_paths (list): SharePoint resource paths
+
+        Returns:
+            dict: DriveItem JSON per sp_path, None for files that do not exist.
+        """
+        responses = self.batch([{"method": "GET", "url": self._item_path(sp_path)} for sp_path in sp_paths])
+        return {
+            sp_path: response["body"] if response["status"] == 200 else None
+            for sp_path, response in zip(sp_paths, responses)
         }
 
+    @instrument("delete_files")
+    def delete_files(self, sp_paths: list) -> dict:
+        """
+        Delete many files in batches of 20, bypassing shared locks. Files already missing count as deleted.
+
+        Args:
+            sp_paths (list): SharePoint resource paths
+
+        Returns:
+            dict: Results with counts and errors
+        """
+        operations = [
+            {"method": "DELETE", "url": self._item_path(sp_path), "headers": {"Prefer": "bypass-shared-lock"}}
+            for sp_path in sp_paths
+        ]
+        results = {"total": len(sp_paths), "successful": 0, "failed": 0, "errors": []}
+        for sp_path, response in zip(sp_paths, self.batch(operations)):
+            if response["status"] in (204, 404):
+                results["successful"] += 1
+            else:
+                results["failed"] += 1
+                results["errors"].append({"sp_path": sp_path, "error": f"{response['status']}: {response['body']}"})
+
+        if self.context_check:
+            self.context.log.info(f"Deleted {results['successful']}/{results['total']} SharePoint files")
+        return results
+
+    @instrument("upload_files")
+    def upload_files(self, files: dict, overwrite: bool = True) -> dict:
+        """
+        Upload many files, sending those up to 1 MB through $batch 20 at a time.
+
+        Larger files go through upload_file and its upload sessions.
+
+        Args:
+            files (dict): Content bytes per SharePoint resource path
+            overwrite (bool): Replace existing files; when False they are skipped
+
+        Returns:
+            dict: Results with counts, errors and the web_url of each uploaded file
+        """
+        results = {"total": len(files), "successful": 0, "failed": 0, "skipped": 0, "errors": [], "web_urls": {}}
+        if not overwrite and files:
+            existing = [sp_path for sp_path, item in self.get_items_metadata(list(files)).items() if item]
+            results["skipped"] = len(existing)
+            files = {sp_path: content for sp_path, content in files.items() if sp_path not in existing}
+
+        small = [sp_path for sp_path, content in files.items() if len(content) <= _BATCH_UPLOAD_LIMIT]
+        operations = [
+            {
+                "method": "PUT",
+                "url": f"{self._item_path(sp_path)}:/content?@microsoft.graph.conflictBehavior=replace",
+                "headers": {"Content-Type": "application/octet-stream"},
+                "body": base64.b64encode(files[sp_path]).decode("ascii"),
+            }
+            for sp_path in small
+        ]
+        for sp_path, response in zip(small, self.batch(operations)):
+            if response["status"] in (200, 201):
+                results["successful"] += 1
+                results["web_urls"][sp_path] = response["body"].get("webUrl")
+            else:
+                results["failed"] += 1
+                results["errors"].append({"sp_path": sp_path, "error": f"{response['status']}: {response['body']}"})
+        record_io(nbytes=sum(len(files[sp_path]) for sp_path in small))
+
+        for sp_path in set(files) - set(small):
+            try:
+                results["web_urls"][sp_path] = self.upload_file(sp_path, files[sp_path])["web_url"]
+                results["successful"] += 1
+            except Exception as e:
+                results["failed"] += 1
+                results["errors"].append({"sp_path": sp_path, "error": str(e)})
+
+        if self.context_check:
+            self.context.log.info(
+                f"Uploaded {results['successful']}/{results['total']} files to SharePoint "
+                f"({results['skipped']} skipped, {results['failed']} failed)"
+            )
+        return results
+
     def _store_new_refresh_token(self):
 
         client_id = "d50ca740-c83f-4d1b-b616-12c519384f0c"
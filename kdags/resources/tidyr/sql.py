@@ -1,19 +1,328 @@
+import importlib.util
+import itertools
+import json
 import os
+import threading
+import time
+import uuid
 import polars as pl
 import pandas as pd
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
 from typing import Optional, Union, Iterator, Dict, Any, List
 from urllib.parse import quote_plus
 import dagster as dg
-from sqlalchemy import create_engine, Engine, text
-from sqlalchemy.pool import NullPool
+from sqlalchemy import create_engine, Engine, text, Column, MetaData, Table, inspect
+from sqlalchemy import types as sqltypes
+from sqlalchemy.dialects import mssql
+from sqlalchemy.pool import QueuePool
+from azure.core.exceptions import ResourceNotFoundError
 import pyodbc
 
+# Azure SQL closes idle connections after ~30 minutes, recycle well before that
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_RECYCLE = 1800
+
+_ENGINES = {}
+_ENGINES_LOCK = threading.Lock()
+
+# arrow-odbc is optional (pip install kdags[arrow]), without it the Arrow path streams pyodbc fetchmany batches
+_HAS_ARROW_ODBC = importlib.util.find_spec("arrow_odbc") is not None
+DEFAULT_ARROW_BATCH_SIZE = 100_000
+ARROW_MAX_BYTES_PER_BATCH = 2**29  # 512 MB
+
+# arrow-odbc opens its own connections, capped per connection string at the engine's pool size + overflow
+_ARROW_ODBC_SLOTS = {}
+_ARROW_ODBC_SLOTS_LOCK = threading.Lock()
+
+# Arrow types of pyodbc cursor.description type codes, keeping batch dtypes stable across fetches
+_ARROW_TYPE_NAMES = {
+    bool: "bool_",
+    int: "int64",
+    float: "float64",
+    str: "string",
+    bytes: "binary",
+    bytearray: "binary",
+    date: "date32",
+}
+
+# Rows sent per executemany call by write_tibble
+DEFAULT_WRITE_CHUNK_SIZE = 50_000
+
+# High-water marks of incremental extracts, one JSON file per table
+WATERMARK_STATE_ROOT = "az://bhp-process-data/STATE/SQL_WATERMARKS"
+
+FLUID_HOURS_COLUMNS = [
+    "FLUID_SAMPLE_ID",
+    "SITE_ID",
+    "MACHINE_ID",
+    "COMPONENT_ID",
+    "POSITION_ID",
+    "FLUID_UNIQUE_NUMBER",
+    "SAMPLE_DATE",
+    "LOAD_DATE",
+    "SAMPLE_TYPE",
+    "FLUID_HOURS",
+    "MACHINE_HOURS",
+    "COMPONENT_HOURS",
+]
+
+
+def _parse_conn_str(conn_str: str) -> Dict[str, str]:
+    """Split an Azure SQL (ADO.NET style) connection string into its key/value pairs."""
+    conn_dict = {}
+    for item in conn_str.strip(";").split(";"):
+        if "=" in item:
+            key, value = item.split("=", 1)
+            conn_dict[key.strip()] = value.strip()
+    return conn_dict
+
+
+def _detect_driver(conn_dict: Dict[str, str]) -> str:
+    """Driver named in the connection string, else the newest installed SQL Server ODBC driver."""
+    driver = conn_dict.get("Driver", "")
+    if not driver:
+        # Try to find available SQL Server ODBC driver
+        drivers = [d for d in pyodbc.drivers() if "SQL Server" in d]
+        if drivers:
+            # Prefer newer versions
+            driver = sorted(drivers)[-1]
+        else:
+            driver = "ODBC Driver 17 for SQL Server"  # Default fallback
+    return driver.strip("{}")
+
+
+def _build_odbc_connection_string(conn_str: str) -> Optional[str]:
+    """ODBC connection string for arrow-odbc, or None when conn_str is a SQLAlchemy URL."""
+    if conn_str.startswith(("mssql://", "mssql+pyodbc://")):
+        return None
+
+    conn_dict = _parse_conn_str(conn_str)
+    server = conn_dict.get("Server", conn_dict.get("Data Source", ""))
+    params = {
+        "Driver": "{" + _detect_driver(conn_dict) + "}",
+        "Server": server,
+        "Database": conn_dict.get("Database", conn_dict.get("Initial Catalog", "")),
+        "UID": conn_dict.get("User ID", conn_dict.get("UID", "")),
+        "PWD": "{" + conn_dict.get("Password", conn_dict.get("PWD", "")).replace("}", "}}") + "}",
+        "TrustServerCertificate": conn_dict.get("TrustServerCertificate", "yes"),
+        "Connection Timeout": conn_dict.get("Connection Timeout", "30"),
+    }
+    for key in ["Encrypt", "ApplicationIntent"]:
+        if key in conn_dict:
+            params[key] = conn_dict[key]
+    return ";".join(f"{k}={v}" for k, v in params.items())
+
+
+def _build_connection_url(conn_str: str) -> str:
+    """Translate an Azure SQL (ADO.NET style) connection string into a SQLAlchemy pyodbc URL."""
+    # If it's already a SQLAlchemy URL format
+    if conn_str.startswith(("mssql://", "mssql+pyodbc://")):
+        return conn_str
+
+    # Parse Azure SQL connection string format
+    conn_dict = _parse_conn_str(conn_str)
+
+    # Build ODBC connection string
+    server = conn_dict.get("Server", conn_dict.get("Data Source", ""))
+    database = conn_dict.get("Database", conn_dict.get("Initial Catalog", ""))
+    username = conn_dict.get("User ID", conn_dict.get("UID", ""))
+    password = conn_dict.get("Password", conn_dict.get("PWD", ""))
+
+    # Handle server format (remove tcp: prefix if present)
+    if server.startswith("tcp:"):
+        server = server[4:]
+
+    # Build driver string - try to detect available SQL Server ODBC driver
+    driver = _detect_driver(conn_dict)
+
+    # Build connection URL for SQLAlchemy
+    params = {
+        "driver": driver,
+        "TrustServerCertificate": "yes",
+        "Connection Timeout": "30",
+    }
+
+    # Add any additional parameters from original connection string
+    for key in ["Encrypt", "TrustServerCertificate", "Connection Timeout", "ApplicationIntent"]:
+        if key in conn_dict:
+            params[key] = conn_dict[key]
+
+    # URL encode the password to handle special characters
+    password_encoded = quote_plus(password)
+
+    # Build the connection URL
+    query_string = ";".join([f"{k}={v}" for k, v in params.items()])
+    return f"mssql+pyodbc://{username}:{password_encoded}@{server}/{database}?driver={driver}&{query_string}"
+
+
+def get_sql_engine(
+    conn_str: str,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    max_overflow: int = DEFAULT_MAX_OVERFLOW,
+    pool_recycle: int = DEFAULT_POOL_RECYCLE,
+    pool_pre_ping: bool = True,
+) -> Engine:
+    """
+    Return the process-wide pooled engine for a connection string.
+
+    The engine (driver detection, URL parsing and its connection pool) is built once per
+    connection string, so repeated SQLDatabase instances and chunked reads reuse logged-in
+    connections instead of paying a TLS handshake and login per query.
+
+    Parameters
+    ----------
+    conn_str : str
+        Azure SQL connection string or SQLAlchemy URL
+    pool_size : int, default 5
+        Connections kept open in the pool, used only when the engine is first built
+    max_overflow : int, default 10
+        Extra connections allowed above pool_size under load
+    pool_recycle : int, default 1800
+        Seconds after which a pooled connection is replaced
+    pool_pre_ping : bool, default True
+        Test connections on checkout so connections dropped by the server are transparently replaced
+
+    Returns
+    -------
+    Engine
+        Shared SQLAlchemy engine
+    """
+    with _ENGINES_LOCK:
+        if conn_str not in _ENGINES:
+            _ENGINES[conn_str] = create_engine(
+                _build_connection_url(conn_str),
+                poolclass=QueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_recycle=pool_recycle,
+                pool_pre_ping=pool_pre_ping,
+            )
+        return _ENGINES[conn_str]
+
+
+def dispose_sql_engines() -> None:
+    """Close every pooled connection of every shared engine."""
+    with _ENGINES_LOCK:
+        for engine in _ENGINES.values():
+            engine.dispose()
+        _ENGINES.clear()
+
+
+def _arrow_odbc_slots(odbc_conn_str: str, limit: int) -> threading.BoundedSemaphore:
+    """Return the process-wide semaphore bounding concurrent arrow-odbc connections for a connection string."""
+    with _ARROW_ODBC_SLOTS_LOCK:
+        if odbc_conn_str not in _ARROW_ODBC_SLOTS:
+            _ARROW_ODBC_SLOTS[odbc_conn_str] = threading.BoundedSemaphore(max(1, limit))
+        return _ARROW_ODBC_SLOTS[odbc_conn_str]
+
+
+def _arrow_type(column: tuple):
+    """Arrow type for a pyodbc cursor.description entry, or None when it must be inferred from the data."""
+    import pyarrow as pa
+
+    type_code, precision, scale = column[1], column[4], column[5]
+    if type_code is datetime:
+        return pa.timestamp("us")
+    if type_code is Decimal:
+        return pa.decimal128(precision, scale or 0) if precision and 0 < precision <= 38 else None
+    name = _ARROW_TYPE_NAMES.get(type_code)
+    return getattr(pa, name)() if name else None
+
+
+def _sql_type(dtype: pl.DataType, is_key: bool = False) -> sqltypes.TypeEngine:
+    """SQLAlchemy column type for a Polars dtype, rendered as the matching T-SQL type on Azure SQL."""
+    if dtype in (pl.Int8, pl.Int16, pl.UInt8):
+        return sqltypes.SmallInteger()
+    if dtype in (pl.Int32, pl.UInt16):
+        return sqltypes.Integer()
+    if dtype in (pl.Int64, pl.UInt32):
+        return sqltypes.BigInteger()
+    if dtype == pl.UInt64:
+        return sqltypes.Numeric(20, 0)
+    if dtype == pl.Float32:
+        return sqltypes.Float(24)
+    if dtype == pl.Float64:
+        return sqltypes.Float(53)
+    if dtype == pl.Boolean:
+        return sqltypes.Boolean()
+    if dtype == pl.Date:
+        return sqltypes.Date()
+    if dtype == pl.Time:
+        return sqltypes.Time()
+    if isinstance(dtype, pl.Datetime):
+        return sqltypes.DateTime().with_variant(mssql.DATETIME2(), "mssql")
+    if isinstance(dtype, pl.Decimal):
+        return sqltypes.Numeric(dtype.precision or 38, dtype.scale or 0)
+    if dtype in (pl.String, pl.Categorical) or isinstance(dtype, pl.Enum):
+        # NVARCHAR(MAX) cannot be indexed, keys stay within the 900 byte index key limit
+        return sqltypes.Unicode(450) if is_key else sqltypes.Unicode()
+    raise ValueError(f"Unsupported column type for SQL write: {dtype}")
+
+
+def _encode_watermark(value: Any) -> tuple:
+    """JSON-safe form of a watermark and the type _decode_watermark needs to restore it."""
+    if isinstance(value, datetime):
+        return value.isoformat(), "datetime"
+    if isinstance(value, date):
+        return value.isoformat(), "date"
+    if isinstance(value, Decimal):
+        return str(value), "decimal"
+    if isinstance(value, str):
+        return value, "string"
+    return value, "number"
+
+
+def _decode_watermark(value: Any, watermark_type: str) -> Any:
+    """Watermark stored by _encode_watermark, back in the type the extract compares it with."""
+    if value is None:
+        return None
+    if watermark_type == "datetime":
+        return datetime.fromisoformat(value)
+    if watermark_type == "date":
+        return date.fromisoformat(value)
+    if watermark_type == "decimal":
+        return Decimal(value)
+    if watermark_type == "number" and isinstance(value, str):
+        # Older states stored dates and decimals as strings under "number"
+        try:
+            return Decimal(value)
+        except InvalidOperation:
+            return date.fromisoformat(value)
+    return value
+
+
+class SQLDatabaseResource(dg.ConfigurableResource):
+    """Dagster resource exposing the shared, pooled SQLAlchemy engine for Azure SQL."""
+
+    connection_string: Optional[str] = None
+    pool_size: int = DEFAULT_POOL_SIZE
+    max_overflow: int = DEFAULT_MAX_OVERFLOW
+    pool_recycle: int = DEFAULT_POOL_RECYCLE
+
+    @property
+    def conn_str(self) -> str:
+        return self.connection_string or os.environ["AZURE_SQL_CONNECTION_STRING"]
+
+    def get_engine(self) -> Engine:
+        return get_sql_engine(
+            self.conn_str, pool_size=self.pool_size, max_overflow=self.max_overflow, pool_recycle=self.pool_recycle
+        )
+
+    def get_client(self, context: dg.AssetExecutionContext = None) -> "SQLDatabase":
+        return SQLDatabase(context=context, resource=self)
+
 
 class SQLDatabase:
-    """Class for reading data from Azure SQL Database with Polars integration."""
+    """Class for reading and writing Azure SQL Database tables with Polars integration."""
 
-    def __init__(self, context: dg.AssetExecutionContext = None, connection_string: str = None):
+    def __init__(
+        self,
+        context: dg.AssetExecutionContext = None,
+        connection_string: str = None,
+        resource: SQLDatabaseResource = None,
+    ):
         """
         Initialize SQL Database connection.
 
@@ -24,13 +333,17 @@ class SQLDatabase:
         connection_string : str, optional
             Connection string for Azure SQL Database. If not provided,
             will look for environment variable AZURE_SQL_CONNECTION_STRING
+        resource : SQLDatabaseResource, optional
+            Resource supplying the connection string and pool settings
         """
         self.context_check = isinstance(context, dg.AssetExecutionContext)
         self.context = context
 
-        # Get connection string from parameter or environment
+        # Get connection string from parameter, resource or environment
         if connection_string:
             self._conn_str = connection_string
+        elif resource is not None:
+            self._conn_str = resource.conn_str
         else:
             self._conn_str = os.environ.get("AZURE_SQL_CONNECTION_STRING")
 
@@ -39,65 +352,103 @@ class SQLDatabase:
                 "No connection string provided. Set AZURE_SQL_CONNECTION_STRING environment variable or pass connection_string parameter."
             )
 
-        # Parse connection string and create SQLAlchemy engine
+        # Engines and their connection pools are shared process-wide
+        self._resource = resource
         self._engine = self._create_engine()
+        self._odbc_conn_str = _build_odbc_connection_string(self._conn_str) if _HAS_ARROW_ODBC else None
+        if self._odbc_conn_str is not None:
+            pool_size = resource.pool_size if resource is not None else DEFAULT_POOL_SIZE
+            max_overflow = resource.max_overflow if resource is not None else DEFAULT_MAX_OVERFLOW
+            self._arrow_slots = _arrow_odbc_slots(self._odbc_conn_str, pool_size + max_overflow)
 
     def _create_engine(self) -> Engine:
-        """Create SQLAlchemy engine from connection string."""
-        # If it's already a SQLAlchemy URL format
-        if self._conn_str.startswith(("mssql://", "mssql+pyodbc://")):
-            return create_engine(self._conn_str, poolclass=NullPool)
-
-        # Parse Azure SQL connection string format
-        conn_dict = {}
-        for item in self._conn_str.strip(";").split(";"):
-            if "=" in item:
-                key, value = item.split("=", 1)
-                conn_dict[key.strip()] = value.strip()
-
-        # Build ODBC connection string
-        server = conn_dict.get("Server", conn_dict.get("Data Source", ""))
-        database = conn_dict.get("Database", conn_dict.get("Initial Catalog", ""))
-        username = conn_dict.get("User ID", conn_dict.get("UID", ""))
-        password = conn_dict.get("Password", conn_dict.get("PWD", ""))
-
-        # Handle server format (remove tcp: prefix if present)
-        if server.startswith("tcp:"):
-            server = server[4:]
-
-        # Build driver string - try to detect available SQL Server ODBC driver
-        driver = conn_dict.get("Driver", "")
-        if not driver:
-            # Try to find available SQL Server ODBC driver
-            drivers = [d for d in pyodbc.drivers() if "SQL Server" in d]
-            if drivers:
-                # Prefer newer versions
-                driver = sorted(drivers)[-1]
-            else:
-                driver = "ODBC Driver 17 for SQL Server"  # Default fallback
+        """Return the shared pooled engine for this connection string."""
+        if self._resource is not None:
+            return get_sql_engine(
+                self._conn_str,
+                pool_size=self._resource.pool_size,
+                max_overflow=self._resource.max_overflow,
+                pool_recycle=self._resource.pool_recycle,
+            )
+        return get_sql_engine(self._conn_str)
 
-        # Build connection URL for SQLAlchemy
-        params = {
-            "driver": driver,
-            "TrustServerCertificate": "yes",
-            "Connection Timeout": "30",
-        }
+    def _read_arrow_odbc(
+        self, query: str, iter_batches: bool, batch_size: int, schema_overrides: Optional[Dict[str, pl.DataType]]
+    ) -> Union[pl.DataFrame, Iterator[pl.DataFrame]]:
+        """
+        Fetch through arrow-odbc, which fills Arrow buffers in the driver without Python row objects.
+
+        arrow-odbc cannot borrow a pooled connection, so each query holds one of the connection
+        string's slots until its result (or, with iter_batches, its last batch) has been read.
+        """
+        self._arrow_slots.acquire()
+        try:
+            result = pl.read_database(
+                query=query,
+                connection=self._odbc_conn_str,
+                iter_batches=iter_batches,
+                batch_size=batch_size,
+                schema_overrides=schema_overrides,
+                execute_options={"max_bytes_per_batch": ARROW_MAX_BYTES_PER_BATCH},
+            )
+        except Exception:
+            self._arrow_slots.release()
+            raise
+        if not iter_batches:
+            self._arrow_slots.release()
+            return result
 
-        # Add any additional parameters from original connection string
-        for key in ["Encrypt", "TrustServerCertificate", "Connection Timeout", "ApplicationIntent"]:
-            if key in conn_dict:
-                params[key] = conn_dict[key]
+        def release_after(batches: Iterator[pl.DataFrame]) -> Iterator[pl.DataFrame]:
+            try:
+                yield from batches
+            finally:
+                self._arrow_slots.release()
 
-        # URL encode the password to handle special characters
-        password_encoded = quote_plus(password)
+        # Start the generator so closing or discarding it always frees the slot
+        batches = release_after(result)
+        first = next(batches, None)
+        return itertools.chain([] if first is None else [first], batches)
 
-        # Build the connection URL
-        query_string = ";".join([f"{k}={v}" for k, v in params.items()])
-        connection_url = (
-            f"mssql+pyodbc://{username}:{password_encoded}@{server}/{database}?driver={driver}&{query_string}"
-        )
+    def _iter_fetchmany_batches(
+        self, query: str, batch_size: int, schema_overrides: Optional[Dict[str, pl.DataType]]
+    ) -> Iterator[pl.DataFrame]:
+        """
+        Stream a query through pyodbc fetchmany into Arrow record batches.
 
-        return create_engine(connection_url, poolclass=NullPool)
+        Only batch_size rows exist as Python objects at any time, each batch being converted
+        column-wise to Arrow before the next fetch. Column types come from cursor.description, and
+        those it doesn't map are pinned to the first batch's non-null type, so every batch has the
+        same schema.
+        """
+        import pyarrow as pa
+
+        connection = self._engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.arraysize = batch_size
+            cursor.execute(query)
+            names = [column[0] for column in cursor.description]
+            types = [_arrow_type(column) for column in cursor.description]
+            fetched = False
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    if not fetched:
+                        yield pl.DataFrame(schema=names)
+                    break
+                fetched = True
+                columns = [pa.array(values, type=dtype) for values, dtype in zip(zip(*rows), types)]
+                types = [
+                    column.type if dtype is None and column.null_count < len(column) else dtype
+                    for column, dtype in zip(columns, types)
+                ]
+                df = pl.from_arrow(pa.RecordBatch.from_arrays(columns, names=names))
+                if schema_overrides:
+                    df = df.cast({name: dtype for name, dtype in schema_overrides.items() if name in df.columns})
+                yield df
+        finally:
+            # Returns the connection to the pool
+            connection.close()
 
     def read_tibble(
         self,
@@ -107,6 +458,7 @@ class SQLDatabase:
         batch_size: Optional[int] = None,
         schema_overrides: Optional[Dict[str, pl.DataType]] = None,
         execute_options: Optional[Dict[str, Any]] = None,
+        fetch: str = "auto",
     ) -> Union[pl.DataFrame, Iterator[pl.DataFrame]]:
         """
         Read SQL query results into a Polars DataFrame.
@@ -118,11 +470,16 @@ class SQLDatabase:
         iter_batches : bool, default False
             Return an iterator of DataFrames for memory-efficient processing
         batch_size : int, optional
-            Size of each batch when iter_batches is True
+            Size of each batch when iter_batches is True, and of each fetch on the Arrow path
         schema_overrides : dict, optional
             Dictionary mapping column names to Polars dtypes
         execute_options : dict, optional
             Additional options passed to the query execution
+        fetch : {"auto", "arrow", "sqlalchemy"}, default "auto"
+            "arrow" streams record batches straight into Polars, through arrow-odbc when installed or
+            pyodbc fetchmany otherwise. "sqlalchemy" is the pl.read_database path over the engine.
+            "auto" uses arrow-odbc when installed, else the SQLAlchemy path. Parameterized queries
+            (execute_options) always use the SQLAlchemy path, and a failing Arrow fetch falls back to it.
 
         Returns
         -------
@@ -130,7 +487,31 @@ class SQLDatabase:
             Query results as Polars DataFrame(s)
         """
         if self.context_check:
-            self.context.log.info(f"Executing SQL query: {query[:100]}...")
+            self.context.log.info(f"Executing SQL query: {str(query)[:100]}...")
+
+        use_arrow = fetch == "arrow" or (fetch == "auto" and _HAS_ARROW_ODBC and self._odbc_conn_str is not None)
+        if use_arrow and isinstance(query, str) and not execute_options:
+            arrow_batch_size = batch_size or DEFAULT_ARROW_BATCH_SIZE
+            try:
+                if _HAS_ARROW_ODBC and self._odbc_conn_str is not None:
+                    result = self._read_arrow_odbc(query, iter_batches, arrow_batch_size, schema_overrides)
+                else:
+                    batches = self._iter_fetchmany_batches(query, arrow_batch_size, schema_overrides)
+                    if iter_batches:
+                        # Execute now so a failing query still falls back below
+                        first = next(batches, None)
+                        result = itertools.chain([] if first is None else [first], batches)
+                    else:
+                        frames = list(batches)
+                        result = pl.concat(frames, how="vertical_relaxed") if frames else pl.DataFrame()
+
+                if not iter_batches and self.context_check:
+                    self.context.log.info(f"Query returned {result.height} rows, {result.width} columns (arrow)")
+                return result
+
+            except Exception as e:
+                if self.context_check:
+                    self.context.log.warning(f"Arrow fetch failed, falling back to SQLAlchemy: {str(e)}")
 
         try:
             result = pl.read_database(
@@ -223,20 +604,7 @@ class SQLDatabase:
         """
         from_datetime = (datetime.now(timezone.utc) - timedelta(hours=hours_ago)).strftime("%Y-%m-%d")
 
-        columns = [
-            "FLUID_SAMPLE_ID",
-            "SITE_ID",
-            "MACHINE_ID",
-            "COMPONENT_ID",
-            "POSITION_ID",
-            "FLUID_UNIQUE_NUMBER",
-            "SAMPLE_DATE",
-            "LOAD_DATE",
-            "SAMPLE_TYPE",
-            "FLUID_HOURS",
-            "MACHINE_HOURS",
-            "COMPONENT_HOURS",
-        ]
+        columns = FLUID_HOURS_COLUMNS
 
         query = f"""
         SELECT {', '.join(columns)} 
@@ -248,6 +616,190 @@ class SQLDatabase:
 
         return self.read_tibble(query.strip())
 
+    def sync_fluid_hours(self, full_reconcile: bool = False) -> Dict[str, Any]:
+        """
+        Incrementally sync FACT_FLUID_SAMPLE into the fluid_hours analytics table.
+
+        Only rows loaded since the last run (by LOAD_DATE) are fetched, instead of re-pulling two
+        years of samples as read_fluid_hours does.
+
+        Parameters
+        ----------
+        full_reconcile : bool, default False
+            Re-extract the whole table to pick up late updates
+
+        Returns
+        -------
+        dict
+            Summary returned by incremental_extract
+        """
+        from kdags.config import DATA_CATALOG
+
+        return self.incremental_extract(
+            table_name="FACT_FLUID_SAMPLE",
+            schema="ISCAA_KCC",
+            key_columns=["FLUID_SAMPLE_ID"],
+            watermark_column="LOAD_DATE",
+            catalog_entry=DATA_CATALOG["fluid_hours"],
+            columns=FLUID_HOURS_COLUMNS,
+            where="SAMPLE_TYPE = 'Normal' AND LOAD_DATE IS NOT NULL",
+            full_reconcile=full_reconcile,
+            chunk_column="FLUID_SAMPLE_ID",
+        )
+
+    def _read_watermark_state(self, state_path: str, datalake) -> Dict[str, Any]:
+        try:
+            state = json.loads(datalake.read_bytes(state_path))
+        except ResourceNotFoundError:
+            return {}
+        if "watermark" in state:
+            state["watermark"] = _decode_watermark(state["watermark"], state.get("watermark_type", "number"))
+        return state
+
+    def incremental_extract(
+        self,
+        table_name: str,
+        key_columns: List[str],
+        watermark_column: str,
+        catalog_entry: Dict[str, Any],
+        schema: str = None,
+        columns: Optional[List[str]] = None,
+        where: Optional[str] = None,
+        full_reconcile: bool = False,
+        reconcile_every_days: Optional[int] = 7,
+        state_path: Optional[str] = None,
+        chunk_column: Optional[str] = None,
+        max_workers: int = 4,
+        datalake=None,
+    ) -> Dict[str, Any]:
+        """
+        Extract only rows newer than the stored high-water mark and merge them into an analytics table.
+
+        The watermark (maximum of a monotonic column such as LOAD_DATE) is kept as JSON in the process
+        zone and only advanced after the merge succeeds. Rows equal to the watermark are fetched again,
+        since rows sharing that value may have been committed after the last run; the upsert on
+        key_columns makes that overlap harmless. A full reconcile re-extracts the whole table (in
+        parallel ranges when chunk_column is given, each range handed to the writer as it arrives) to
+        pick up rows updated without moving the watermark; it runs on the first extract, when
+        requested, or every reconcile_every_days.
+
+        Parameters
+        ----------
+        table_name : str
+            Source table
+        key_columns : list of str
+            Columns identifying a row, used for the merge
+        watermark_column : str
+            Monotonically increasing column (load timestamp or identity)
+        catalog_entry : dict
+            DATA_CATALOG entry of the target, merged with DataLake.upsert_analytics_batches
+        schema : str, optional
+            Schema of the source table
+        columns : list of str, optional
+            Columns to extract (defaults to all columns)
+        where : str, optional
+            Additional filter applied to every extract (without the WHERE keyword)
+        full_reconcile : bool, default False
+            Force a full re-extract
+        reconcile_every_days : int, optional, default 7
+            Days between automatic full reconciles, None to disable
+        state_path : str, optional
+            Location of the watermark state (defaults to WATERMARK_STATE_ROOT/<schema>/<table>.json)
+        chunk_column : str, optional
+            Numeric indexed column used to split full extracts with read_chunked
+        max_workers : int, default 4
+            Concurrent ranges for full extracts
+        datalake : DataLake, optional
+            DataLake used for state and target I/O, created if not provided
+
+        Returns
+        -------
+        dict
+            Summary with the extract mode, rows merged and previous / new watermark
+        """
+        from .datalake import DataLake
+
+        datalake = datalake or DataLake(self.context)
+        table_ref = f"[{schema}].[{table_name}]" if schema else f"[{table_name}]"
+        state_path = state_path or f"{WATERMARK_STATE_ROOT}/{schema or 'dbo'}/{table_name}.json"
+        state = self._read_watermark_state(state_path, datalake)
+
+        last_reconcile = state.get("last_full_reconcile")
+        reconcile_due = reconcile_every_days is not None and (
+            last_reconcile is None
+            or datetime.now(timezone.utc) - datetime.fromisoformat(last_reconcile)
+            > timedelta(days=reconcile_every_days)
+        )
+        full = full_reconcile or "watermark" not in state or reconcile_due
+
+        columns_str = ", ".join([f"[{col}]" for col in columns]) if columns else "*"
+        query = f"SELECT {columns_str} FROM {table_ref}"
+        if where:
+            query += f" WHERE {where}"
+
+        if full:
+            if self.context_check:
+                self.context.log.info(f"Full extract of {table_ref}")
+            if chunk_column:
+                batches = self.read_chunked(
+                    query, chunk_column, max_workers=max_workers, n_partitions=4 * max_workers, balanced=True
+                )
+            else:
+                batches = [self.read_tibble(query)]
+        else:
+            if self.context_check:
+                self.context.log.info(
+                    f"Incremental extract of {table_ref} from {watermark_column} >= {state['watermark']}"
+                )
+            batches = [
+                self.read_with_params(
+                    self._filtered_query(query, f"[{watermark_column}] >= :watermark"),
+                    {"watermark": state["watermark"]},
+                )
+            ]
+
+        extracted = {"rows": 0, "watermark": None}
+
+        def track(batches):
+            # Row count and high-water mark are taken as the batches stream to the writer
+            for batch in batches:
+                if batch.is_empty():
+                    continue
+                extracted["rows"] += batch.height
+                batch_max = batch[watermark_column].max()
+                if batch_max is not None and (extracted["watermark"] is None or batch_max > extracted["watermark"]):
+                    extracted["watermark"] = batch_max
+                yield batch
+
+        datalake.upsert_analytics_batches(track(batches), catalog_entry, key_columns=key_columns)
+
+        new_watermark = extracted["watermark"]
+        if new_watermark is None or (state.get("watermark") is not None and new_watermark < state["watermark"]):
+            new_watermark = state.get("watermark")
+
+        now = datetime.now(timezone.utc)
+        watermark_value, watermark_type = _encode_watermark(new_watermark)
+        new_state = {
+            "watermark": watermark_value,
+            "watermark_type": watermark_type,
+            "last_full_reconcile": now.isoformat() if full else last_reconcile,
+            "last_rows": extracted["rows"],
+            "updated_at": now.isoformat(),
+        }
+        datalake.upload_bytes(json.dumps(new_state).encode("utf-8"), state_path)
+
+        summary = {
+            "mode": "full" if full else "incremental",
+            "rows": extracted["rows"],
+            "previous_watermark": str(state.get("watermark")),
+            "watermark": str(new_watermark),
+        }
+        if self.context_check:
+            self.context.log.info(
+                f"Merged {summary['rows']} rows of {table_ref} ({summary['mode']}), watermark {summary['watermark']}"
+            )
+        return summary
+
     def read_with_params(self, query: str, params: Dict[str, Any], **kwargs) -> pl.DataFrame:
         """
         Execute a parameterized query safely using SQLAlchemy's parameter binding.
@@ -283,10 +835,80 @@ class SQLDatabase:
             **kwargs,
         )
 
-    def read_chunked(self, query: str, chunk_column: str, chunk_size: int = 100000, **kwargs) -> Iterator[pl.DataFrame]:
+    @staticmethod
+    def _filtered_query(query: str, condition: str) -> str:
+        """Append a condition to a query, with WHERE or AND as needed."""
+        if "where" in query.lower():
+            return f"{query} AND {condition}"
+        return f"{query} WHERE {condition}"
+
+    def _chunk_ranges(
+        self, query: str, chunk_column: str, chunk_size: int, n_partitions: Optional[int], balanced: bool
+    ) -> List[tuple]:
+        """
+        Split the chunk column's value range into (lower, upper, upper_inclusive) bounds.
+
+        Equal-width ranges come from MIN/MAX; balanced ranges come from NTILE quantiles, so skewed
+        or sparse ids still give partitions with similar row counts.
+        """
+        range_query = self._filtered_query(query, f"{chunk_column} IS NOT NULL")
+
+        if balanced:
+            n_tiles = n_partitions or 16
+            quantile_query = (
+                f"SELECT tile, MIN({chunk_column}) AS min_val, MAX({chunk_column}) AS max_val "
+                f"FROM (SELECT {chunk_column}, NTILE({n_tiles}) OVER (ORDER BY {chunk_column}) AS tile "
+                f"FROM ({range_query}) t) q GROUP BY tile ORDER BY tile"
+            )
+            tiles = self.read_tibble(quantile_query)
+            if tiles.is_empty():
+                return []
+            # NTILE may split equal values across tiles, unique lower bounds keep ranges disjoint
+            lowers = sorted(set(tiles["min_val"].to_list()))
+            upper = tiles["max_val"].max()
+            return [(lower, next_lower, False) for lower, next_lower in zip(lowers, lowers[1:])] + [
+                (lowers[-1], upper, True)
+            ]
+
+        minmax_query = f"SELECT MIN({chunk_column}) as min_val, MAX({chunk_column}) as max_val FROM ({range_query}) t"
+        bounds = self.read_tibble(minmax_query)
+        if bounds.is_empty() or bounds["min_val"][0] is None:
+            return []
+
+        min_val = bounds["min_val"][0]
+        max_val = bounds["max_val"][0]
+        if n_partitions:
+            chunk_size = max(1, -(-(max_val - min_val + 1) // n_partitions))
+
+        ranges = []
+        current = min_val
+        while current <= max_val:
+            ranges.append((current, current + chunk_size, False))
+            current += chunk_size
+        return ranges
+
+    def _read_range(self, query: str, chunk_column: str, bounds: tuple, **kwargs) -> pl.DataFrame:
+        lower, upper, upper_inclusive = bounds
+        upper_op = "<=" if upper_inclusive else "<"
+        chunk_query = self._filtered_query(query, f"{chunk_column} >= {lower} AND {chunk_column} {upper_op} {upper}")
+        return self.read_tibble(chunk_query, **kwargs)
+
+    def read_chunked(
+        self,
+        query: str,
+        chunk_column: str,
+        chunk_size: int = 100000,
+        max_workers: int = 1,
+        n_partitions: Optional[int] = None,
+        balanced: bool = False,
+        **kwargs,
+    ) -> Iterator[pl.DataFrame]:
         """
         Read large tables in chunks based on a numeric ID column.
 
+        With max_workers > 1 the ranges are fetched concurrently over pooled connections, keeping at
+        most 2 * max_workers chunks in flight, and still yielded in ascending key order.
+
         Parameters
         ----------
         query : str
@@ -294,7 +916,13 @@ class SQLDatabase:
         chunk_column : str
             Column name to use for chunking (should be numeric and indexed)
         chunk_size : int, default 100000
-            Number of rows per chunk
+            Width of each key range
+        max_workers : int, default 1
+            Number of ranges fetched concurrently (bounded by the engine's pool_size + max_overflow)
+        n_partitions : int, optional
+            Split the key range into this many partitions instead of chunk_size-wide ranges
+        balanced : bool, default False
+            Use NTILE quantile bounds (n_partitions tiles, default 16) so skewed ids give balanced partitions
         **kwargs
             Additional arguments passed to read_tibble
 
@@ -303,39 +931,281 @@ class SQLDatabase:
         pl.DataFrame
             Data chunks
         """
-        # First get the range of the chunk column
-        base_query = query.lower()
-        if "where" in base_query:
-            range_query = f"{query} AND {chunk_column} IS NOT NULL"
-        else:
-            range_query = f"{query} WHERE {chunk_column} IS NOT NULL"
+        from collections import deque
+        from concurrent.futures import ThreadPoolExecutor
 
-        # Get min and max values
-        minmax_query = f"SELECT MIN({chunk_column}) as min_val, MAX({chunk_column}) as max_val FROM ({range_query}) t"
-        bounds = self.read_tibble(minmax_query)
+        ranges = self._chunk_ranges(query, chunk_column, chunk_size, n_partitions, balanced)
 
-        if bounds.is_empty() or bounds["min_val"][0] is None:
+        if max_workers <= 1:
+            for bounds in ranges:
+                chunk_df = self._read_range(query, chunk_column, bounds, **kwargs)
+                if not chunk_df.is_empty():
+                    yield chunk_df
             return
 
-        min_val = bounds["min_val"][0]
-        max_val = bounds["max_val"][0]
+        if self.context_check:
+            self.context.log.info(f"Reading {len(ranges)} ranges of {chunk_column} with {max_workers} workers")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            remaining = iter(ranges)
+            for bounds in remaining:
+                pending.append(executor.submit(self._read_range, query, chunk_column, bounds, **kwargs))
+                if len(pending) >= 2 * max_workers:
+                    break
+
+            while pending:
+                chunk_df = pending.popleft().result()
+                next_bounds = next(remaining, None)
+                if next_bounds is not None:
+                    pending.append(executor.submit(self._read_range, query, chunk_column, next_bounds, **kwargs))
+                if not chunk_df.is_empty():
+                    yield chunk_df
+
+    def read_chunked_to_parquet(
+        self,
+        query: str,
+        chunk_column: str,
+        az_path: str,
+        chunk_size: int = 100000,
+        max_workers: int = 4,
+        n_partitions: Optional[int] = None,
+        balanced: bool = False,
+        datalake=None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Extract ranges concurrently and write each one straight to a parquet part file.
 
-        # Read in chunks
-        current = min_val
-        while current <= max_val:
-            chunk_end = current + chunk_size
+        Each worker fetches a range and uploads it as {az_path}/part-{index:05d}.parquet, so the
+        table is never held in memory at once. The directory can be read back with
+        DataLake.scan_dataset.
 
-            if "where" in base_query:
-                chunk_query = f"{query} AND {chunk_column} >= {current} AND {chunk_column} < {chunk_end}"
-            else:
-                chunk_query = f"{query} WHERE {chunk_column} >= {current} AND {chunk_column} < {chunk_end}"
+        Parameters
+        ----------
+        query : str
+            Base SQL query (should include WHERE clause if needed)
+        chunk_column : str
+            Column name to use for chunking (should be numeric and indexed)
+        az_path : str
+            Destination directory (e.g. "az://bhp-raw-data/ISCAA/FACT_FLUID_SAMPLE")
+        chunk_size, max_workers, n_partitions, balanced
+            As in read_chunked
+        datalake : DataLake, optional
+            DataLake used for the uploads, created if not provided
+        **kwargs
+            Additional arguments passed to read_tibble
+
+        Returns
+        -------
+        dict
+            Results with counts, rows written and errors
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        from .datalake import DataLake
+        from .instrumentation import propagate_io
+
+        datalake = datalake or DataLake(self.context)
+        ranges = self._chunk_ranges(query, chunk_column, chunk_size, n_partitions, balanced)
+        results = {"total": len(ranges), "successful": 0, "failed": 0, "rows": 0, "files": [], "errors": []}
+
+        def extract(index: int, bounds: tuple) -> tuple:
+            chunk_df = self._read_range(query, chunk_column, bounds, **kwargs)
+            if chunk_df.is_empty():
+                return None, 0
+            part_path = f"{az_path.rstrip('/')}/part-{index:05d}.parquet"
+            datalake.upload_tibble(chunk_df, part_path)
+            return part_path, chunk_df.height
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                executor.submit(propagate_io(extract), index, bounds): bounds for index, bounds in enumerate(ranges)
+            }
+            for future in as_completed(futures):
+                try:
+                    part_path, rows = future.result()
+                    results["successful"] += 1
+                    results["rows"] += rows
+                    if part_path:
+                        results["files"].append(part_path)
+                except Exception as e:
+                    results["failed"] += 1
+                    results["errors"].append({"range": futures[future], "error": str(e)})
+
+        results["files"].sort()
+
+        # Remove parts left by an earlier extraction with more ranges, unless this one is incomplete
+        if not results["failed"]:
+            try:
+                existing = datalake.list_paths(az_path, recursive=False)
+            except ResourceNotFoundError:
+                existing = pl.DataFrame()
+            if not existing.is_empty():
+                written = set(results["files"])
+                stale = [
+                    path
+                    for path in existing["az_path"].to_list()
+                    if path.split("/")[-1].startswith("part-") and path not in written
+                ]
+                if stale:
+                    datalake.delete_files(stale)
+
+        if self.context_check:
+            self.context.log.info(
+                f"Wrote {results['rows']} rows in {len(results['files'])} files to {az_path} "
+                f"({results['failed']} ranges failed)"
+            )
+        return results
+
+    def _insert_rows(self, connection, table: Table, df: pl.DataFrame, chunk_size: int) -> int:
+        """Insert df into table with one executemany call per chunk, returning the number of chunks."""
+        preparer = connection.dialect.identifier_preparer
+        columns = ", ".join(preparer.quote(name) for name in df.columns)
+        # pyodbc and sqlite3 both use qmark parameters
+        statement = (
+            f"INSERT INTO {preparer.format_table(table)} ({columns}) VALUES ({', '.join('?' for _ in df.columns)})"
+        )
 
-            chunk_df = self.read_tibble(chunk_query, **kwargs)
+        cursor = connection.connection.cursor()
+        try:
+            if connection.dialect.driver == "pyodbc":
+                # Bind whole parameter arrays instead of one round trip per row
+                cursor.fast_executemany = True
+            chunks = 0
+            for offset in range(0, df.height, chunk_size):
+                cursor.executemany(statement, df.slice(offset, chunk_size).rows())
+                chunks += 1
+            return chunks
+        finally:
+            cursor.close()
+
+    def write_tibble(
+        self,
+        df: pl.DataFrame,
+        table_name: str,
+        mode: str = "append",
+        key_columns: Optional[List[str]] = None,
+        schema: Optional[str] = None,
+        chunk_size: int = DEFAULT_WRITE_CHUNK_SIZE,
+    ) -> Dict[str, Any]:
+        """
+        Bulk write a Polars DataFrame to a table.
 
-            if not chunk_df.is_empty():
-                yield chunk_df
+        Rows are sent in chunks with pyodbc fast_executemany, which binds each chunk as parameter
+        arrays instead of issuing one INSERT per row. The whole write runs in a single transaction.
 
-            current = chunk_end
+        Parameters
+        ----------
+        df : pl.DataFrame
+            Rows to write, column names matching the table's
+        table_name : str
+            Target table, created from df's schema if it does not exist
+        mode : {"append", "replace", "upsert"}, default "append"
+            "append" inserts the rows. "replace" drops and recreates the table first. "upsert" loads
+            the rows into a staging table and applies them with a single set-based MERGE on key_columns.
+        key_columns : list of str, optional
+            Columns identifying a row, required for "upsert"
+        schema : str, optional
+            Schema of the table (defaults to the login's default schema, usually dbo)
+        chunk_size : int, default 50000
+            Rows sent per executemany call
+
+        Returns
+        -------
+        dict
+            Results with rows written, chunks, seconds and rows per second
+        """
+        if mode not in ("append", "replace", "upsert"):
+            raise ValueError(f"mode must be 'append', 'replace' or 'upsert', got {mode!r}")
+        if mode == "upsert" and not key_columns:
+            raise ValueError("key_columns are required for mode='upsert'")
+
+        key_columns = key_columns or []
+        if mode == "upsert":
+            # MERGE fails when several source rows match the same target row
+            df = df.unique(subset=key_columns, keep="last", maintain_order=True)
+
+        # Datetimes are stored as UTC in DATETIME2, categoricals as text
+        df = df.with_columns(
+            [
+                pl.col(name).dt.convert_time_zone("UTC").dt.replace_time_zone(None)
+                for name, dtype in df.schema.items()
+                if isinstance(dtype, pl.Datetime) and dtype.time_zone is not None
+            ]
+            + [
+                pl.col(name).cast(pl.String)
+                for name, dtype in df.schema.items()
+                if dtype == pl.Categorical or isinstance(dtype, pl.Enum)
+            ]
+        )
+
+        def table_for(name: str) -> Table:
+            return Table(
+                name,
+                MetaData(),
+                *[Column(column, _sql_type(dtype, column in key_columns)) for column, dtype in df.schema.items()],
+                schema=schema,
+            )
+
+        target = table_for(table_name)
+        results = {"table": table_name, "mode": mode, "rows": df.height, "chunks": 0}
+
+        started = time.perf_counter()
+        try:
+            with self._engine.begin() as connection:
+                if mode == "replace":
+                    target.drop(connection, checkfirst=True)
+                if not inspect(connection).has_table(table_name, schema=schema):
+                    target.create(connection)
+
+                if df.is_empty():
+                    pass
+                elif mode == "upsert":
+                    staging = table_for(f"{table_name}__staging_{uuid.uuid4().hex[:8]}")
+                    staging.create(connection)
+                    try:
+                        results["chunks"] = self._insert_rows(connection, staging, df, chunk_size)
+                        connection.exec_driver_sql(self._merge_statement(connection, target, staging, key_columns))
+                    finally:
+                        staging.drop(connection)
+                else:
+                    results["chunks"] = self._insert_rows(connection, target, df, chunk_size)
+
+        except Exception as e:
+            if self.context_check:
+                self.context.log.error(f"Error writing to {table_name}: {str(e)}")
+            raise
+
+        results["seconds"] = round(time.perf_counter() - started, 3)
+        results["rows_per_second"] = round(df.height / results["seconds"]) if results["seconds"] else None
+        if self.context_check:
+            self.context.log.info(
+                f"Wrote {results['rows']} rows to {table_name} ({mode}) in {results['seconds']}s, "
+                f"{results['rows_per_second']} rows/s"
+            )
+        return results
+
+    @staticmethod
+    def _merge_statement(connection, target: Table, staging: Table, key_columns: List[str]) -> str:
+        """T-SQL MERGE applying the staging table's rows to the target by key."""
+        preparer = connection.dialect.identifier_preparer
+        quoted = {column.name: preparer.quote(column.name) for column in target.columns}
+        on = " AND ".join(f"t.{quoted[key]} = s.{quoted[key]}" for key in key_columns)
+        updates = ", ".join(f"t.{name} = s.{name}" for column, name in quoted.items() if column not in key_columns)
+        columns = ", ".join(quoted.values())
+
+        statement = (
+            f"MERGE {preparer.format_table(target)} WITH (HOLDLOCK) AS t "
+            f"USING {preparer.format_table(staging)} AS s ON {on} "
+        )
+        if updates:
+            statement += f"WHEN MATCHED THEN UPDATE SET {updates} "
+        statement += (
+            f"WHEN NOT MATCHED BY TARGET THEN INSERT ({columns}) "
+            f"VALUES ({', '.join(f's.{name}' for name in quoted.values())});"
+        )
+        return statement
 
     def get_table_info(self, table_name: str, schema: str = None) -> pl.DataFrame:
         """
@@ -403,5 +1273,5 @@ class SQLDatabase:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit - dispose of the engine."""
-        self._engine.dispose()
+        """Context manager exit - the shared engine stays open for other instances, see dispose_sql_engines."""
+        pass
@@ -0,0 +1,272 @@
+import hashlib
+import posixpath
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import fsspec
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
+
+# Create-if-missing claims must be atomic across the threads of a process
+_CREATE_LOCK = threading.Lock()
+
+
+class Throttle:
+    """
+    Simulated network cost added to every storage call.
+
+    Each request sleeps latency seconds, plus nbytes / bandwidth seconds when it moves data, so
+    benchmarks on a local or in-memory backend see the same fan-out effects as ADLS.
+    """
+
+    def __init__(self, latency: float = 0.0, bandwidth: float = None):
+        """
+        Args:
+            latency: Seconds added to every request
+            bandwidth: Bytes per second available to each request, None for unlimited
+        """
+        self.latency = latency
+        self.bandwidth = bandwidth
+
+    def __call__(self, nbytes: int = 0) -> None:
+        delay = self.latency
+        if self.bandwidth and nbytes:
+            delay += nbytes / self.bandwidth
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _properties(info: dict) -> SimpleNamespace:
+    """Map fsspec file info to the attributes DataLake reads from ADLS path/file properties"""
+    modified = info.get("mtime") or info.get("created") or 0
+    if isinstance(modified, datetime):
+        last_modified = modified if modified.tzinfo else modified.replace(tzinfo=timezone.utc)
+    else:
+        last_modified = datetime.fromtimestamp(float(modified), tz=timezone.utc)
+    size = info.get("size") or 0
+    etag = '"' + hashlib.md5(f"{info['name']}|{size}|{last_modified.isoformat()}".encode("utf-8")).hexdigest() + '"'
+    return SimpleNamespace(size=size, content_length=size, last_modified=last_modified, etag=etag)
+
+
+class _Download:
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def readall(self) -> bytes:
+        return self._data
+
+
+class FsspecFileClient:
+    """Subset of the ADLS DataLakeFileClient API on top of an fsspec filesystem"""
+
+    def __init__(self, service, container: str, path: str):
+        self.service = service
+        self.container = container
+        self.path = path.strip("/")
+        self.full_path = service.full_path(container, self.path)
+        self._blocks = {}
+        self._blocks_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"{self.container}/{self.path}"
+
+    def _info(self) -> dict:
+        fs = self.service.fs
+        try:
+            info = fs.info(self.full_path)
+        except FileNotFoundError:
+            raise ResourceNotFoundError(f"The specified path does not exist: {self.url}")
+        if info["type"] == "directory":
+            raise ResourceNotFoundError(f"The specified path is a directory: {self.url}")
+        return info
+
+    def get_file_properties(self) -> SimpleNamespace:
+        self.service.throttle()
+        return _properties(self._info())
+
+    def download_file(self, etag: str = None, match_condition: MatchConditions = None) -> _Download:
+        info = self._info()
+        if match_condition == MatchConditions.IfNotModified and _properties(info).etag != etag:
+            raise ResourceModifiedError(f"The file was modified: {self.url}")
+        data = self.service.fs.cat_file(self.full_path)
+        self.service.throttle(len(data))
+        return _Download(data)
+
+    def create_file(self, match_condition: MatchConditions = None) -> None:
+        self.service.throttle()
+        fs = self.service.fs
+        fs.makedirs(posixpath.dirname(self.full_path), exist_ok=True)
+        with _CREATE_LOCK:
+            if match_condition == MatchConditions.IfMissing and fs.exists(self.full_path):
+                raise ResourceExistsError(f"The specified path already exists: {self.url}")
+            fs.pipe_file(self.full_path, b"")
+        with self._blocks_lock:
+            self._blocks = {}
+
+    def append_data(self, data: bytes, offset: int, length: int = None) -> None:
+        self.service.throttle(len(data))
+        with self._blocks_lock:
+            self._blocks[offset] = bytes(data)
+
+    def flush_data(self, offset: int) -> None:
+        self.service.throttle()
+        with self._blocks_lock:
+            data = b"".join(block for _, block in sorted(self._blocks.items()))
+            self._blocks = {}
+        self.service.fs.pipe_file(self.full_path, data[:offset])
+
+    def delete_file(self) -> None:
+        self.service.throttle()
+        self._info()
+        self.service.fs.rm_file(self.full_path)
+
+    def rename_file(self, new_name: str) -> "FsspecFileClient":
+        self.service.throttle()
+        self._info()
+        container, path = new_name.split("/", 1)
+        destination = self.service.get_file_system_client(container).get_file_client(path)
+        self.service.fs.makedirs(posixpath.dirname(destination.full_path), exist_ok=True)
+        self.service.fs.mv(self.full_path, destination.full_path)
+        return destination
+
+
+class FsspecDirectoryClient:
+    """Subset of the ADLS DataLakeDirectoryClient API on top of an fsspec filesystem"""
+
+    def __init__(self, service, container: str, path: str):
+        self.service = service
+        self.full_path = service.full_path(container, path)
+
+    def create_directory(self) -> None:
+        self.service.throttle()
+        self.service.fs.makedirs(self.full_path, exist_ok=True)
+
+    def get_directory_properties(self) -> SimpleNamespace:
+        self.service.throttle()
+        if not self.service.fs.isdir(self.full_path):
+            raise ResourceNotFoundError(f"The specified directory does not exist: {self.full_path}")
+        return SimpleNamespace(name=self.full_path)
+
+
+class FsspecFileSystemClient:
+    """Subset of the ADLS FileSystemClient API for one container"""
+
+    def __init__(self, service, container: str):
+        self.service = service
+        self.container = container
+        self.root = service.full_path(container, "")
+
+    def get_file_client(self, path: str) -> FsspecFileClient:
+        return FsspecFileClient(self.service, self.container, path)
+
+    def get_directory_client(self, path: str) -> FsspecDirectoryClient:
+        return FsspecDirectoryClient(self.service, self.container, path)
+
+    def get_paths(self, path: str = None, recursive: bool = True):
+        """Yield path items like ADLS get_paths, names relative to the container"""
+        self.service.throttle()
+        fs = self.service.fs
+        base = self.service.full_path(self.container, path or "")
+        if not fs.isdir(base):
+            raise ResourceNotFoundError(f"The specified path does not exist: {self.container}/{path or ''}")
+
+        if recursive:
+            entries = fs.find(base, withdirs=True, detail=True).values()
+        else:
+            entries = fs.ls(base, detail=True)
+
+        for info in sorted(entries, key=lambda entry: entry["name"]):
+            name = fs._strip_protocol(info["name"])[len(self.root) :].strip("/")
+            if not name or name == (path or "").strip("/"):
+                continue
+            properties = _properties(info)
+            yield SimpleNamespace(
+                name=name,
+                is_directory=info["type"] == "directory",
+                content_length=None if info["type"] == "directory" else properties.size,
+                last_modified=properties.last_modified,
+            )
+
+
+class FsspecDataLakeServiceClient:
+    """
+    Drop-in for DataLakeServiceClient backed by any fsspec filesystem.
+
+    Containers map to top-level directories under root, so "az://container/path" keeps its meaning.
+    """
+
+    def __init__(self, fs: fsspec.AbstractFileSystem, root: str = "", throttle: Throttle = None):
+        self.fs = fs
+        self.root = fs._strip_protocol(root).rstrip("/") if root else ""
+        self.throttle = throttle or Throttle()
+
+    def full_path(self, container: str, path: str) -> str:
+        return posixpath.join(self.root or "/", container, path.strip("/")).rstrip("/")
+
+    def get_file_system_client(self, container: str) -> FsspecFileSystemClient:
+        return FsspecFileSystemClient(self, container)
+
+
+class FsspecBlobClient:
+    """Subset of the BlobClient API used for server-side copies"""
+
+    def __init__(self, service: FsspecDataLakeServiceClient, container: str, blob: str):
+        self.file_client = FsspecFileClient(service, container, blob)
+        self.url = self.file_client.url
+
+    def start_copy_from_url(self, source_url: str) -> dict:
+        service = self.file_client.service
+        container, path = source_url.split("/", 1)
+        source = service.get_file_system_client(container).get_file_client(path)
+        data = source.download_file().readall()
+        service.fs.makedirs(posixpath.dirname(self.file_client.full_path), exist_ok=True)
+        service.fs.pipe_file(self.file_client.full_path, data)
+        return {"copy_id": uuid.uuid4().hex, "copy_status": "success"}
+
+    def abort_copy(self, copy_id: str) -> None:
+        pass
+
+    def get_blob_properties(self) -> SimpleNamespace:
+        properties = self.file_client.get_file_properties()
+        properties.copy = SimpleNamespace(status="success")
+        return properties
+
+
+class FsspecContainerClient:
+    """Subset of the ContainerClient API used for batch deletes"""
+
+    def __init__(self, service: FsspecDataLakeServiceClient, container: str):
+        self.file_system_client = service.get_file_system_client(container)
+
+    def delete_blobs(self, *blobs, raise_on_any_failure: bool = True):
+        service = self.file_system_client.service
+        # A batch is a single request
+        service.throttle()
+        responses = []
+        for blob in blobs:
+            full_path = self.file_system_client.get_file_client(blob).full_path
+            if service.fs.isfile(full_path):
+                service.fs.rm_file(full_path)
+                responses.append(SimpleNamespace(status_code=202, reason="Accepted"))
+            elif raise_on_any_failure:
+                raise ResourceNotFoundError(f"The specified blob does not exist: {blob}")
+            else:
+                responses.append(SimpleNamespace(status_code=404, reason="BlobNotFound"))
+        return iter(responses)
+
+
+class FsspecBlobServiceClient:
+    """Drop-in for BlobServiceClient sharing the filesystem of an FsspecDataLakeServiceClient"""
+
+    def __init__(self, service: FsspecDataLakeServiceClient):
+        self.service = service
+
+    def get_blob_client(self, container: str, blob: str) -> FsspecBlobClient:
+        return FsspecBlobClient(self.service, container, blob)
+
+    def get_container_client(self, container: str) -> FsspecContainerClient:
+        return FsspecContainerClient(self.service, container)
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import msal
+
+GRAPH_AUTHORITY = "https://login.microsoftonline.com/common"
+GRAPH_SCOPES = ["Files.ReadWrite.All"]
+
+# Tokens are renewed this many seconds before they expire, so a request never leaves with a dying token
+_REFRESH_MARGIN = 300
+
+_PROVIDERS = {}
+_PROVIDERS_LOCK = threading.Lock()
+
+
+class GraphTokenProvider:
+    """
+    Process-wide source of Microsoft Graph access tokens.
+
+    The access token is kept in memory and handed out until shortly before it expires. Renewals
+    happen once under a lock, so concurrent threads needing a token wait for a single exchange with
+    login.microsoftonline.com instead of each making their own. The MSAL application and its
+    SerializableTokenCache are built once; when a cache path is set (KDAGS_MSAL_CACHE_PATH) the cache,
+    including the rotated refresh token, is persisted there and reused by later processes.
+    """
+
+    def __init__(self, client_id: str, scopes: list = None, cache_path: str = None, refresh_margin: int = None):
+        """
+        Args:
+            client_id: Azure AD application (client) id
+            scopes: Scopes requested for the access token
+            cache_path: File the MSAL cache is persisted to, None to keep it in memory only
+            refresh_margin: Seconds before expiry at which the token is renewed
+        """
+        self.scopes = scopes or GRAPH_SCOPES
+        self.refresh_margin = _REFRESH_MARGIN if refresh_margin is None else refresh_margin
+        cache_path = cache_path or os.environ.get("KDAGS_MSAL_CACHE_PATH")
+        self.cache_path = Path(cache_path).expanduser() if cache_path else None
+
+        self._cache = msal.SerializableTokenCache()
+        if self.cache_path and self.cache_path.exists():
+            self._cache.deserialize(self.cache_path.read_text())
+        self._app = msal.PublicClientApplication(
+            client_id=client_id, authority=GRAPH_AUTHORITY, token_cache=self._cache
+        )
+
+        self._lock = threading.Lock()
+        self._token = None
+        self._expires_at = 0.0
+        self.stats = {"cached": 0, "renewed": 0}
+
+    def _is_fresh(self) -> bool:
+        return self._token is not None and time.time() < self._expires_at - self.refresh_margin
+
+    def acquire_token(self) -> dict:
+        """Return a token result (access_token, token_type, expires_in) suitable for GraphClient."""
+        if self._is_fresh():
+            self.stats["cached"] += 1
+            return self._token
+
+        with self._lock:
+            # Another thread may have renewed the token while this one waited
+            if self._is_fresh():
+                self.stats["cached"] += 1
+                return self._token
+
+            result = None
+            accounts = self._app.get_accounts()
+            if accounts:
+                # Served from the MSAL cache, or renewed with the cached (rotated) refresh token
+                result = self._app.acquire_token_silent(self.scopes, account=accounts[0])
+            if not result or "access_token" not in result:
+                # Ensure MSGRAPH_TOKEN environment variable is set in your environment
+                result = self._app.acquire_token_by_refresh_token(os.environ["MSGRAPH_TOKEN"], self.scopes)
+            if "access_token" not in result:
+                raise RuntimeError(
+                    f"Could not acquire a Graph token: {result.get('error')} {result.get('error_description', '')}"
+                )
+
+            self._token = result
+            self._expires_at = time.time() + int(result.get("expires_in", 0))
+            self.stats["renewed"] += 1
+            self._persist()
+            return result
+
+    def _persist(self) -> None:
+        """Write the MSAL cache to cache_path when it changed. Caller holds the lock."""
+        if not self.cache_path or not self._cache.has_state_changed:
+            return
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file first so a concurrent process never reads a partial cache
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self._cache.serialize())
+            # The cache holds a refresh token
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.cache_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._cache.has_state_changed = False
+
+    def invalidate(self) -> None:
+        """Drop the in-memory access token, e.g. after a 401, so the next call renews it."""
+        with self._lock:
+            self._token = None
+            self._expires_at = 0.0
+
+
+def get_token_provider(client_id: str) -> GraphTokenProvider:
+    """Return the process-wide GraphTokenProvider for a client id, creating it on first use."""
+    with _PROVIDERS_LOCK:
+        if client_id not in _PROVIDERS:
+            _PROVIDERS[client_id] = GraphTokenProvider(client_id)
+        return _PROVIDERS[client_id]
@@ -1,4 +1,4 @@
-from .msgraph import MSGraph
+from .msgraph import MSGraph, _BATCH_SIZE
 from .datalake import DataLake
 
 
@@ -28,29 +28,45 @@ def transfer_dl_sp(
     """
     results = []
 
-    for file_path in file_list:
-        try:
-            # Extract just the filename from the path
-            file_name = file_path.split("/")[-1]
+    # Read and upload _BATCH_SIZE files at a time, one $batch request each, so only one chunk is held in memory
+    for start in range(0, len(file_list), _BATCH_SIZE):
+        files = {}
+        source_paths = {}
 
-            # Get file content from Data Lake
-            content = datalake.read_bytes(source_container, file_path)
+        for file_path in file_list[start : start + _BATCH_SIZE]:
+            try:
+                # Extract just the filename from the path
+                file_name = file_path.split("/")[-1]
+                sp_path = f"sp://{target_site_id}/{target_folder.strip('/')}/{file_name}"
 
-            # Upload to SharePoint
-            upload_result = msgraph.upload_file(
-                site_id=target_site_id,
-                folder_path=target_folder,
-                file_name=file_name,
-                content=content,
-                overwrite=overwrite,
-            )
+                # Get file content from Data Lake
+                files[sp_path] = datalake.read_bytes(f"az://{source_container}/{file_path}")
+                source_paths[sp_path] = file_path
 
-            # Record the result with the file path for reference
-            results.append({"source_path": file_path, **upload_result})  # Include all fields from upload_result
+            except Exception as e:
+                results.append(
+                    {"source_path": file_path, "status": "error", "message": f"Error transferring file: {str(e)}"}
+                )
+
+        # Upload to SharePoint, small files go through Graph $batch
+        upload_results = msgraph.upload_files(files, overwrite=overwrite)
+        errors = {error["sp_path"]: error["error"] for error in upload_results["errors"]}
 
-        except Exception as e:
-            results.append(
-                {"source_path": file_path, "status": "error", "message": f"Error transferring file: {str(e)}"}
-            )
+        for sp_path, file_path in source_paths.items():
+            # Record the result with the file path for reference
+            if sp_path in errors:
+                results.append(
+                    {
+                        "source_path": file_path,
+                        "status": "error",
+                        "message": f"Error transferring file: {errors[sp_path]}",
+                    }
+                )
+            elif sp_path in upload_results["web_urls"]:
+                results.append(
+                    {"source_path": file_path, "status": "uploaded", "web_url": upload_results["web_urls"][sp_path]}
+                )
+            else:
+                results.append({"source_path": file_path, "status": "exists", "message": "File already exists"})
 
     return results
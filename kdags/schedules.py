@@ -7,6 +7,7 @@ from kdags.jobs import (
     fiori_job,
     harvest_so_details_job,
     harvest_so_documents_job,
+    vacuum_delta_tables_job,
 )
 
 __all__ = ["schedules"]
@@ -82,6 +83,14 @@ oil_analysis_schedule = dg.ScheduleDefinition(
     default_status=dg.DefaultScheduleStatus.RUNNING,
 )
 
+vacuum_delta_tables_schedule = dg.ScheduleDefinition(
+    name="vacuum_delta_tables_schedule",
+    job=vacuum_delta_tables_job,
+    cron_schedule="0 4 * * 0",  # weekly, Sunday at 04:00
+    execution_timezone="America/Santiago",
+    default_status=dg.DefaultScheduleStatus.RUNNING,
+)
+
 
 schedules = [
     component_history_schedule,
@@ -92,4 +101,5 @@ schedules = [
     fiori_schedule,
     harvest_so_details_schedule,
     harvest_so_documents_schedule,
+    vacuum_delta_tables_schedule,
 ]
@@ -39,5 +39,5 @@ setup(
         "pyodbc",
         "reportlab",
     ],
-    extras_require={"dev": ["dagster-webserver", "pytest"]},
+    extras_require={"dev": ["dagster-webserver", "pytest"], "arrow": ["arrow-odbc"]},
 )